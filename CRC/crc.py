@@ -1,51 +1,146 @@
-def crc_check(data, div):
-    l = len(div)
-    ct = 0
-    data = [int(i) for i in data]
-    div = [int(i) for i in div]
-    zero = [0 for i in range(l)]
-    temp_data = [data[i] for i in range(l)]
-    result = []
-    for j in range(len(data) - len(div) + 1):
-        print("Temp_dividend", temp_data)
-        msb = temp_data[0]
-        if msb == 0:
-            result.append(0)
-            for i in range(l - 1, -1, -1):
-                temp_data[i] = temp_data[i] ^ zero[i]
-        else:
-            result.append(1)
-            for i in range(l - 1, -1, -1):
-                temp_data[i] = temp_data[i] ^ div[i]
-        temp_data.pop(0)
-        if (l + j < len(data)):
-            temp_data.append(data[l + j])
-    crc = temp_data
-    print("Quotient: ", result, "remainder", crc)
-    return crc
-# returning crc value
-
-
-while 1 > 0:
-    print("Enter data: ")
-    data = input()  #can use it like int(input())
-    print("Enter divisor")
-    div = input() #can use it like int(input())
-    original_data = data
-    data = data + ("0" * (len(div) - 1))
-    crc = crc_check(data, div)
-    crc_str = ""
-    for c in crc:
-        crc_str += c
-    print("Sent data: ", original_data + crc_str)
-    sent_data = original_data + crc_str
-    print("If again applying CRC algorithm, the remainder/CRC must be zero if errorless.")
-    crc = crc_check(sent_data, div)
-    remainder = crc
-    print("Receiver side remainder: ", remainder)
-    print("Continue [Y/N]:")
-    ch = input()
-    if ch == 'N' or ch == 'n':
-        break
-    else:
-        continue
+import argparse
+import sys
+
+from crc_engine import DEFAULT_CHUNK_SIZE, PRESETS, crc_file, crc_stream, get_spec
+
+
+def crc_check(data, div):
+    l = len(div)
+    ct = 0
+    data = [int(i) for i in data]
+    div = [int(i) for i in div]
+    zero = [0 for i in range(l)]
+    temp_data = [data[i] for i in range(l)]
+    result = []
+    for j in range(len(data) - len(div) + 1):
+        print("Temp_dividend", temp_data)
+        msb = temp_data[0]
+        if msb == 0:
+            result.append(0)
+            for i in range(l - 1, -1, -1):
+                temp_data[i] = temp_data[i] ^ zero[i]
+        else:
+            result.append(1)
+            for i in range(l - 1, -1, -1):
+                temp_data[i] = temp_data[i] ^ div[i]
+        temp_data.pop(0)
+        if (l + j < len(data)):
+            temp_data.append(data[l + j])
+    crc = temp_data
+    print("Quotient: ", result, "remainder", crc)
+    return crc
+# returning crc value
+
+
+def demo(data, div):
+    # the classic walk-through: append the CRC, then check that the
+    # receiver gets a zero remainder
+    padded = data + ("0" * (len(div) - 1))
+    crc = crc_check(padded, div)
+    crc_str = "".join(str(c) for c in crc)
+    print("Sent data: ", data + crc_str)
+    sent_data = data + crc_str
+    print("If again applying CRC algorithm, the remainder/CRC must be zero if errorless.")
+    remainder = crc_check(sent_data, div)
+    print("Receiver side remainder: ", remainder)
+
+
+def chunk_size(text):
+    # --chunk-size: "65536", "64K", "256M" or "1G"; refused by argparse
+    # unless positive
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+    text = text.strip().upper().rstrip("B")
+    try:
+        size = int(text[:-1]) * units[text[-1]] if text[-1:] in units else int(text)
+    except ValueError:
+        size = 0
+    if size <= 0:
+        raise argparse.ArgumentTypeError("not a positive size: %r" % text)
+    return size
+
+
+def checksum(path, args):
+    if path == "-":
+        return crc_stream(sys.stdin.buffer, args.algorithm)
+    return crc_file(path, args.algorithm, workers=args.workers, chunk_size=args.chunk_size)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compute or verify CRCs of files.")
+    parser.add_argument("files", nargs="*", help="files to checksum ('-' reads stdin)")
+    parser.add_argument("-a", "--algorithm", default="CRC-32",
+                        help="CRC preset, see --list (default: CRC-32)")
+    parser.add_argument("-c", "--check", action="store_true",
+                        help="read '<crc>  <file>' lines from the files and verify them")
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="processes checksumming chunks of a file in parallel")
+    parser.add_argument("-S", "--chunk-size", type=chunk_size, default=DEFAULT_CHUNK_SIZE,
+                        help="bytes per parallel chunk, e.g. 256M (default: 64M)")
+    parser.add_argument("--list", action="store_true", help="list the CRC presets")
+    parser.add_argument("--demo", nargs=2, metavar=("DATA", "DIVISOR"),
+                        help="show the bitwise long division, e.g. --demo 100100 1101")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for spec in PRESETS.values():
+            print("%-20s width=%-2d poly=0x%x" % (spec.name, spec.width, spec.poly))
+        return 0
+    if args.demo:
+        demo(*args.demo)
+        return 0
+    try:
+        spec = get_spec(args.algorithm)
+    except ValueError as err:
+        parser.error(str(err))
+    digits = (spec.width + 3) // 4
+
+    if not args.check:
+        status = 0
+        for path in args.files or ["-"]:
+            try:
+                print("%0*x  %s" % (digits, checksum(path, args), path))
+            except OSError as err:
+                print("crc: %s: %s" % (path, err.strerror), file=sys.stderr)
+                status = 1
+        return status
+
+    # like sha256sum -c: report every line, keep going, fail at the end
+    failed = unreadable = malformed = 0
+    for listing in args.files or ["-"]:
+        try:
+            lines = sys.stdin if listing == "-" else open(listing)
+        except OSError as err:
+            print("%s: %s" % (listing, err.strerror), file=sys.stderr)
+            unreadable += 1
+            continue
+        with lines:
+            for number, line in enumerate(lines, 1):
+                if not line.strip():
+                    continue
+                try:
+                    expected, path = line.rstrip("\n").split(None, 1)
+                    expected = int(expected, 16)
+                except ValueError:
+                    print("%s: %d: improperly formatted checksum line" % (listing, number), file=sys.stderr)
+                    malformed += 1
+                    continue
+                path = path.strip()
+                try:
+                    ok = checksum(path, args) == expected
+                except OSError as err:
+                    print("%s: %s" % (path, err.strerror), file=sys.stderr)
+                    print("%s: FAILED open or read" % path)
+                    unreadable += 1
+                    continue
+                failed += not ok
+                print("%s: %s" % (path, "OK" if ok else "FAILED"))
+    if malformed:
+        print("WARNING: %d line(s) improperly formatted" % malformed, file=sys.stderr)
+    if unreadable:
+        print("WARNING: %d listed file(s) could not be read" % unreadable, file=sys.stderr)
+    if failed:
+        print("WARNING: %d computed checksum(s) did NOT match" % failed, file=sys.stderr)
+    return 1 if failed or unreadable or malformed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,347 @@
+"""
+Table-driven CRC engine for bytes-like input.
+
+crc.py shows the polynomial long division one bit at a time; this module
+computes the same remainders a byte (or eight bytes) per step from
+precomputed tables, for any CRC described by the usual Rocksoft model
+parameters (width, poly, init, refin, refout, xorout). Large files are
+read through mmap and can be checksummed in parallel chunks whose CRCs
+are merged with combine().
+
+    >>> crc(b"123456789", "CRC-32") == 0xCBF43926
+    True
+    >>> c = Crc("CRC-16/CCITT-FALSE")
+    >>> c.update(b"1234"); c.update(b"56789")
+    >>> hex(c.value)
+    '0x29b1'
+"""
+
+import binascii
+import mmap
+import os
+import struct
+import zlib
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+CrcSpec = namedtuple(
+    "CrcSpec", "name width poly init refin refout xorout check"
+)
+CrcSpec.__doc__ = """\
+Rocksoft model of a CRC: poly is written without its top bit and
+non-reflected; check is the CRC of b"123456789"."""
+
+PRESETS = {
+    spec.name: spec
+    for spec in (
+        CrcSpec("CRC-8", 8, 0x07, 0x00, False, False, 0x00, 0xF4),
+        CrcSpec("CRC-8/MAXIM", 8, 0x31, 0x00, True, True, 0x00, 0xA1),
+        CrcSpec("CRC-16/ARC", 16, 0x8005, 0x0000, True, True, 0x0000, 0xBB3D),
+        CrcSpec("CRC-16/CCITT-FALSE", 16, 0x1021, 0xFFFF, False, False, 0x0000, 0x29B1),
+        CrcSpec("CRC-16/XMODEM", 16, 0x1021, 0x0000, False, False, 0x0000, 0x31C3),
+        CrcSpec("CRC-16/MODBUS", 16, 0x8005, 0xFFFF, True, True, 0x0000, 0x4B37),
+        CrcSpec("CRC-32", 32, 0x04C11DB7, 0xFFFFFFFF, True, True, 0xFFFFFFFF, 0xCBF43926),
+        CrcSpec("CRC-32/BZIP2", 32, 0x04C11DB7, 0xFFFFFFFF, False, False, 0xFFFFFFFF, 0xFC891918),
+        CrcSpec("CRC-32C", 32, 0x1EDC6F41, 0xFFFFFFFF, True, True, 0xFFFFFFFF, 0xE3069283),
+        CrcSpec("CRC-64/ECMA-182", 64, 0x42F0E1EBA9EA3693, 0, False, False, 0, 0x6C40DF5F0B497347),
+        CrcSpec("CRC-64/XZ", 64, 0x42F0E1EBA9EA3693, 0xFFFFFFFFFFFFFFFF, True, True,
+                0xFFFFFFFFFFFFFFFF, 0x995DC9BBDF1939FA),
+    )
+}
+
+# below this many bytes the slicing-by-8 set-up costs more than it saves
+_SLICE_MIN = 64
+# bytes handed to the table loop at a time when reading files
+BUFFER_SIZE = 8 * 1024 * 1024
+# bytes checksummed by one worker task in crc_file
+DEFAULT_CHUNK_SIZE = 64 * 1024 * 1024
+
+
+def reflect(value: int, width: int) -> int:
+    """Reverse the lowest width bits of value."""
+    return int(format(value, "0%db" % width)[::-1], 2)
+
+
+def get_spec(spec) -> CrcSpec:
+    """A CrcSpec, or the name of a preset (case-insensitive)."""
+    if isinstance(spec, CrcSpec):
+        if spec.width < 8 or spec.width > 64:
+            raise ValueError("only CRC widths from 8 to 64 bits are supported")
+        return spec
+    try:
+        return PRESETS[spec.upper()]
+    except KeyError:
+        raise ValueError("unknown CRC %r; presets: %s" % (spec, ", ".join(PRESETS))) from None
+
+
+@lru_cache(maxsize=None)
+def tables(spec: CrcSpec) -> tuple:
+    """
+    Slicing-by-8 lookup tables: tables(spec)[0] is the classic 256-entry
+    byte table and tables(spec)[k] advances a byte that is followed by k
+    more bytes.
+    """
+    width, mask = spec.width, (1 << spec.width) - 1
+    if spec.refin:
+        poly = reflect(spec.poly, width)
+        t0 = []
+        for byte in range(256):
+            reg = byte
+            for _ in range(8):
+                reg = (reg >> 1) ^ poly if reg & 1 else reg >> 1
+            t0.append(reg)
+        result = [t0]
+        for _ in range(7):
+            prev = result[-1]
+            result.append([(reg >> 8) ^ t0[reg & 0xFF] for reg in prev])
+    else:
+        top = 1 << (width - 1)
+        t0 = []
+        for byte in range(256):
+            reg = byte << (width - 8)
+            for _ in range(8):
+                reg = ((reg << 1) ^ spec.poly if reg & top else reg << 1) & mask
+            t0.append(reg)
+        result = [t0]
+        for _ in range(7):
+            prev = result[-1]
+            result.append([
+                ((reg << 8) & mask) ^ t0[reg >> (width - 8)] for reg in prev
+            ])
+    return tuple(tuple(table) for table in result)
+
+
+def _as_bytes(data) -> memoryview:
+    view = memoryview(data)
+    return view if view.format == "B" and view.ndim == 1 else view.cast("B")
+
+
+def _update_reflected(reg: int, view: memoryview, spec: CrcSpec) -> int:
+    t = tables(spec)
+    t0 = t[0]
+    head = 0
+    if len(view) >= _SLICE_MIN:
+        t1, t2, t3, t4, t5, t6, t7 = t[1:]
+        head = len(view) & ~7
+        for (word,) in struct.iter_unpack("<Q", view[:head]):
+            word ^= reg
+            reg = (t7[word & 0xFF] ^ t6[(word >> 8) & 0xFF]
+                   ^ t5[(word >> 16) & 0xFF] ^ t4[(word >> 24) & 0xFF]
+                   ^ t3[(word >> 32) & 0xFF] ^ t2[(word >> 40) & 0xFF]
+                   ^ t1[(word >> 48) & 0xFF] ^ t0[word >> 56])
+    for byte in view[head:]:
+        reg = (reg >> 8) ^ t0[(reg ^ byte) & 0xFF]
+    return reg
+
+
+def _update_normal(reg: int, view: memoryview, spec: CrcSpec) -> int:
+    t = tables(spec)
+    t0 = t[0]
+    width = spec.width
+    mask, shift = (1 << width) - 1, width - 8
+    head = 0
+    if len(view) >= _SLICE_MIN:
+        t1, t2, t3, t4, t5, t6, t7 = t[1:]
+        head = len(view) & ~7
+        # line the register up with the top of each 64-bit word
+        align = 64 - width
+        for (word,) in struct.iter_unpack(">Q", view[:head]):
+            word ^= reg << align
+            reg = (t0[word & 0xFF] ^ t1[(word >> 8) & 0xFF]
+                   ^ t2[(word >> 16) & 0xFF] ^ t3[(word >> 24) & 0xFF]
+                   ^ t4[(word >> 32) & 0xFF] ^ t5[(word >> 40) & 0xFF]
+                   ^ t6[(word >> 48) & 0xFF] ^ t7[word >> 56])
+    for byte in view[head:]:
+        reg = ((reg << 8) & mask) ^ t0[(reg >> shift) ^ byte]
+    return reg
+
+
+# stdlib C implementations, keyed by the spec they compute; they take and
+# return the finished CRC, so the register is converted on the way
+_NATIVE = {
+    PRESETS["CRC-32"]: lambda reg, view: zlib.crc32(view, reg ^ 0xFFFFFFFF) ^ 0xFFFFFFFF,
+    PRESETS["CRC-16/XMODEM"]: lambda reg, view: binascii.crc_hqx(view, reg),
+}
+
+
+def _update(reg: int, view: memoryview, spec: CrcSpec) -> int:
+    native = _NATIVE.get(spec)
+    if native is not None:
+        return native(reg, view)
+    if spec.refin:
+        return _update_reflected(reg, view, spec)
+    return _update_normal(reg, view, spec)
+
+
+def _init_register(spec: CrcSpec) -> int:
+    # the register of reflected CRCs holds the bit-reversed remainder
+    return reflect(spec.init, spec.width) if spec.refin else spec.init
+
+
+def _finish(reg: int, spec: CrcSpec) -> int:
+    if spec.refin != spec.refout:
+        reg = reflect(reg, spec.width)
+    return reg ^ spec.xorout
+
+
+def _unfinish(value: int, spec: CrcSpec) -> int:
+    reg = value ^ spec.xorout
+    if spec.refin != spec.refout:
+        reg = reflect(reg, spec.width)
+    return reg
+
+
+class Crc:
+    """
+    Running CRC with a hashlib-like interface: update() with chunks of a
+    stream, then read value, digest() or hexdigest().
+    """
+
+    def __init__(self, spec="CRC-32", data=b""):
+        self.spec = get_spec(spec)
+        self._reg = _init_register(self.spec)
+        if data:
+            self.update(data)
+
+    @property
+    def name(self) -> str:
+        return self.spec.name
+
+    @property
+    def digest_size(self) -> int:
+        return (self.spec.width + 7) // 8
+
+    def update(self, data) -> None:
+        """Feed bytes, bytearray, memoryview or any buffer of more data."""
+        self._reg = _update(self._reg, _as_bytes(data), self.spec)
+
+    @property
+    def value(self) -> int:
+        """The CRC of everything fed so far."""
+        return _finish(self._reg, self.spec)
+
+    def digest(self) -> bytes:
+        return self.value.to_bytes(self.digest_size, "big")
+
+    def hexdigest(self) -> str:
+        return "%0*x" % (2 * self.digest_size, self.value)
+
+    def copy(self) -> "Crc":
+        other = Crc.__new__(Crc)
+        other.spec, other._reg = self.spec, self._reg
+        return other
+
+
+def crc(data, spec="CRC-32") -> int:
+    """CRC of a bytes-like object in one call."""
+    return Crc(spec, data).value
+
+
+# Combining CRCs. Feeding data to the register is affine over GF(2):
+# update(reg, B) = Z(reg) ^ update(0, B), where Z is the linear map
+# "shift in len(B) zero bytes". Z is a width x width bit matrix, built by
+# squaring the one-zero-bit matrix; a matrix is the list of its columns.
+
+def _gf2_times(matrix: list, vector: int) -> int:
+    result, i = 0, 0
+    while vector:
+        if vector & 1:
+            result ^= matrix[i]
+        vector >>= 1
+        i += 1
+    return result
+
+
+def _gf2_square(matrix: list) -> list:
+    return [_gf2_times(matrix, column) for column in matrix]
+
+
+@lru_cache(maxsize=None)
+def _zero_byte_operator(spec: CrcSpec) -> tuple:
+    width = spec.width
+    if spec.refin:
+        # shifting right: bit 0 falls out and folds the polynomial back in
+        one_bit = [reflect(spec.poly, width)] + [1 << (i - 1) for i in range(1, width)]
+    else:
+        one_bit = [1 << (i + 1) for i in range(width - 1)] + [spec.poly]
+    operator = one_bit
+    for _ in range(3):
+        operator = _gf2_square(operator)
+    return tuple(operator)
+
+
+def shift_zeros(reg: int, nbytes: int, spec: CrcSpec) -> int:
+    """Register after feeding nbytes zero bytes, in O(width^2 log nbytes)."""
+    operator = list(_zero_byte_operator(spec))
+    while nbytes:
+        if nbytes & 1:
+            reg = _gf2_times(operator, reg)
+        nbytes >>= 1
+        if nbytes:
+            operator = _gf2_square(operator)
+    return reg
+
+
+def combine(crc1: int, crc2: int, len2: int, spec="CRC-32") -> int:
+    """
+    CRC of A + B from crc1 = CRC(A), crc2 = CRC(B) and len2 = len(B),
+    like zlib.crc32_combine.
+    """
+    spec = get_spec(spec)
+    reg1, reg2 = _unfinish(crc1, spec), _unfinish(crc2, spec)
+    reg = shift_zeros(reg1 ^ _init_register(spec), len2, spec) ^ reg2
+    return _finish(reg, spec)
+
+
+# Files. Chunks are checksummed from a zero register, so their results
+# only need shifting and XOR-ing together in file order.
+
+def crc_stream(stream, spec="CRC-32", buffer_size: int = BUFFER_SIZE) -> int:
+    """CRC of everything read from a binary file object."""
+    running = Crc(spec)
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+    while True:
+        n = stream.readinto(buffer)
+        if not n:
+            return running.value
+        running.update(view[:n])
+
+
+def _crc_chunk(task: tuple) -> int:
+    path, start, end, spec = task
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        view = memoryview(mapped)
+        try:
+            reg = 0
+            for pos in range(start, end, BUFFER_SIZE):
+                reg = _update(reg, view[pos:min(pos + BUFFER_SIZE, end)], spec)
+            return reg
+        finally:
+            view.release()
+
+
+def crc_file(path: str, spec="CRC-32", workers: int = 1,
+             chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    CRC of a file, read through mmap. With workers > 1 the file is cut
+    into chunk_size pieces that are checksummed in parallel processes and
+    combined, giving the same value as a single pass.
+    """
+    spec = get_spec(spec)
+    size = os.path.getsize(path)
+    if size == 0:
+        return Crc(spec).value
+    bounds = [(start, min(start + chunk_size, size)) for start in range(0, size, chunk_size)]
+    tasks = [(path, start, end, spec) for start, end in bounds]
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_crc_chunk, tasks))
+    else:
+        parts = [_crc_chunk(task) for task in tasks]
+
+    reg = _init_register(spec)
+    for (start, end), part in zip(bounds, parts):
+        reg = shift_zeros(reg, end - start, spec) ^ part
+    return _finish(reg, spec)
@@ -0,0 +1,143 @@
+#
+# Test CRC
+# ********
+#
+# Usage: python test_crc.py
+#
+
+
+import contextlib
+import io
+import os
+import random
+import tempfile
+import unittest
+
+import crc as crc_cli
+from crc_engine import PRESETS, Crc, CrcSpec, combine, crc, crc_file, crc_stream, reflect
+
+
+def bitwise_crc(data: bytes, spec: CrcSpec) -> int:
+    """Straight bit-at-a-time division, the way crc.py does it by hand."""
+    top, mask = 1 << (spec.width - 1), (1 << spec.width) - 1
+    reg = spec.init
+    for byte in data:
+        if spec.refin:
+            byte = reflect(byte, 8)
+        reg ^= byte << (spec.width - 8)
+        for _ in range(8):
+            reg = ((reg << 1) ^ spec.poly if reg & top else reg << 1) & mask
+    if spec.refout:
+        reg = reflect(reg, spec.width)
+    return reg ^ spec.xorout
+
+
+class TestCrcEngine(unittest.TestCase):
+
+    def test_preset_check_values(self):
+        for spec in PRESETS.values():
+            with self.subTest(spec.name):
+                self.assertEqual(crc(b"123456789", spec.name), spec.check)
+
+    def test_matches_bitwise_division(self):
+        rng = random.Random(0)
+        specs = list(PRESETS.values()) + [
+            CrcSpec("custom", width, rng.getrandbits(width) | 1, rng.getrandbits(width),
+                    refin, refout, rng.getrandbits(width), None)
+            for width in (8, 12, 24, 40, 64)
+            for refin in (False, True)
+            for refout in (False, True)
+        ]
+        for spec in specs:
+            for n in (0, 1, 7, 64, 65, 301):
+                data = rng.randbytes(n)
+                with self.subTest(spec=spec, n=n):
+                    self.assertEqual(crc(data, spec), bitwise_crc(data, spec))
+
+    def test_streaming_update(self):
+        data = random.Random(1).randbytes(10_000)
+        for name in PRESETS:
+            running = Crc(name)
+            view = memoryview(data)
+            for start in range(0, len(data), 999):
+                running.update(view[start:start + 999])
+            with self.subTest(name):
+                self.assertEqual(running.value, crc(data, name))
+                self.assertEqual(running.digest(), running.value.to_bytes(running.digest_size, "big"))
+
+    def test_copy_is_independent(self):
+        first = Crc("CRC-32C", b"1234")
+        second = first.copy()
+        second.update(b"56789")
+        self.assertEqual(second.value, 0xE3069283)
+        self.assertEqual(first.value, crc(b"1234", "CRC-32C"))
+
+    def test_unknown_preset(self):
+        with self.assertRaises(ValueError):
+            Crc("CRC-7")
+
+
+class TestCrcFiles(unittest.TestCase):
+
+    def setUp(self):
+        self.data = random.Random(2).randbytes(1_000_003)
+        fd, self.path = tempfile.mkstemp()
+        with os.fdopen(fd, "wb") as f:
+            f.write(self.data)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_combine(self):
+        rng = random.Random(3)
+        for name in PRESETS:
+            a, b = rng.randbytes(rng.randint(0, 200)), rng.randbytes(rng.randint(0, 200))
+            with self.subTest(name):
+                self.assertEqual(combine(crc(a, name), crc(b, name), len(b), name), crc(a + b, name))
+
+    def test_parallel_chunks_match_single_pass(self):
+        for name in ("CRC-32", "CRC-32C", "CRC-64/ECMA-182"):
+            expected = crc(self.data, name)
+            with self.subTest(name):
+                self.assertEqual(crc_file(self.path, name), expected)
+                self.assertEqual(crc_file(self.path, name, workers=2, chunk_size=300_000), expected)
+                self.assertEqual(crc_stream(io.BytesIO(self.data), name, buffer_size=4096), expected)
+
+    def test_empty_file(self):
+        open(self.path, "wb").close()
+        self.assertEqual(crc_file(self.path, "CRC-32C"), crc(b"", "CRC-32C"))
+
+    def test_check_reports_every_line(self):
+        listing = self.path + ".crc"
+        missing = self.path + ".missing"
+        with open(listing, "w") as f:
+            f.write("%08x  %s\n" % (crc(self.data), self.path))
+            f.write("%08x  %s\n" % (0, missing))
+            f.write("not-a-checksum line\n")
+            f.write("just-one-field\n")
+            f.write("%08x  %s\n" % (crc(self.data) ^ 1, self.path))
+        out, err = io.StringIO(), io.StringIO()
+        try:
+            with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+                status = crc_cli.main(["--check", listing])
+        finally:
+            os.remove(listing)
+        self.assertEqual(status, 1)
+        self.assertEqual(out.getvalue().splitlines(), [
+            "%s: OK" % self.path, "%s: FAILED open or read" % missing, "%s: FAILED" % self.path])
+        self.assertIn("2 line(s) improperly formatted", err.getvalue())
+        self.assertIn("1 listed file(s) could not be read", err.getvalue())
+        self.assertIn("1 computed checksum(s) did NOT match", err.getvalue())
+
+    def test_unreadable_files_do_not_stop_the_others(self):
+        missing = self.path + ".missing"
+        out, err = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            status = crc_cli.main([missing, self.path])
+        self.assertEqual(status, 1)
+        self.assertEqual(out.getvalue(), "%08x  %s\n" % (crc(self.data), self.path))
+        self.assertEqual(err.getvalue(), "crc: %s: No such file or directory\n" % missing)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,14 @@
+# ./Sorting Algorithims/sortlib/__init__.py
+
+'''
+Importable sorting library behind the scripts in this folder.
+
+    from sortlib import sort
+    sort(data)                          # adaptive choice
+    sort(data, key=len, algorithm="merge")
+'''
+
+from .adaptive import analyze, choose_algorithm
+from .api import ALGORITHMS, sort
+
+__all__ = ["ALGORITHMS", "analyze", "choose_algorithm", "sort"]
@@ -0,0 +1,58 @@
+# ./Sorting Algorithims/sortlib/adaptive.py
+
+from collections import namedtuple
+
+from .merging import count_runs
+from .radix import key_kind, np
+
+# at or below this size insertion sort wins outright
+SMALL_SORT = 24
+# this few natural runs make merging a single linear pass, whatever the keys
+FEW_RUNS = 2
+# average natural run length from which run merging beats introsort
+PRESORTED_RUN_LENGTH = 16
+# counting sort is picked while the key range is at most this many times n
+COUNTING_RANGE_FACTOR = 2
+# from this size the vectorised LSD radix sort beats introsort on numbers
+RADIX_MIN_SIZE = 512
+
+Profile = namedtuple("Profile", ["size", "runs", "kind", "key_min", "key_max"])
+
+
+def analyze(keys: list) -> Profile:
+    """
+    One cheap pass over the keys: size, number of natural runs (counting
+    stops once the input is clearly not presorted), key type and, for
+    numeric keys, the key range.
+    """
+    n = len(keys)
+    runs = count_runs(keys, limit=n // PRESORTED_RUN_LENGTH + 1)
+    kind = key_kind(keys) if n else None
+    if kind in ("int", "float"):
+        key_min, key_max = min(keys), max(keys)
+    else:
+        key_min = key_max = None
+    return Profile(n, runs, kind, key_min, key_max)
+
+
+def choose_algorithm(keys: list) -> str:
+    """
+    Name of the algorithm that should be fastest for these keys.
+    """
+    n = len(keys)
+    if n <= SMALL_SORT:
+        return "insertion"
+    profile = analyze(keys)
+    if profile.runs <= FEW_RUNS:
+        return "merge"
+    # linear-time distribution sorts beat merging even moderately long runs
+    if (
+        profile.kind == "int"
+        and profile.key_max - profile.key_min < COUNTING_RANGE_FACTOR * n
+    ):
+        return "counting"
+    if profile.kind in ("int", "float") and np is not None and n >= RADIX_MIN_SIZE:
+        return "radix"
+    if profile.runs * PRESORTED_RUN_LENGTH <= n:
+        return "merge"
+    return "introsort"
@@ -0,0 +1,61 @@
+# ./Sorting Algorithims/sortlib/api.py
+
+from .adaptive import choose_algorithm
+from .counting import counting_sort
+from .insertion import insertion_sort
+from .introsort import heap_sort, introsort
+from .merging import merge_sort
+from .radix import radix_sort
+
+
+def _comparison(engine):
+    """
+    Adapt an in-place comparison sort to the (keys, items) -> list form.
+    With a key function the sort runs on (key, index) pairs, so every key
+    is computed once, items never get compared and ties keep input order.
+    """
+
+    def run(keys: list, items: list) -> list:
+        if keys is items:
+            engine(items)
+            return items
+        decorated = list(zip(keys, range(len(keys))))
+        engine(decorated)
+        return [items[i] for _, i in decorated]
+
+    return run
+
+
+ALGORITHMS = {
+    "insertion": _comparison(insertion_sort),
+    "merge": _comparison(merge_sort),
+    "introsort": _comparison(introsort),
+    "heap": _comparison(heap_sort),
+    "counting": counting_sort,
+    "radix": radix_sort,
+}
+
+
+def sort(seq, key=None, algorithm: str = "auto", reverse: bool = False) -> list:
+    """
+    Return a new sorted list from the items of seq, like sorted().
+    algorithm is one of ALGORITHMS or "auto", which lets the adaptive
+    dispatcher pick from the size, presortedness and key range of the input.
+    """
+    items = list(seq)
+    if reverse:
+        # reversing around a stable sort keeps equal items in input order
+        items.reverse()
+    keys = items if key is None else [key(item) for item in items]
+
+    if algorithm == "auto":
+        algorithm = choose_algorithm(keys)
+    try:
+        engine = ALGORITHMS[algorithm]
+    except KeyError:
+        raise ValueError(f"unknown sorting algorithm: {algorithm!r}") from None
+
+    result = engine(keys, items)
+    if reverse:
+        result.reverse()
+    return result
@@ -0,0 +1,336 @@
+# ./Sorting Algorithims/sortlib/benchmark.py
+
+"""
+Benchmark and profiling harness for every sorting implementation in
+"Sorting Algorithims/", skills/algorithms/sorting/ and sortlib itself.
+
+Most of the standalone scripts run demo code or call input() at import
+time, so they are never imported: only their import statements, function
+and class definitions and constant assignments are executed, in a fresh
+namespace.
+
+Every implementation runs on generated distributions at increasing sizes
+and gets timed, profiled for peak memory with tracemalloc and
+instrumented for comparisons and swaps. The result is a table on stdout
+and, optionally, JSON.
+
+    python -m sortlib.benchmark --sizes 100,1000,10000 --json results.json
+"""
+
+import argparse
+import ast
+import json
+import random
+import sys
+import time
+import tracemalloc
+from collections import namedtuple
+from pathlib import Path
+
+from .api import ALGORITHMS, sort
+
+SORTING_DIR = Path(__file__).resolve().parent.parent
+SKILLS_DIR = SORTING_DIR.parent / "skills" / "algorithms" / "sorting"
+
+DISTRIBUTIONS = ("random", "sorted", "reversed", "few_unique", "sawtooth")
+DEFAULT_SIZES = (100, 1000, 10000)
+# quadratic sorts stop here, stooge sort (O(n^2.7)) much earlier
+QUADRATIC_MAX = 2000
+STOOGE_MAX = 200
+
+# call conventions of the scripts:
+#   inplace   f(a), a ends up sorted      returns  a = f(a)
+#   with_len  f(a, len(a))                with_max f(a, max(a))
+#   bounds    f(a, 0, len(a) - 1)
+Implementation = namedtuple("Implementation", ["name", "path", "function", "call", "max_size"])
+
+IMPLEMENTATIONS = [
+    Implementation("algos/bubble", SORTING_DIR / "Bubble_sort.py", "bubble_sort", "inplace", QUADRATIC_MAX),
+    Implementation("algos/count", SORTING_DIR / "Count sort.py", "counting_sort", "with_max", None),
+    Implementation("algos/counting", SORTING_DIR / "Counting Sort", "countingSort", "inplace", None),
+    Implementation("algos/iterative_merge", SORTING_DIR / "Iterative Merge Sort", "mergeSort", "inplace", None),
+    Implementation("algos/shell", SORTING_DIR / "Shell Sort", "shellSort", "inplace", None),
+    Implementation("algos/tim", SORTING_DIR / "Tim_sort.py", "timSort", "with_len", None),
+    Implementation("algos/heap", SORTING_DIR / "heap_sort.py", "heap_sort", "inplace", None),
+    Implementation("algos/insertion", SORTING_DIR / "insertion_sort.py", "insertion_sort", "inplace", QUADRATIC_MAX),
+    Implementation("algos/merge", SORTING_DIR / "merge_sort.py", "merge_sort", "returns", None),
+    Implementation("algos/pigeonhole", SORTING_DIR / "pigeonhole_sort.py", "pigeonhole_sort", "inplace", None),
+    Implementation("algos/quick", SORTING_DIR / "quick_sort.py", "quick_sort", "inplace", None),
+    Implementation("algos/selection", SORTING_DIR / "selection_sort.py", "selection_sort", "inplace", QUADRATIC_MAX),
+    Implementation("algos/stooge", SORTING_DIR / "stooge_sort.py", "stooge_sort_", "bounds", STOOGE_MAX),
+    Implementation("skills/bubble", SKILLS_DIR / "bubble_sort.py", "bubble_sort", "inplace", QUADRATIC_MAX),
+    Implementation("skills/insertion", SKILLS_DIR / "insertion_sort.py", "insertion_sort", "inplace", QUADRATIC_MAX),
+    Implementation("skills/merge", SKILLS_DIR / "merge_sort.py", "merge_sort", "returns", None),
+    Implementation("skills/quick", SKILLS_DIR / "quick_sort.py", "quick_sort", "inplace", None),
+    Implementation("skills/selection", SKILLS_DIR / "selection_sort.py", "selection_sort", "inplace", QUADRATIC_MAX),
+]
+# wave_sort.py is left out: it produces a wave pattern, not a sorted list
+
+Result = namedtuple("Result", [
+    "implementation", "distribution", "size", "seconds",
+    "comparisons", "swaps", "peak_bytes", "error",
+])
+
+_SAFE_NODES = (ast.Import, ast.ImportFrom, ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+
+def load_script(path: Path) -> dict:
+    """
+    Execute only the definitions of a script and return its namespace.
+    Top-level statements with side effects (demo code, input(), print)
+    are dropped; constant assignments such as RUN = 32 are kept.
+    """
+    tree = ast.parse(path.read_text(), filename=str(path))
+    body = [
+        node for node in tree.body
+        if isinstance(node, _SAFE_NODES)
+        or (isinstance(node, ast.Assign) and isinstance(node.value, ast.Constant))
+    ]
+    namespace = {"__name__": "sortlib_benchmark", "__file__": str(path)}
+    exec(compile(ast.Module(body=body, type_ignores=[]), str(path), "exec"), namespace)
+    return namespace
+
+
+def make_data(distribution: str, n: int, seed: int = 0) -> list:
+    """
+    Non-negative ints, so the counting and pigeonhole sorts can run too.
+    """
+    rng = random.Random(seed)
+    if distribution == "random":
+        return [rng.randrange(n) for _ in range(n)]
+    if distribution == "sorted":
+        return list(range(n))
+    if distribution == "reversed":
+        return list(range(n, 0, -1))
+    if distribution == "few_unique":
+        return [rng.randrange(5) for _ in range(n)]
+    if distribution == "sawtooth":
+        return [i % 32 for i in range(n)]
+    raise ValueError(f"unknown distribution: {distribution!r}")
+
+
+class CountedInt(int):
+    """
+    An int that counts every comparison made against it. Arithmetic and
+    indexing still work, so counting sorts run unchanged.
+    """
+
+    comparisons = 0
+
+    def __lt__(self, other):
+        CountedInt.comparisons += 1
+        return int.__lt__(self, other)
+
+    def __le__(self, other):
+        CountedInt.comparisons += 1
+        return int.__le__(self, other)
+
+    def __gt__(self, other):
+        CountedInt.comparisons += 1
+        return int.__gt__(self, other)
+
+    def __ge__(self, other):
+        CountedInt.comparisons += 1
+        return int.__ge__(self, other)
+
+    def __eq__(self, other):
+        CountedInt.comparisons += 1
+        return int.__eq__(self, other)
+
+    def __ne__(self, other):
+        CountedInt.comparisons += 1
+        return int.__ne__(self, other)
+
+    __hash__ = int.__hash__
+
+
+class CountedList(list):
+    """
+    A list that counts element stores. A swap is two stores, so the
+    reported swaps are stores / 2 (an insertion-sort shift is half a swap).
+    """
+
+    stores = 0
+
+    def __setitem__(self, index, value):
+        CountedList.stores += 1
+        list.__setitem__(self, index, value)
+
+
+def _sortlib_runner(name: str):
+    if name == "auto":
+        return sort
+    engine = ALGORITHMS[name]
+
+    def run(a: list) -> list:
+        return engine(a, a)
+
+    return run
+
+
+def _runner(implementation: Implementation):
+    """
+    Uniform run(list) -> sorted list wrapper around an implementation.
+    """
+    function = load_script(implementation.path)[implementation.function]
+    call = implementation.call
+
+    def run(a: list) -> list:
+        if call == "returns":
+            return function(a)
+        if call == "with_len":
+            function(a, len(a))
+        elif call == "with_max":
+            function(a, max(a) if a else 0)
+        elif call == "bounds":
+            function(a, 0, len(a) - 1)
+        else:
+            function(a)
+        return a
+
+    return run
+
+
+def measure(run, data: list, repeat: int = 3, count: bool = True) -> tuple:
+    """
+    (best seconds, comparisons, swaps, peak bytes) of run on data.
+    Raises if the result is not sorted. swaps is None for sorts that
+    build a new list instead of working in place, comparisons and swaps
+    are None for sorts that cannot run on instrumented keys and when
+    count is false.
+    """
+    expected = sorted(data)
+    limit = sys.getrecursionlimit()
+    # naive quick sorts recurse once per element on sorted input
+    sys.setrecursionlimit(max(limit, 2 * len(data) + 1000))
+    try:
+        best = float("inf")
+        for _ in range(repeat):
+            a = list(data)
+            start = time.perf_counter()
+            result = run(a)
+            best = min(best, time.perf_counter() - start)
+        if result != expected:
+            raise AssertionError("output is not sorted")
+
+        a = list(data)
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+        run(a)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        if not count:
+            return best, None, None, peak
+
+        a = CountedList(CountedInt(x) for x in data)
+        CountedInt.comparisons = CountedList.stores = 0
+        try:
+            result = run(a)
+        except TypeError:
+            # engines that insist on exact int keys (counting, radix)
+            return best, None, None, peak
+        swaps = CountedList.stores / 2 if result is a else None
+        return best, CountedInt.comparisons, swaps, peak
+    finally:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        sys.setrecursionlimit(limit)
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, distributions=DISTRIBUTIONS,
+                   repeat: int = 3, time_limit: float = 5.0,
+                   include_sortlib: bool = True, only: str = None) -> list:
+    """
+    Benchmark every implementation on every distribution and size.
+    Larger sizes are skipped for an implementation once it needs more
+    than time_limit seconds on a distribution. Failures (load errors,
+    crashes, wrong output) are recorded rather than raised. only keeps
+    the implementations whose name contains that substring.
+    """
+    runners = []
+    for implementation in IMPLEMENTATIONS:
+        if only and only not in implementation.name:
+            continue
+        try:
+            runners.append((implementation.name, _runner(implementation), implementation.max_size, True, None))
+        except Exception as exc:
+            runners.append((implementation.name, None, None, True, f"{type(exc).__name__}: {exc}"))
+    if include_sortlib:
+        for name in list(ALGORITHMS) + ["auto"]:
+            if only and only not in "sortlib/" + name:
+                continue
+            max_size = QUADRATIC_MAX if name == "insertion" else None
+            # the dispatcher picks by key type too: on instrumented keys it
+            # would count a different algorithm from the one timed
+            count = name != "auto"
+            runners.append(("sortlib/" + name, _sortlib_runner(name), max_size, count, None))
+
+    results = []
+    for name, run, max_size, count, load_error in runners:
+        for distribution in distributions:
+            if load_error:
+                results.append(Result(name, distribution, None, None, None, None, None, load_error))
+                continue
+            for n in sorted(sizes):
+                if max_size is not None and n > max_size:
+                    break
+                data = make_data(distribution, n)
+                try:
+                    seconds, comparisons, swaps, peak = measure(run, data, repeat, count)
+                except Exception as exc:
+                    results.append(Result(name, distribution, n, None, None, None, None,
+                                          f"{type(exc).__name__}: {exc}"))
+                    break
+                results.append(Result(name, distribution, n, seconds, comparisons, swaps, peak, None))
+                if seconds > time_limit:
+                    break
+    return results
+
+
+def format_table(results: list) -> str:
+    header = "%-24s %-11s %7s %10s %12s %12s %11s  %s" % (
+        "implementation", "input", "n", "ms", "comparisons", "swaps", "peak KiB", "error")
+    lines = [header, "-" * len(header)]
+    for r in results:
+        lines.append("%-24s %-11s %7s %10s %12s %12s %11s  %s" % (
+            r.implementation, r.distribution,
+            "-" if r.size is None else r.size,
+            "-" if r.seconds is None else "%.3f" % (r.seconds * 1000),
+            "-" if r.comparisons is None else r.comparisons,
+            "-" if r.swaps is None else "%g" % r.swaps,
+            "-" if r.peak_bytes is None else "%.1f" % (r.peak_bytes / 1024),
+            r.error or "",
+        ))
+    return "\n".join(lines)
+
+
+def main(argv: list = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m sortlib.benchmark",
+        description="Compare every sorting implementation in the repository.",
+    )
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma separated input sizes")
+    parser.add_argument("--distributions", default=",".join(DISTRIBUTIONS))
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case (best is kept)")
+    parser.add_argument("--time-limit", type=float, default=5.0,
+                        help="skip larger sizes once a case takes longer (seconds)")
+    parser.add_argument("--only", help="substring an implementation name must contain")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(
+        sizes=[int(s) for s in args.sizes.split(",")],
+        distributions=args.distributions.split(","),
+        repeat=args.repeat,
+        time_limit=args.time_limit,
+        only=args.only,
+    )
+    print(format_table(results))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump([r._asdict() for r in results], f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# ./Sorting Algorithims/sortlib/counting.py
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+INT64_MIN, INT64_MAX = -(1 << 63), (1 << 63) - 1
+
+
+def counting_sort(keys: list, items: list = None) -> list:
+    """
+    Stable counting sort of items by their integer keys.
+    The key range is found from the data (negative keys are offset), so
+    the caller does not have to pass a maximum. When items is omitted the
+    keys themselves are sorted.
+    """
+    if not keys:
+        return []
+    if not all(type(k) is int for k in keys):
+        raise TypeError("counting sort needs integer keys")
+    lo, hi = min(keys), max(keys)
+    vectorized = np is not None and INT64_MIN <= lo and hi <= INT64_MAX
+
+    if vectorized:
+        offsets = np.asarray(keys, dtype=np.int64) - np.int64(lo)
+        counts = np.bincount(offsets, minlength=hi - lo + 1)
+    else:
+        counts = [0] * (hi - lo + 1)
+        for k in keys:
+            counts[k - lo] += 1
+
+    if items is None or items is keys:
+        # equal ints are interchangeable, so just expand the histogram
+        if vectorized:
+            return np.repeat(np.arange(lo, hi + 1, dtype=np.int64), counts).tolist()
+        out = []
+        for offset, count in enumerate(counts):
+            if count:
+                out.extend([offset + lo] * count)
+        return out
+
+    # turn counts into the first output slot of every key
+    if vectorized:
+        starts = (np.cumsum(counts) - counts).tolist()
+    else:
+        starts, total = counts, 0
+        for offset, count in enumerate(counts):
+            starts[offset] = total
+            total += count
+    out = [None] * len(items)
+    for k, item in zip(keys, items):
+        slot = k - lo
+        out[starts[slot]] = item
+        starts[slot] += 1
+    return out
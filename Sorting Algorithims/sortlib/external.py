@@ -0,0 +1,208 @@
+# ./Sorting Algorithims/sortlib/external.py
+
+"""
+External merge sort for line-oriented text files larger than RAM.
+
+The input is cut into chunks of roughly chunk_size bytes on line
+boundaries. Each chunk is sorted in memory with sortlib.sort and spilled
+to a temporary run file; runs are then k-way merged with a heap. Chunks
+are located by byte offset, so with workers > 1 every worker process
+reads, sorts and writes its own chunk and no line is ever pickled.
+
+    python -m sortlib.external big.log -o sorted.log --chunk-size 256M --workers 4
+    python -m sortlib.external data.csv -o out.csv -t , -k 3 -n
+"""
+
+import argparse
+import heapq
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from .api import sort
+
+DEFAULT_CHUNK_SIZE = 64 * 1024 * 1024
+# buffer for every run reader and for the writers
+BUFFER_SIZE = 1024 * 1024
+# most runs merged at once; more runs are merged in several passes
+MAX_FAN_IN = 128
+
+_SIZE_SUFFIXES = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+
+def parse_size(text: str) -> int:
+    """
+    "65536", "64K", "256M" or "2G" -> number of bytes.
+    """
+    text = text.strip().upper().rstrip("B")
+    if text and text[-1] in _SIZE_SUFFIXES:
+        return int(float(text[:-1]) * _SIZE_SUFFIXES[text[-1]])
+    return int(text)
+
+
+class FieldKey:
+    """
+    Key on one delimited field of a line, optionally compared as a number.
+    A class rather than a closure so it can be sent to worker processes.
+    """
+
+    def __init__(self, field: int, delimiter: str = None, numeric: bool = False):
+        self.field = field
+        self.delimiter = delimiter
+        self.numeric = numeric
+
+    def __call__(self, line: str):
+        parts = line.split(self.delimiter)
+        value = parts[self.field] if self.field < len(parts) else ""
+        if self.numeric:
+            try:
+                return float(value)
+            except ValueError:
+                # unparsable fields sort first, like sort -n
+                return float("-inf")
+        return value
+
+
+def chunk_bounds(path: str, chunk_size: int) -> list:
+    """
+    (start, end) byte offsets that split the file into chunks of about
+    chunk_size bytes, every chunk ending just after a newline.
+    """
+    size = os.path.getsize(path)
+    bounds = []
+    with open(path, "rb") as f:
+        start = 0
+        while start < size:
+            f.seek(min(start + chunk_size, size))
+            f.readline()
+            end = min(f.tell(), size)
+            bounds.append((start, end))
+            start = end
+    return bounds
+
+
+def _write_lines(path: str, lines, encoding: str) -> None:
+    with open(
+        path, "w", encoding=encoding, errors="surrogateescape",
+        newline="\n", buffering=BUFFER_SIZE,
+    ) as out:
+        out.writelines(line + "\n" for line in lines)
+
+
+def _read_lines(path: str, encoding: str):
+    # every line in a run file ends with "\n"; keys never see it
+    with open(
+        path, encoding=encoding, errors="surrogateescape",
+        newline="\n", buffering=BUFFER_SIZE,
+    ) as f:
+        for line in f:
+            yield line[:-1]
+
+
+def _sort_chunk(task: tuple) -> str:
+    """
+    Read one byte range of the input, sort it in memory, write it as a run.
+    Runs in a worker process when run generation is parallel.
+    """
+    path, start, end, run_path, key, reverse, encoding = task
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    lines = data.decode(encoding, "surrogateescape").split("\n")
+    del data
+    if lines[-1] == "":
+        lines.pop()
+    lines = sort(lines, key=key, reverse=reverse)
+    _write_lines(run_path, lines, encoding)
+    return run_path
+
+
+def merge_runs(run_paths: list, output_path: str, key=None,
+               reverse: bool = False, encoding: str = "utf-8") -> None:
+    """
+    k-way heap merge of sorted run files into output_path.
+    Ties are taken from the earlier run, so the merge is stable.
+    """
+    readers = [_read_lines(path, encoding) for path in run_paths]
+    _write_lines(output_path, heapq.merge(*readers, key=key, reverse=reverse), encoding)
+
+
+def external_sort(input_path: str, output_path: str, key=None,
+                  reverse: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                  workers: int = 1, tmp_dir: str = None,
+                  encoding: str = "utf-8") -> int:
+    """
+    Sort the lines of input_path into output_path using at most about
+    chunk_size bytes of input per worker in memory at a time.
+    key receives each line without its newline; with workers > 1 it must
+    be picklable (a module-level function or a FieldKey).
+    Returns the number of sorted runs that were merged.
+    """
+    bounds = chunk_bounds(input_path, chunk_size)
+    with tempfile.TemporaryDirectory(prefix="extsort-", dir=tmp_dir) as tmp:
+        tasks = [
+            (input_path, start, end, os.path.join(tmp, "run-%06d" % i),
+             key, reverse, encoding)
+            for i, (start, end) in enumerate(bounds)
+        ]
+        if workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                runs = list(pool.map(_sort_chunk, tasks))
+        else:
+            runs = [_sort_chunk(task) for task in tasks]
+
+        # keep the number of open run files bounded
+        generation = 0
+        while len(runs) > MAX_FAN_IN:
+            merged = []
+            for i in range(0, len(runs), MAX_FAN_IN):
+                group = runs[i:i + MAX_FAN_IN]
+                path = os.path.join(tmp, "merge-%d-%06d" % (generation, i))
+                merge_runs(group, path, key, reverse, encoding)
+                for run in group:
+                    os.remove(run)
+                merged.append(path)
+            runs = merged
+            generation += 1
+
+        merge_runs(runs, output_path, key, reverse, encoding)
+    return len(tasks)
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m sortlib.external",
+        description="Sort the lines of a file that does not fit in memory.",
+    )
+    parser.add_argument("input", help="file to sort")
+    parser.add_argument("-o", "--output", required=True, help="where to write the sorted lines")
+    parser.add_argument("-k", "--key-field", type=int, help="sort on this 1-based field")
+    parser.add_argument("-t", "--delimiter", help="field delimiter (default: whitespace)")
+    parser.add_argument("-n", "--numeric", action="store_true", help="compare the key field as a number")
+    parser.add_argument("-r", "--reverse", action="store_true", help="sort in descending order")
+    parser.add_argument("-S", "--chunk-size", type=parse_size, default=DEFAULT_CHUNK_SIZE,
+                        help="bytes of input per in-memory chunk, e.g. 256M (default: 64M)")
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="processes used to sort chunks in parallel")
+    parser.add_argument("-T", "--tmp-dir", help="directory for temporary run files")
+    parser.add_argument("--encoding", default="utf-8")
+    args = parser.parse_args(argv)
+
+    key = None
+    if args.key_field is not None:
+        key = FieldKey(args.key_field - 1, args.delimiter, args.numeric)
+    elif args.numeric:
+        key = FieldKey(0, args.delimiter, True)
+
+    runs = external_sort(
+        args.input, args.output, key=key, reverse=args.reverse,
+        chunk_size=args.chunk_size, workers=args.workers,
+        tmp_dir=args.tmp_dir, encoding=args.encoding,
+    )
+    print("sorted %s into %s from %d run(s)" % (args.input, args.output, runs), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,32 @@
+# ./Sorting Algorithims/sortlib/insertion.py
+
+from bisect import bisect_right
+
+
+def insertion_sort(a: list, lo: int = 0, hi: int = None) -> None:
+    """
+    Stable in-place insertion sort of a[lo:hi].
+    Used for short slices where it beats every O(n log n) algorithm.
+    """
+    if hi is None:
+        hi = len(a)
+    for i in range(lo + 1, hi):
+        item = a[i]
+        j = i - 1
+        while j >= lo and item < a[j]:
+            a[j + 1] = a[j]
+            j -= 1
+        a[j + 1] = item
+
+
+def binary_insertion_sort(a: list, lo: int, hi: int, start: int) -> None:
+    """
+    Stable in-place sort of a[lo:hi] when a[lo:start] is already sorted.
+    The insertion point is found with bisect, so each element costs
+    O(log n) comparisons and only the moves are linear.
+    """
+    for i in range(start, hi):
+        item = a[i]
+        pos = bisect_right(a, item, lo, i)
+        a[pos + 1:i + 1] = a[pos:i]
+        a[pos] = item
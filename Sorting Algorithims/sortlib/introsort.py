@@ -0,0 +1,237 @@
+# ./Sorting Algorithims/sortlib/introsort.py
+
+"""
+Pattern-defeating quicksort (pdqsort), after Orson Peters' reference
+implementation. Introsort at heart: quicksort with insertion sort for
+short slices and heapsort once too many bad partitions happen, plus
+pattern detection for sorted input and many equal keys.
+"""
+
+from .insertion import insertion_sort
+
+# slices shorter than this are finished with insertion sort
+INSERTION_THRESHOLD = 24
+# above this size the pivot is the pseudomedian of nine (Tukey's ninther)
+NINTHER_THRESHOLD = 128
+# moves allowed before partial_insertion_sort gives up
+PARTIAL_INSERTION_LIMIT = 8
+
+
+def _unguarded_insertion_sort(a: list, lo: int, hi: int) -> None:
+    # a[lo - 1] is a lower bound for the slice, so no j >= lo check
+    for i in range(lo + 1, hi):
+        item = a[i]
+        j = i - 1
+        while item < a[j]:
+            a[j + 1] = a[j]
+            j -= 1
+        a[j + 1] = item
+
+
+def _partial_insertion_sort(a: list, lo: int, hi: int) -> bool:
+    """
+    Insertion sort a[lo:hi] but give up once more than
+    PARTIAL_INSERTION_LIMIT elements have been moved.
+    Returns True if the slice ended up sorted.
+    """
+    moved = 0
+    for i in range(lo + 1, hi):
+        if a[i] < a[i - 1]:
+            item = a[i]
+            j = i - 1
+            while j >= lo and item < a[j]:
+                a[j + 1] = a[j]
+                j -= 1
+            a[j + 1] = item
+            moved += i - j - 1
+            if moved > PARTIAL_INSERTION_LIMIT:
+                return False
+    return True
+
+
+def _sort2(a: list, i: int, j: int) -> None:
+    if a[j] < a[i]:
+        a[i], a[j] = a[j], a[i]
+
+
+def _sort3(a: list, i: int, j: int, k: int) -> None:
+    _sort2(a, i, j)
+    _sort2(a, j, k)
+    _sort2(a, i, j)
+
+
+def _partition_right(a: list, lo: int, hi: int) -> tuple:
+    """
+    Partition a[lo:hi] around the pivot a[lo]; elements equal to the pivot
+    go right. Returns the pivot's final index and whether the slice was
+    already partitioned (no swaps were needed).
+    """
+    pivot = a[lo]
+    first, last = lo + 1, hi - 1
+    # median-of-three guarantees an element >= pivot exists on the right
+    while a[first] < pivot:
+        first += 1
+    if first - 1 == lo:
+        while first < last and not a[last] < pivot:
+            last -= 1
+    else:
+        while not a[last] < pivot:
+            last -= 1
+    already_partitioned = first >= last
+
+    while first < last:
+        a[first], a[last] = a[last], a[first]
+        first += 1
+        while a[first] < pivot:
+            first += 1
+        last -= 1
+        while not a[last] < pivot:
+            last -= 1
+
+    pivot_pos = first - 1
+    a[lo] = a[pivot_pos]
+    a[pivot_pos] = pivot
+    return pivot_pos, already_partitioned
+
+
+def _partition_left(a: list, lo: int, hi: int) -> int:
+    """
+    Partition a[lo:hi] around a[lo] with elements equal to the pivot going
+    left. Used when the pivot equals its predecessor, so the whole equal
+    block is placed in one step and never revisited.
+    """
+    pivot = a[lo]
+    first, last = lo, hi - 1
+    while pivot < a[last]:
+        last -= 1
+    if last + 1 == hi:
+        first += 1
+        while first < last and not pivot < a[first]:
+            first += 1
+    else:
+        first += 1
+        while not pivot < a[first]:
+            first += 1
+
+    while first < last:
+        a[first], a[last] = a[last], a[first]
+        last -= 1
+        while pivot < a[last]:
+            last -= 1
+        first += 1
+        while not pivot < a[first]:
+            first += 1
+
+    a[lo] = a[last]
+    a[last] = pivot
+    return last
+
+
+def _sift_down(a: list, lo: int, root: int, size: int) -> None:
+    item = a[lo + root]
+    while True:
+        child = 2 * root + 1
+        if child >= size:
+            break
+        if child + 1 < size and a[lo + child] < a[lo + child + 1]:
+            child += 1
+        if not item < a[lo + child]:
+            break
+        a[lo + root] = a[lo + child]
+        root = child
+    a[lo + root] = item
+
+
+def heap_sort(a: list, lo: int = 0, hi: int = None) -> None:
+    """
+    In-place heapsort of a[lo:hi]; the O(n log n) worst-case fallback.
+    """
+    if hi is None:
+        hi = len(a)
+    size = hi - lo
+    for root in range(size // 2 - 1, -1, -1):
+        _sift_down(a, lo, root, size)
+    for end in range(size - 1, 0, -1):
+        a[lo], a[lo + end] = a[lo + end], a[lo]
+        _sift_down(a, lo, 0, end)
+
+
+def _pdqsort_loop(a: list, lo: int, hi: int, bad_allowed: int, leftmost: bool) -> None:
+    while True:
+        size = hi - lo
+        if size < INSERTION_THRESHOLD:
+            if leftmost:
+                insertion_sort(a, lo, hi)
+            else:
+                _unguarded_insertion_sort(a, lo, hi)
+            return
+
+        half = size // 2
+        if size > NINTHER_THRESHOLD:
+            _sort3(a, lo, lo + half, hi - 1)
+            _sort3(a, lo + 1, lo + half - 1, hi - 2)
+            _sort3(a, lo + 2, lo + half + 1, hi - 3)
+            _sort3(a, lo + half - 1, lo + half, lo + half + 1)
+            a[lo], a[lo + half] = a[lo + half], a[lo]
+        else:
+            _sort3(a, lo + half, lo, hi - 1)
+
+        # a pivot equal to the element before this slice means every
+        # element equal to it belongs left: skip the whole block
+        if not leftmost and not a[lo - 1] < a[lo]:
+            lo = _partition_left(a, lo, hi) + 1
+            continue
+
+        pivot_pos, already_partitioned = _partition_right(a, lo, hi)
+        l_size = pivot_pos - lo
+        r_size = hi - (pivot_pos + 1)
+
+        if l_size < size // 8 or r_size < size // 8:
+            bad_allowed -= 1
+            if bad_allowed == 0:
+                heap_sort(a, lo, hi)
+                return
+            # break up the pattern that produced the bad pivot
+            if l_size >= INSERTION_THRESHOLD:
+                q = l_size // 4
+                a[lo], a[lo + q] = a[lo + q], a[lo]
+                a[pivot_pos - 1], a[pivot_pos - q] = a[pivot_pos - q], a[pivot_pos - 1]
+                if l_size > NINTHER_THRESHOLD:
+                    a[lo + 1], a[lo + q + 1] = a[lo + q + 1], a[lo + 1]
+                    a[lo + 2], a[lo + q + 2] = a[lo + q + 2], a[lo + 2]
+                    a[pivot_pos - 2], a[pivot_pos - q - 1] = a[pivot_pos - q - 1], a[pivot_pos - 2]
+                    a[pivot_pos - 3], a[pivot_pos - q - 2] = a[pivot_pos - q - 2], a[pivot_pos - 3]
+            if r_size >= INSERTION_THRESHOLD:
+                q = r_size // 4
+                a[pivot_pos + 1], a[pivot_pos + 1 + q] = a[pivot_pos + 1 + q], a[pivot_pos + 1]
+                a[hi - 1], a[hi - q] = a[hi - q], a[hi - 1]
+                if r_size > NINTHER_THRESHOLD:
+                    a[pivot_pos + 2], a[pivot_pos + 2 + q] = a[pivot_pos + 2 + q], a[pivot_pos + 2]
+                    a[pivot_pos + 3], a[pivot_pos + 3 + q] = a[pivot_pos + 3 + q], a[pivot_pos + 3]
+                    a[hi - 2], a[hi - 1 - q] = a[hi - 1 - q], a[hi - 2]
+                    a[hi - 3], a[hi - 2 - q] = a[hi - 2 - q], a[hi - 3]
+        elif (
+            already_partitioned
+            and _partial_insertion_sort(a, lo, pivot_pos)
+            and _partial_insertion_sort(a, pivot_pos + 1, hi)
+        ):
+            # input looked (nearly) sorted and cheap insertion finished it
+            return
+
+        _pdqsort_loop(a, lo, pivot_pos, bad_allowed, leftmost)
+        lo = pivot_pos + 1
+        leftmost = False
+
+
+def introsort(a: list, lo: int = 0, hi: int = None) -> None:
+    """
+    In-place, unstable pattern-defeating quicksort of a[lo:hi].
+    O(n log n) worst case, O(n) on sorted, reversed-then-fixed and
+    all-equal inputs.
+    """
+    if hi is None:
+        hi = len(a)
+    size = hi - lo
+    if size < 2:
+        return
+    _pdqsort_loop(a, lo, hi, size.bit_length(), True)
@@ -0,0 +1,157 @@
+# ./Sorting Algorithims/sortlib/merging.py
+
+from bisect import bisect_left, bisect_right
+
+from .insertion import binary_insertion_sort
+
+# runs shorter than this are extended with binary insertion before merging
+MIN_MERGE = 32
+
+
+def min_run_length(n: int) -> int:
+    """
+    Minimum run length for n elements, chosen (as in Timsort) so that
+    n / minrun is close to, but not above, a power of two.
+    """
+    extra = 0
+    while n >= MIN_MERGE:
+        extra |= n & 1
+        n >>= 1
+    return n + extra
+
+
+def count_run(a: list, lo: int, hi: int) -> int:
+    """
+    Length of the natural run starting at a[lo].
+    Strictly descending runs are reversed in place so every run ends up
+    ascending; requiring strictness keeps the sort stable.
+    """
+    run_hi = lo + 1
+    if run_hi == hi:
+        return 1
+    if a[run_hi] < a[lo]:
+        while run_hi < hi and a[run_hi] < a[run_hi - 1]:
+            run_hi += 1
+        a[lo:run_hi] = a[lo:run_hi][::-1]
+    else:
+        while run_hi < hi and not a[run_hi] < a[run_hi - 1]:
+            run_hi += 1
+    return run_hi - lo
+
+
+def count_runs(a: list, limit: int = None) -> int:
+    """
+    Number of natural runs (ascending or strictly descending) in a,
+    without modifying it. Counting stops once limit is exceeded.
+    """
+    n = len(a)
+    runs = 0
+    i = 0
+    while i < n:
+        runs += 1
+        if limit is not None and runs > limit:
+            break
+        j = i + 1
+        if j < n and a[j] < a[i]:
+            while j < n and a[j] < a[j - 1]:
+                j += 1
+        else:
+            while j < n and not a[j] < a[j - 1]:
+                j += 1
+        i = j
+    return runs
+
+
+def _merge_lo(a: list, lo: int, mid: int, hi: int, buf: list) -> None:
+    # the left run is the shorter one: park it in buf and merge forwards
+    m = mid - lo
+    for t in range(m):
+        buf[t] = a[lo + t]
+    i, j, k = 0, mid, lo
+    while i < m and j < hi:
+        if a[j] < buf[i]:
+            a[k] = a[j]
+            j += 1
+        else:
+            a[k] = buf[i]
+            i += 1
+        k += 1
+    # whatever is left of the right run is already in place
+    while i < m:
+        a[k] = buf[i]
+        i += 1
+        k += 1
+
+
+def _merge_hi(a: list, lo: int, mid: int, hi: int, buf: list) -> None:
+    # the right run is the shorter one: park it in buf and merge backwards
+    m = hi - mid
+    for t in range(m):
+        buf[t] = a[mid + t]
+    i, j, k = mid - 1, m - 1, hi - 1
+    while i >= lo and j >= 0:
+        if buf[j] < a[i]:
+            a[k] = a[i]
+            i -= 1
+        else:
+            a[k] = buf[j]
+            j -= 1
+        k -= 1
+    while j >= 0:
+        a[k] = buf[j]
+        j -= 1
+        k -= 1
+
+
+def merge_runs(a: list, lo: int, mid: int, hi: int, buf: list) -> None:
+    """
+    Stable merge of the sorted runs a[lo:mid] and a[mid:hi].
+    Only the shorter run (after trimming the parts already in place) is
+    copied, and always into buf, so buf needs room for half the input.
+    """
+    if lo == mid or mid == hi or not a[mid] < a[mid - 1]:
+        return
+    # leading left elements <= a[mid] and trailing right elements
+    # >= a[mid - 1] do not move
+    lo = bisect_right(a, a[mid], lo, mid)
+    hi = bisect_left(a, a[mid - 1], mid, hi)
+    if mid - lo <= hi - mid:
+        _merge_lo(a, lo, mid, hi, buf)
+    else:
+        _merge_hi(a, lo, mid, hi, buf)
+
+
+def merge_sort(a: list, buf: list = None) -> None:
+    """
+    Stable in-place natural merge sort.
+    Existing runs are detected and reused, short runs are extended to the
+    minimum run length, then neighbouring runs are merged pairwise through
+    a single buffer allocated once for the whole sort.
+    """
+    n = len(a)
+    if n < 2:
+        return
+    minrun = min_run_length(n)
+
+    bounds = []
+    lo = 0
+    while lo < n:
+        length = count_run(a, lo, n)
+        if length < minrun:
+            forced = min(minrun, n - lo)
+            binary_insertion_sort(a, lo, lo + forced, lo + length)
+            length = forced
+        bounds.append(lo)
+        lo += length
+    bounds.append(n)
+
+    if buf is None or len(buf) < n // 2:
+        buf = [None] * (n // 2)
+    while len(bounds) > 2:
+        merged = []
+        for k in range(0, len(bounds) - 1, 2):
+            if k + 2 < len(bounds):
+                merge_runs(a, bounds[k], bounds[k + 1], bounds[k + 2], buf)
+            merged.append(bounds[k])
+        merged.append(n)
+        bounds = merged
@@ -0,0 +1,186 @@
+# ./Sorting Algorithims/sortlib/parallel.py
+
+"""
+Parallel sort of large numeric arrays across processes (requires NumPy).
+
+The keys are copied once into a multiprocessing.shared_memory segment
+that is split into one block per worker. Workers attach to the segment
+by name and sort their block in place, so only names and offsets are
+ever pickled. The merge phase is parallel too (parallel sorting by
+regular sampling): splitters taken from the sorted blocks divide the
+key space into one bucket per worker, and each worker merges its slice
+of every block straight into its own region of a shared output segment.
+
+    python -m sortlib.parallel --size 100000000 --max-workers 8
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# below this many keys the process start-up costs more than it saves
+PARALLEL_MIN_SIZE = 1 << 16
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    # only the creating process may unlink the segment (track= is 3.13+)
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+def _sort_block(task: tuple) -> None:
+    name, n, dtype, lo, hi = task
+    shm = _attach(name)
+    try:
+        keys = np.ndarray((n,), dtype=dtype, buffer=shm.buf)
+        keys[lo:hi].sort()
+        del keys
+    finally:
+        shm.close()
+
+
+def _merge_bucket(task: tuple) -> None:
+    src_name, dst_name, n, dtype, pieces, offset = task
+    src_shm, dst_shm = _attach(src_name), _attach(dst_name)
+    try:
+        src = np.ndarray((n,), dtype=dtype, buffer=src_shm.buf)
+        dst = np.ndarray((n,), dtype=dtype, buffer=dst_shm.buf)
+        size = sum(hi - lo for lo, hi in pieces)
+        region = dst[offset:offset + size]
+        np.concatenate([src[lo:hi] for lo, hi in pieces], out=region)
+        # the region is a handful of sorted runs; a stable sort (Timsort
+        # or radix) merges them in one linear-ish pass
+        region.sort(kind="stable")
+        del src, dst, region
+    finally:
+        src_shm.close()
+        dst_shm.close()
+
+
+def _block_bounds(n: int, parts: int) -> list:
+    edges = [n * i // parts for i in range(parts + 1)]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def _bucket_pieces(keys, blocks: list, parts: int) -> list:
+    """
+    Regular sampling: parts - 1 samples per sorted block, parts - 1
+    splitters from the sorted samples, then one binary search per block
+    and splitter. Returns for every bucket its (lo, hi) slice of each block.
+    """
+    samples = np.concatenate([
+        keys[[lo + (hi - lo) * i // parts for i in range(1, parts)]]
+        for lo, hi in blocks
+    ])
+    samples.sort()
+    splitters = samples[[len(samples) * i // parts for i in range(1, parts)]]
+
+    cuts = [
+        [lo] + (np.searchsorted(keys[lo:hi], splitters, side="right") + lo).tolist() + [hi]
+        for lo, hi in blocks
+    ]
+    return [
+        [(cut[j], cut[j + 1]) for cut in cuts if cut[j + 1] > cut[j]]
+        for j in range(parts)
+    ]
+
+
+def parallel_sort(data, workers: int = None):
+    """
+    Return a sorted copy of a 1-D numeric array, using up to workers
+    processes (default: all CPUs) for both the block sort and the merge.
+    """
+    if np is None:
+        raise ImportError("parallel_sort needs NumPy")
+    keys = np.asarray(data)
+    if keys.ndim != 1 or keys.dtype.kind not in "iufb":
+        raise TypeError("parallel_sort needs a 1-D array of numbers")
+    workers = workers or os.cpu_count() or 1
+    n = len(keys)
+    if workers == 1 or n < PARALLEL_MIN_SIZE:
+        return np.sort(keys)
+
+    dtype = keys.dtype.str
+    src_shm = shared_memory.SharedMemory(create=True, size=keys.nbytes)
+    dst_shm = shared_memory.SharedMemory(create=True, size=keys.nbytes)
+    try:
+        src = np.ndarray((n,), dtype=keys.dtype, buffer=src_shm.buf)
+        dst = np.ndarray((n,), dtype=keys.dtype, buffer=dst_shm.buf)
+        src[:] = keys
+        blocks = _block_bounds(n, workers)
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(_sort_block, [
+                (src_shm.name, n, dtype, lo, hi) for lo, hi in blocks
+            ]))
+            buckets = _bucket_pieces(src, blocks, workers)
+            tasks, offset = [], 0
+            for pieces in buckets:
+                if pieces:
+                    tasks.append((src_shm.name, dst_shm.name, n, dtype, pieces, offset))
+                    offset += sum(hi - lo for lo, hi in pieces)
+            list(pool.map(_merge_bucket, tasks))
+
+        result = dst.copy()
+        del src, dst
+        return result
+    finally:
+        for shm in (src_shm, dst_shm):
+            shm.close()
+            shm.unlink()
+
+
+def scaling_benchmark(size: int, max_workers: int, dtype: str = "float64",
+                      repeat: int = 1, seed: int = 0) -> list:
+    """
+    Time parallel_sort on the same random array with 1..max_workers
+    processes. Returns (workers, best seconds, speedup over 1) rows.
+    """
+    rng = np.random.default_rng(seed)
+    if np.dtype(dtype).kind == "f":
+        data = rng.random(size).astype(dtype)
+    else:
+        info = np.iinfo(dtype)
+        data = rng.integers(info.min, info.max, size, dtype=dtype, endpoint=True)
+
+    rows = []
+    for workers in range(1, max_workers + 1):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            parallel_sort(data, workers)
+            best = min(best, time.perf_counter() - start)
+        rows.append((workers, best, rows[0][1] / best if rows else 1.0))
+    return rows
+
+
+def main(argv: list = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m sortlib.parallel",
+        description="Scaling benchmark of the shared-memory parallel sort.",
+    )
+    parser.add_argument("--size", type=int, default=10_000_000)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--dtype", default="float64")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print("sorting %d %s keys" % (args.size, args.dtype))
+    print("%8s %10s %8s" % ("workers", "seconds", "speedup"))
+    for workers, seconds, speedup in scaling_benchmark(
+        args.size, args.max_workers, args.dtype, args.repeat
+    ):
+        print("%8d %10.3f %7.2fx" % (workers, seconds, speedup))
+
+
+if __name__ == "__main__":
+    main()
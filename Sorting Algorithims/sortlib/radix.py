@@ -0,0 +1,167 @@
+# ./Sorting Algorithims/sortlib/radix.py
+
+"""
+Radix sorts for keys that have a natural digit decomposition.
+
+Integers and floats go through byte-wise LSD passes: integers are offset
+by the smallest key so negatives need no special casing, and floats are
+mapped to unsigned ints whose order matches the float order. Strings and
+bytes go through an MSD pass per byte of their UTF-8 encoding, which
+orders exactly like Python's code point comparison.
+
+NumPy is used for the histogram and scatter passes when it is installed;
+every path also has a pure Python fallback.
+"""
+
+from array import array
+from collections import defaultdict
+
+from .insertion import insertion_sort
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+RADIX_BITS = 8
+RADIX_MASK = (1 << RADIX_BITS) - 1
+SIGN_BIT = 1 << 63
+UINT64_MASK = (1 << 64) - 1
+# MSD buckets this small are finished with insertion sort
+MSD_CUTOFF = 32
+
+
+def key_kind(keys: list) -> str:
+    """
+    "int", "float", "str" or "bytes" when every key has that type, else None.
+    """
+    if all(type(k) is int for k in keys):
+        return "int"
+    if all(type(k) is float for k in keys):
+        return "float"
+    if all(type(k) is str for k in keys):
+        return "str"
+    if all(isinstance(k, (bytes, bytearray)) for k in keys):
+        return "bytes"
+    return None
+
+
+def _float_bits(keys: list) -> list:
+    """
+    Map floats to unsigned 64-bit ints with the same order: flip every bit
+    of negatives, set the sign bit of positives. -0.0 is folded into 0.0
+    first since Python compares them equal.
+    """
+    raw = array("d", [k + 0.0 for k in keys]).tobytes()
+    bits = memoryview(raw).cast("Q").tolist()
+    return [b ^ UINT64_MASK if b & SIGN_BIT else b | SIGN_BIT for b in bits]
+
+
+def _lsd_order_python(ukeys: list, width: int) -> list:
+    # one stable bucket distribution per byte, least significant first
+    n = len(ukeys)
+    order = list(range(n))
+    for shift in range(0, width * RADIX_BITS, RADIX_BITS):
+        buckets = [[] for _ in range(RADIX_MASK + 1)]
+        for i in order:
+            buckets[(ukeys[i] >> shift) & RADIX_MASK].append(i)
+        if any(len(bucket) == n for bucket in buckets):
+            # every key has the same byte here, the pass changes nothing
+            continue
+        order = [i for bucket in buckets for i in bucket]
+    return order
+
+
+def _lsd_order_numpy(ukeys, width: int):
+    # histograms of every byte in one go, so constant bytes cost no pass
+    n = len(ukeys)
+    shifts = [np.uint64(s) for s in range(0, width * RADIX_BITS, RADIX_BITS)]
+    digits = [((ukeys >> s) & np.uint64(RADIX_MASK)).astype(np.uint8) for s in shifts]
+    order = np.arange(n)
+    for digit in digits:
+        if np.bincount(digit, minlength=RADIX_MASK + 1).max() == n:
+            continue
+        # a stable argsort of 8-bit keys is a counting sort inside NumPy,
+        # which places each bucket by its prefix-summed histogram
+        order = order[np.argsort(digit[order], kind="stable")]
+    return order
+
+
+def lsd_order(keys: list) -> list:
+    """
+    Stable permutation that sorts int or float keys, via byte-wise LSD.
+    """
+    if not keys:
+        return []
+    kind = key_kind(keys)
+    if kind == "float":
+        if np is not None:
+            bits = (np.asarray(keys, dtype=np.float64) + 0.0).view(np.uint64)
+            negative = (bits >> np.uint64(63)).astype(bool)
+            ukeys = np.where(negative, ~bits, bits | np.uint64(SIGN_BIT))
+            return _lsd_order_numpy(ukeys, 8).tolist()
+        return _lsd_order_python(_float_bits(keys), 8)
+    if kind != "int":
+        raise TypeError("LSD radix sort needs int or float keys")
+
+    # offset by the minimum: negative keys need no sign handling
+    lo, hi = min(keys), max(keys)
+    width = max(1, ((hi - lo).bit_length() + RADIX_BITS - 1) // RADIX_BITS)
+    if np is not None and -(1 << 63) <= lo and hi < (1 << 63) and hi - lo < (1 << 63):
+        ukeys = (np.asarray(keys, dtype=np.int64) - np.int64(lo)).astype(np.uint64)
+        return _lsd_order_numpy(ukeys, width).tolist()
+    return _lsd_order_python([k - lo for k in keys], width)
+
+
+def msd_order(keys: list) -> list:
+    """
+    Stable permutation that sorts str or bytes keys, via MSD on UTF-8 bytes.
+    Strings that end at the current depth sort before every continuation.
+    """
+    encoded = [
+        k.encode("utf-8", "surrogatepass") if isinstance(k, str) else k for k in keys
+    ]
+    order = list(range(len(keys)))
+    stack = [(0, len(order), 0)]
+    while stack:
+        lo, hi, depth = stack.pop()
+        if hi - lo <= MSD_CUTOFF:
+            # ties on the bytes fall back to the index, keeping stability
+            pairs = [(encoded[i], i) for i in order[lo:hi]]
+            insertion_sort(pairs)
+            order[lo:hi] = [i for _, i in pairs]
+            continue
+
+        buckets = defaultdict(list)
+        for i in order[lo:hi]:
+            key = encoded[i]
+            buckets[key[depth] + 1 if depth < len(key) else 0].append(i)
+        pos = lo
+        for byte in sorted(buckets):
+            bucket = buckets[byte]
+            order[pos:pos + len(bucket)] = bucket
+            # bucket 0 holds keys that already ended: all equal, done
+            if byte and len(bucket) > 1:
+                stack.append((pos, pos + len(bucket), depth + 1))
+            pos += len(bucket)
+    return order
+
+
+def radix_sort(keys: list, items: list = None) -> list:
+    """
+    Stable radix sort of items by their keys: LSD for int and float keys,
+    MSD for str and bytes keys. When items is omitted the keys themselves
+    are sorted.
+    """
+    if items is None:
+        items = keys
+    if not keys:
+        return []
+    kind = key_kind(keys)
+    if kind in ("str", "bytes"):
+        order = msd_order(keys)
+    elif kind in ("int", "float"):
+        order = lsd_order(keys)
+    else:
+        raise TypeError("radix sort needs int, float, str or bytes keys")
+    return [items[i] for i in order]
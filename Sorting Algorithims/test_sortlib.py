@@ -0,0 +1,202 @@
+#
+# Test sortlib
+# ************
+#
+# Usage: python test_sortlib.py
+#
+
+
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+from sortlib import ALGORITHMS, choose_algorithm, sort
+from sortlib import benchmark, external, parallel, radix
+
+
+def distributions(n: int) -> dict:
+    rng = random.Random(n)
+    return {
+        "random": [rng.randint(-1000, 1000) for _ in range(n)],
+        "sorted": list(range(n)),
+        "reversed": list(range(n, 0, -1)),
+        "few_unique": [rng.randint(0, 3) for _ in range(n)],
+        "sawtooth": [i % 17 for i in range(n)],
+    }
+
+
+class TestSort(unittest.TestCase):
+    """
+    Every engine must agree with sorted() on every distribution.
+    """
+
+    def test_matches_builtin(self):
+        for n in (0, 1, 2, 23, 24, 25, 130, 600):
+            for name, data in distributions(n).items():
+                for algorithm in list(ALGORITHMS) + ["auto"]:
+                    with self.subTest(n=n, data=name, algorithm=algorithm):
+                        self.assertEqual(sort(data, algorithm=algorithm), sorted(data))
+                        self.assertEqual(
+                            sort(data, algorithm=algorithm, reverse=True),
+                            sorted(data, reverse=True),
+                        )
+
+    def test_key_is_stable(self):
+        records = [(random.Random(i).randint(0, 9), i) for i in range(300)]
+        for algorithm in list(ALGORITHMS) + ["auto"]:
+            with self.subTest(algorithm=algorithm):
+                self.assertEqual(
+                    sort(records, key=lambda r: r[0], algorithm=algorithm),
+                    sorted(records, key=lambda r: r[0]),
+                )
+
+    def test_input_not_modified(self):
+        data = [3, 1, 2] * 20
+        copy = list(data)
+        sort(data)
+        self.assertEqual(data, copy)
+
+    def test_unknown_algorithm(self):
+        with self.assertRaises(ValueError):
+            sort([2, 1], algorithm="bogo")
+
+
+class TestRadix(unittest.TestCase):
+    """
+    LSD for ints and floats, MSD for strings, with and without NumPy.
+    """
+
+    def check(self, data):
+        self.assertEqual(radix.radix_sort(data), sorted(data))
+        numpy = radix.np
+        radix.np = None
+        try:
+            self.assertEqual(radix.radix_sort(data), sorted(data))
+        finally:
+            radix.np = numpy
+
+    def test_ints(self):
+        rng = random.Random(1)
+        self.check([rng.randint(-2 ** 40, 2 ** 40) for _ in range(500)])
+        self.check([rng.randint(-2 ** 80, 2 ** 80) for _ in range(200)])
+
+    def test_floats(self):
+        rng = random.Random(2)
+        data = [rng.uniform(-1e9, 1e9) for _ in range(500)]
+        self.check(data + [0.0, -0.0, float("inf"), float("-inf")])
+
+    def test_strings(self):
+        rng = random.Random(3)
+        words = ["", "a", "ab", "abc", "b", "\u00e9", "\U0001f600", "z"]
+        self.check(["".join(rng.choice(words) for _ in range(3)) for _ in range(500)])
+        self.check([bytes(rng.randrange(256) for _ in range(3)) for _ in range(500)])
+
+    def test_rejects_mixed_keys(self):
+        with self.assertRaises(TypeError):
+            radix.radix_sort([1, "a"])
+
+
+class TestExternalSort(unittest.TestCase):
+    """
+    Small chunk sizes force many runs and a multi-pass merge.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        rng = random.Random(4)
+        self.lines = ["%d,%s" % (rng.randint(-99, 99), rng.choice("abc")) for _ in range(2000)]
+        self.src = os.path.join(self.tmp.name, "in.txt")
+        self.dst = os.path.join(self.tmp.name, "out.txt")
+        with open(self.src, "w") as f:
+            f.write("\n".join(self.lines))
+
+    def read_output(self):
+        with open(self.dst) as f:
+            return f.read().split("\n")[:-1]
+
+    def test_plain(self):
+        runs = external.external_sort(self.src, self.dst, chunk_size=1000)
+        self.assertGreater(runs, 1)
+        self.assertEqual(self.read_output(), sorted(self.lines))
+
+    def test_key_reverse_multipass(self):
+        key = external.FieldKey(0, ",", numeric=True)
+        fan_in = external.MAX_FAN_IN
+        external.MAX_FAN_IN = 3
+        try:
+            external.external_sort(self.src, self.dst, key=key, reverse=True, chunk_size=1000)
+        finally:
+            external.MAX_FAN_IN = fan_in
+        self.assertEqual(self.read_output(), sorted(self.lines, key=key, reverse=True))
+
+    def test_parallel_cli(self):
+        external.main([self.src, "-o", self.dst, "-t", ",", "-k", "2", "-S", "2K", "-j", "2"])
+        self.assertEqual(self.read_output(), sorted(self.lines, key=lambda l: l.split(",")[1]))
+
+
+@unittest.skipIf(parallel.np is None, "parallel_sort needs NumPy")
+class TestParallelSort(unittest.TestCase):
+    """
+    Block sort plus regular-sampling merge must equal numpy.sort.
+    """
+
+    def test_matches_numpy(self):
+        np = parallel.np
+        rng = np.random.default_rng(5)
+        n = parallel.PARALLEL_MIN_SIZE + 7
+        for data in (rng.standard_normal(n), rng.integers(-50, 50, n), np.zeros(n)):
+            with self.subTest(dtype=data.dtype.str):
+                self.assertTrue(np.array_equal(parallel.parallel_sort(data, 3), np.sort(data)))
+
+
+class TestBenchmark(unittest.TestCase):
+    """
+    Scripts are loaded without running their demo code.
+    """
+
+    def test_load_script_skips_side_effects(self):
+        with mock.patch("builtins.input", side_effect=AssertionError("input() called")):
+            namespace = benchmark.load_script(benchmark.SORTING_DIR / "Bubble_sort.py")
+        data = [3, 1, 2]
+        namespace["bubble_sort"](data)
+        self.assertEqual(data, [1, 2, 3])
+
+    def test_run_benchmarks(self):
+        results = benchmark.run_benchmarks(sizes=[50], distributions=["random"], repeat=1, only="heap")
+        self.assertEqual({r.implementation for r in results}, {"algos/heap", "sortlib/heap"})
+        for r in results:
+            self.assertIsNone(r.error)
+            self.assertGreater(r.comparisons, 0)
+        self.assertIn("algos/heap", benchmark.format_table(results))
+
+    def test_dispatcher_counts_are_not_reported(self):
+        # "auto" picks counting sort for these ints but introsort for
+        # instrumented keys, so its counts would describe another sort
+        results = benchmark.run_benchmarks(sizes=[200], distributions=["few_unique"], repeat=1,
+                                           only="sortlib/auto")
+        self.assertEqual([(r.implementation, r.comparisons, r.swaps) for r in results],
+                         [("sortlib/auto", None, None)])
+        self.assertIsNone(results[0].error)
+        self.assertIsNotNone(results[0].seconds)
+
+
+class TestChooseAlgorithm(unittest.TestCase):
+    """
+    The dispatcher looks at size, presortedness and key range.
+    """
+
+    def test_choices(self):
+        rng = random.Random(0)
+        self.assertEqual(choose_algorithm([3, 2, 1]), "insertion")
+        self.assertEqual(choose_algorithm(list(range(1000))), "merge")
+        self.assertEqual(choose_algorithm([rng.randint(0, 50) for _ in range(1000)]), "counting")
+        self.assertEqual(choose_algorithm([str(rng.random()) for _ in range(1000)]), "introsort")
+        if radix.np is not None:
+            self.assertEqual(choose_algorithm([rng.random() for _ in range(1000)]), "radix")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,6 +4,8 @@
   Python program to find triplets in a given  array whose sum is zero 
 '''
 
+from k_sum import k_sum
+
 # function to print triplets with 0 sum 
 def find_Triplets_with_zero_sum(arr, num): 
    
@@ -19,40 +21,12 @@ def find_Triplets_with_zero_sum(arr, num):
     # bool variable to check if triplet found or not 
     found = False
 
-    # sort array elements 
-    arr.sort() 
-
-    # Run a loop until l is less than r, if the sum of array[l], array[r] is equal to zero then print the triplet and break the loop
-    for index in range(0, num - 1) : 
-    
-        # initialize left and right 
-        left = index + 1
-        right = num - 1
+    # k_sum sorts a copy of the array and reports every triplet once,
+    # even when the array contains repeated values
+    for triplet in k_sum(arr[:num], k=3, target=0):
+        print(*triplet)
+        found = True
 
-        curr = arr[index] # current element
-        
-        while (left < right): 
-            
-            temp = curr + arr[left] + arr[right] 
-            
-            if (temp == 0) : 
-                # print elements if it's sum is zero 
-                print(curr, arr[left], arr[right]) 
-                
-                left += 1
-                right -= 1
-                
-                found = True
-            
-
-            # If sum of three elements is less  than zero then increment in left 
-            elif (temp < 0) : 
-                left += 1
-
-            # if sum is greater than zero than decrement in right side 
-            else: 
-                right -= 1
-        
     if (found == False): 
         print(" No Triplet Found") 
 
@@ -0,0 +1,159 @@
+'''
+  Generalisation of find_Triplets_with_zero_sum : unique k-tuples
+  (k = 2, 3 or 4) of an array that add up to an arbitrary target.
+'''
+
+import os
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# from this many elements on, the outer loop is split across processes
+PARALLEL_MIN_SIZE = 100_000
+
+# sorted array shipped once to every worker process by _init_worker
+_ARR = None
+
+
+def _sorted_values(arr):
+    ''' sorted copy of arr as a list of plain Python numbers '''
+    if np is not None:
+        return np.sort(np.asarray(arr)).tolist()
+    return sorted(arr)
+
+
+def _two_sum(arr, lo, hi, target):
+    ''' unique pairs in sorted arr[lo:hi] with the given sum (two pointers) '''
+    left, right = lo, hi - 1
+    while left < right:
+        total = arr[left] + arr[right]
+        if total == target:
+            yield arr[left], arr[right]
+            left += 1
+            right -= 1
+            # skip equal values so every pair is reported once
+            while left < right and arr[left] == arr[left - 1]:
+                left += 1
+            while left < right and arr[right] == arr[right + 1]:
+                right -= 1
+        elif total < target:
+            left += 1
+        else:
+            right -= 1
+
+
+def _two_sum_hashed(arr, lo, hi, target):
+    ''' unique pairs in sorted arr[lo:hi] with the given sum (hash set) '''
+    seen, found = set(), set()
+    for index in range(lo, hi):
+        value = arr[index]
+        # arr is sorted, so the partner is never larger than value
+        if target - value in seen and value not in found:
+            found.add(value)
+            yield target - value, value
+        seen.add(value)
+
+
+def _outer_candidates(arr, start, lo, hi, k, target):
+    ''' indices i, lo <= i < hi, whose value can start a k-tuple of arr[start:] '''
+    n = len(arr)
+    for i in range(lo, min(hi, n - k + 1)):
+        # only the first copy of a value starts tuples
+        if i > start and arr[i] == arr[i - 1]:
+            continue
+        # the k smallest values starting at i already overshoot
+        if sum(arr[i:i + k]) > target:
+            break
+        # even the k - 1 largest values cannot reach the target
+        if arr[i] + sum(arr[n - k + 1:]) < target:
+            continue
+        yield i
+
+
+def _k_sum_range(arr, lo, hi, k, target):
+    ''' unique k-tuples whose first element has its first index in [lo, hi), as found '''
+    n = len(arr)
+    for i in _outer_candidates(arr, 0, lo, hi, k, target):
+        first = arr[i]
+        rest = target - first
+        if k == 2:
+            # the first element fixes the pair; binary search the partner
+            j = bisect_left(arr, rest, i + 1)
+            if j < n and arr[j] == rest:
+                yield first, rest
+        elif k == 3:
+            for pair in _two_sum(arr, i + 1, n, rest):
+                yield (first,) + pair
+        else:
+            yield from _three_sum_hashed(arr, i + 1, n, first, rest)
+
+
+def _three_sum_hashed(arr, lo, hi, first, target):
+    ''' (first, b, c, d) for unique triplets of sorted arr[lo:hi] summing to target '''
+    for j in _outer_candidates(arr, lo, lo, hi, 3, target):
+        second = arr[j]
+        # the hash scan finds pairs by their larger value; sort them back
+        for pair in sorted(_two_sum_hashed(arr, j + 1, hi, target - second)):
+            yield (first, second) + pair
+
+
+def _init_worker(arr):
+    global _ARR
+    _ARR = arr
+
+
+def _k_sum_chunk(task):
+    lo, hi, k, target = task
+    # results travel back to the parent as one list per chunk
+    return list(_k_sum_range(_ARR, lo, hi, k, target))
+
+
+def k_sum(arr, k=3, target=0, workers=None):
+    ''' Unique k-tuples of arr whose elements add up to target.
+
+        Parameters :
+            arr : input array (left untouched)
+            k : tuple size, 2, 3 or 4
+            target : required sum
+            workers : processes for the outer loop; by default all CPUs
+                      once arr has PARALLEL_MIN_SIZE elements, else one
+        Output :
+            generator of ascending tuples, in lexicographic order
+    '''
+    if k not in (2, 3, 4):
+        raise ValueError("k must be 2, 3 or 4")
+    values = _sorted_values(arr)
+    n = len(values)
+    if workers is None:
+        workers = (os.cpu_count() or 1) if n >= PARALLEL_MIN_SIZE else 1
+
+    if workers <= 1:
+        yield from _k_sum_range(values, 0, n, k, target)
+        return
+
+    # small first elements pair with long suffixes, so use more chunks
+    # than workers to keep them all busy
+    parts = workers * 8
+    bounds = [n * p // parts for p in range(parts + 1)]
+    tasks = [(bounds[p], bounds[p + 1], k, target) for p in range(parts)]
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(values,)
+    ) as pool:
+        for chunk in pool.map(_k_sum_chunk, tasks):
+            yield from chunk
+
+
+# DRIVER CODE STARTS
+
+if __name__ == "__main__":
+
+    arr = list(map(int, input('Enter elements of array\n').split()))
+    k = int(input('Enter k (2, 3 or 4)\n'))
+    target = int(input('Enter target sum\n'))
+
+    for combination in k_sum(arr, k, target):
+        print(*combination)
@@ -0,0 +1,81 @@
+#
+# Test k_sum against brute force
+# ******************************
+#
+# Usage: python test_k_sum.py
+#
+
+
+import contextlib
+import io
+import random
+import unittest
+from itertools import combinations
+
+from find_Triplets_with_zero_sum import find_Triplets_with_zero_sum
+import k_sum as k_sum_module
+from k_sum import k_sum
+
+
+def brute_force(arr, k, target):
+    return sorted({combo for combo in combinations(sorted(arr), k) if sum(combo) == target})
+
+
+class TestKSum(unittest.TestCase):
+
+    def cases(self):
+        rng = random.Random(7)
+        yield [], 0
+        yield [0, 0, 0, 0, 0], 0
+        yield [1, 1, 1, 2, 2, -2, -1, 0, 0, 3], 2
+        for n in (5, 12, 30):
+            # few distinct values, so duplicates are everywhere
+            yield [rng.randint(-6, 6) for _ in range(n)], rng.randint(-4, 4)
+
+    def test_matches_brute_force(self):
+        for arr, target in self.cases():
+            for k in (2, 3, 4):
+                with self.subTest(arr=arr, k=k, target=target):
+                    result = list(k_sum(arr, k, target, workers=1))
+                    self.assertEqual(result, brute_force(arr, k, target))
+
+    def test_parallel_matches_serial(self):
+        arr = [random.Random(k).randint(-20, 20) for k in range(120)]
+        for k in (2, 3, 4):
+            with self.subTest(k=k):
+                self.assertEqual(list(k_sum(arr, k, 3, workers=2)), brute_force(arr, k, 3))
+
+    def test_tuples_arrive_as_found(self):
+        calls = []
+        two_sum = k_sum_module._two_sum
+
+        def counted(*args):
+            calls.append(args)
+            return two_sum(*args)
+
+        k_sum_module._two_sum = counted
+        try:
+            first = next(k_sum(range(-500, 500), 3, 0, workers=1))
+        finally:
+            k_sum_module._two_sum = two_sum
+        self.assertEqual(first, (-500, 1, 499))
+        # only the first outer value was expanded
+        self.assertEqual(len(calls), 1)
+
+    def test_input_untouched_and_bad_k(self):
+        arr = [3, -1, -2, 0]
+        list(k_sum(arr, 3))
+        self.assertEqual(arr, [3, -1, -2, 0])
+        with self.assertRaises(ValueError):
+            list(k_sum(arr, 5))
+
+    def test_zero_sum_triplets(self):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            find_Triplets_with_zero_sum([0, -1, 2, -3, 1, -1], 6)
+            find_Triplets_with_zero_sum([1, 2, 3], 3)
+        self.assertEqual(out.getvalue().splitlines(), ["-3 1 2", "-1 -1 2", "-1 0 1", " No Triplet Found"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,52 +7,207 @@
 	some useful methods for encrypting and decrypting strings and
 	files.
 
+	Keys are an int (one byte, as before) or a bytes-like/str key
+	that is repeated over the content. All methods work on whole
+	buffers at once; the string and list methods are thin wrappers
+	around encrypt_bytes.
+
 	Overview about methods
 
 	- encrypt : list of char
 	- decrypt : list of char
 	- encrypt_string : str
 	- decrypt_string : str
+	- encrypt_bytes : bytes
+	- decrypt_bytes : bytes
+	- transform_file : FileStats
 	- encrypt_file : boolean
 	- decrypt_file : boolean
 """
 
+import mmap
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from math import gcd
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# below this many bytes the big-int XOR beats setting up NumPy arrays
+NUMPY_MIN_SIZE = 1 << 14
+# size of the read/XOR/write buffer for files
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+FileStats = namedtuple("FileStats", "bytes seconds mb_per_s")
+
+
+def _keystream(key, length, offset=0):
+    """
+        the repeating key, starting at key phase 'offset',
+        cut to 'length' bytes
+    """
+    offset %= len(key)
+    reps = (offset + length) // len(key) + 1
+    return (key * reps)[offset:offset + length]
+
+
+def _as_bytes(data):
+    view = memoryview(data)
+    if view.format != "B" or view.ndim != 1:
+        view = view.cast("B")
+    return view
+
+
+def _xor_numpy(arr, key, offset, out):
+    n = len(arr)
+    # a key period that is a multiple of 8 lets NumPy XOR 64-bit words
+    period = len(key) * 8 // gcd(len(key), 8)
+    stream = np.frombuffer(_keystream(key, period, offset), dtype=np.uint64)
+    body = n - n % period
+    np.bitwise_xor(
+        arr[:body].view(np.uint64).reshape(-1, len(stream)), stream,
+        out=out[:body].view(np.uint64).reshape(-1, len(stream)),
+    )
+    tail = np.frombuffer(_keystream(key, n - body, offset), dtype=np.uint8)
+    np.bitwise_xor(arr[body:], tail, out=out[body:])
+
+
+def xor_bytes(data, key, offset=0):
+    """
+        input: bytes-like 'data', non-empty bytes 'key' and the
+        position of data[0] in the key stream ('offset')
+        output: data XOR the repeating key, as bytes
+    """
+    view = _as_bytes(data)
+    n = len(view)
+    if np is None or n < NUMPY_MIN_SIZE:
+        # one arbitrary-precision XOR over the whole buffer
+        stream = _keystream(key, n, offset)
+        mixed = int.from_bytes(view, "little") ^ int.from_bytes(stream, "little")
+        return mixed.to_bytes(n, "little")
+
+    out = np.empty(n, dtype=np.uint8)
+    _xor_numpy(np.frombuffer(view, dtype=np.uint8), key, offset, out)
+    return out.tobytes()
+
+
+def xor_into(buffer, key, offset=0):
+    """
+        input: writable bytes-like 'buffer', non-empty bytes 'key'
+        and the key stream position of buffer[0] ('offset')
+        output: None, the buffer is XORed in place
+    """
+    view = _as_bytes(buffer)
+    if np is None or len(view) < NUMPY_MIN_SIZE:
+        view[:] = xor_bytes(view, key, offset)
+    else:
+        arr = np.frombuffer(view, dtype=np.uint8)
+        _xor_numpy(arr, key, offset, arr)
+
+
+def _xor_region(task):
+    """
+        XOR the bytes [start, end) of file 'src' into the same range of
+        file 'dst' (which may be src itself, for in-place work). The key
+        phase of every chunk is its file offset, so regions can run in
+        any order and in separate processes.
+    """
+    src, dst, start, end, key, chunk_size, use_mmap = task
+    if use_mmap:
+        with open(dst, "r+b") as f, mmap.mmap(f.fileno(), 0) as mapped, memoryview(mapped) as out:
+            if os.path.samefile(src, dst):
+                for pos in range(start, end, chunk_size):
+                    xor_into(out[pos:min(pos + chunk_size, end)], key, pos)
+            else:
+                with open(src, "rb") as g, mmap.mmap(g.fileno(), 0, access=mmap.ACCESS_READ) as source, \
+                        memoryview(source) as inp:
+                    for pos in range(start, end, chunk_size):
+                        hi = min(pos + chunk_size, end)
+                        out[pos:hi] = xor_bytes(inp[pos:hi], key, pos)
+        return
+
+    # one fixed buffer, refilled with readinto and XORed in place
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with open(src, "rb") as fin, open(dst, "r+b") as fout:
+        fin.seek(start)
+        fout.seek(start)
+        pos = start
+        while pos < end:
+            n = fin.readinto(view[:min(chunk_size, end - pos)])
+            if not n:
+                break
+            xor_into(view[:n], key, pos)
+            fout.write(view[:n])
+            pos += n
+
+
+def _xor_stream(fin, fout, key, chunk_size):
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    total = 0
+    while True:
+        n = fin.readinto(view)
+        if not n:
+            return total
+        xor_into(view[:n], key, total)
+        fout.write(view[:n])
+        total += n
+
 
 class XORCipher(object):
 
     def __init__(self, key=0):
         """
             simple constructor that receives a key or uses
-            default key = 0
+            default key = 0. The key is an int or a bytes-like
+            or str multi-byte key.
         """
 
         # private field
         self.__key = key
 
-    def encrypt(self, content, key):
+        # FileStats of the last encrypt_file/decrypt_file call
+        self.last_stats = None
+
+    def _key_bytes(self, key):
         """
-            input: 'content' of type string and 'key' of type int
-            output: encrypted string 'content' as a list of chars
+            input: 'key' of type int, bytes-like or str
+            output: the key as non-empty bytes.
             if key not passed the method uses the key by the constructor.
             otherwise key = 1
         """
 
-        # precondition
-        assert (isinstance(key, int) and isinstance(content, str))
-
         key = key or self.__key or 1
 
-        # make sure key can be any size
-        while (key > 255):
-            key -= 255
+        if isinstance(key, str):
+            return key.encode("utf-8")
+        if not isinstance(key, int):
+            return bytes(key)
 
-        # This will be returned
-        ans = []
+        # make sure key can be any size (same as subtracting 255 until
+        # it fits into one byte)
+        if key > 255:
+            key = (key - 1) % 255 + 1
 
-        for ch in content:
-            ans.append(chr(ord(ch) ^ key))
+        return bytes([key])
 
-        return ans
+    def encrypt(self, content, key):
+        """
+            input: 'content' of type string and 'key' of type int
+            output: encrypted string 'content' as a list of chars
+            if key not passed the method uses the key by the constructor.
+            otherwise key = 1
+        """
+
+        # precondition
+        assert (isinstance(key, (int, str, bytes, bytearray, memoryview)) and isinstance(content, str))
+
+        return list(self.encrypt_string(content, key))
 
     def decrypt(self, content, key):
         """
@@ -63,21 +218,9 @@ class XORCipher(object):
         """
 
         # precondition
-        assert (isinstance(key, int) and isinstance(content, list))
-
-        key = key or self.__key or 1
-
-        # make sure key can be any size
-        while (key > 255):
-            key -= 255
-
-        # This will be returned
-        ans = []
-
-        for ch in content:
-            ans.append(chr(ord(ch) ^ key))
+        assert (isinstance(key, (int, str, bytes, bytearray, memoryview)) and isinstance(content, list))
 
-        return ans
+        return list(self.decrypt_string("".join(content), key))
 
     def encrypt_string(self, content, key=0):
         """
@@ -88,21 +231,21 @@ class XORCipher(object):
         """
 
         # precondition
-        assert (isinstance(key, int) and isinstance(content, str))
+        assert (isinstance(key, (int, str, bytes, bytearray, memoryview)) and isinstance(content, str))
 
-        key = key or self.__key or 1
-
-        # make sure key can be any size
-        while (key > 255):
-            key -= 255
-
-        # This will be returned
-        ans = ""
+        key = self._key_bytes(key)
 
-        for ch in content:
-            ans += chr(ord(ch) ^ key)
+        try:
+            # one byte per char: XOR the Latin-1 bytes directly
+            return xor_bytes(content.encode("latin-1"), key).decode("latin-1")
+        except UnicodeEncodeError:
+            pass
 
-        return ans
+        # wider chars: XOR the key into the lowest byte of each
+        # UTF-32 code unit, exactly like chr(ord(ch) ^ key)
+        wide_key = b"".join(bytes([k, 0, 0, 0]) for k in key)
+        data = content.encode("utf-32-le", "surrogatepass")
+        return xor_bytes(data, wide_key).decode("utf-32-le", "surrogatepass")
 
     def decrypt_string(self, content, key=0):
         """
@@ -112,67 +255,114 @@ class XORCipher(object):
             otherwise key = 1
         """
 
-        # precondition
-        assert (isinstance(key, int) and isinstance(content, str))
+        # XOR is its own inverse
+        return self.encrypt_string(content, key)
 
-        key = key or self.__key or 1
+    def encrypt_bytes(self, content, key=0):
+        """
+            input: 'content' of type bytes, bytearray or memoryview
+            and 'key' of type int, bytes-like or str
+            output: encrypted 'content' as bytes
+            if key not passed the method uses the key by the constructor.
+            otherwise key = 1
+        """
 
-        # make sure key can be any size
-        while (key > 255):
-            key -= 255
+        return xor_bytes(content, self._key_bytes(key))
 
-        # This will be returned
-        ans = ""
+    def decrypt_bytes(self, content, key=0):
+        """
+            input: 'content' of type bytes, bytearray or memoryview
+            and 'key' of type int, bytes-like or str
+            output: decrypted 'content' as bytes
+            if key not passed the method uses the key by the constructor.
+            otherwise key = 1
+        """
 
-        for ch in content:
-            ans += chr(ord(ch) ^ key)
+        return xor_bytes(content, self._key_bytes(key))
 
-        return ans
+    def transform_file(self, src, dst=None, key=0, chunk_size=DEFAULT_CHUNK_SIZE,
+                       use_mmap=False, workers=1):
+        """
+            input: 'src' and 'dst' as paths or binary file objects, a key
+            (int, bytes-like or str), the buffer size, whether to go
+            through mmap and how many worker processes to split the
+            file across (by offset). dst=None transforms src in place.
+            output: FileStats(bytes, seconds, mb_per_s) of the run
+            XOR is symmetric, so this both encrypts and decrypts.
+        """
 
-    def encrypt_file(self, file, key=0):
+        key = self._key_bytes(key)
+        started = time.perf_counter()
+
+        if hasattr(src, "readinto"):
+            if dst is None:
+                raise ValueError("in-place transformation needs a path, not a file object")
+            if hasattr(dst, "write"):
+                size = _xor_stream(src, dst, key, chunk_size)
+            else:
+                with open(dst, "wb") as fout:
+                    size = _xor_stream(src, fout, key, chunk_size)
+        elif hasattr(dst, "write"):
+            with open(src, "rb") as fin:
+                size = _xor_stream(fin, dst, key, chunk_size)
+        else:
+            size = os.path.getsize(src)
+            if dst is None:
+                dst = src
+            elif not (os.path.exists(dst) and os.path.samefile(src, dst)):
+                # size the output up front so regions can be written anywhere
+                with open(dst, "wb") as fout:
+                    fout.truncate(size)
+
+            # one region per worker, never smaller than a buffer
+            step = max(chunk_size, -(-size // max(workers, 1)))
+            tasks = [
+                (src, dst, start, min(start + step, size), key, chunk_size, use_mmap)
+                for start in range(0, size, step)
+            ]
+            if workers > 1 and len(tasks) > 1:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    list(pool.map(_xor_region, tasks))
+            else:
+                for task in tasks:
+                    _xor_region(task)
+
+        seconds = time.perf_counter() - started
+        return FileStats(size, seconds, size / seconds / 1e6 if seconds else float("inf"))
+
+    def encrypt_file(self, file, key=0, output="encrypt.out", in_place=False, **options):
         """
-            input: filename (str) and a key (int)
+            input: filename (str) or binary file object and a key (int)
             output: returns true if encrypt process was
             successful otherwise false
             if key not passed the method uses the key by the constructor.
             otherwise key = 1
+            The result goes to 'output' (a path or binary file object),
+            or back into 'file' with in_place=True. Further options
+            (chunk_size, use_mmap, workers) go to transform_file, whose
+            throughput figures are kept in self.last_stats.
         """
 
-        # precondition
-        assert (isinstance(file, str) and isinstance(key, int))
-
         try:
-            with open(file, "r") as fin:
-                with open("encrypt.out", "w+") as fout:
-                    # actual encrypt-process
-                    for line in fin:
-                        fout.write(self.encrypt_string(line, key))
-
-        except:
+            self.last_stats = self.transform_file(file, None if in_place else output, key, **options)
+        except OSError:
             return False
 
         return True
 
-    def decrypt_file(self, file, key):
+    def decrypt_file(self, file, key, output="decrypt.out", in_place=False, **options):
         """
-            input: filename (str) and a key (int)
+            input: filename (str) or binary file object and a key (int)
             output: returns true if decrypt process was
             successful otherwise false
             if key not passed the method uses the key by the constructor.
             otherwise key = 1
+            Takes the same output and options as encrypt_file.
         """
 
-        # precondition
-        assert (isinstance(file, str) and isinstance(key, int))
-
         try:
-            with open(file, "r") as fin:
-                with open("decrypt.out", "w+") as fout:
-                    # actual encrypt-process
-                    for line in fin:
-                        fout.write(self.decrypt_string(line, key))
-
-        except:
+            self.last_stats = self.transform_file(file, None if in_place else output, key, **options)
+        except OSError:
             return False
 
         return True
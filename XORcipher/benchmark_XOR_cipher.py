@@ -0,0 +1,225 @@
+#
+# Benchmark XORCipher
+# *******************
+#
+# Throughput (MB/s) of the string, list, bytes and file paths of
+# XORCipher for single- and multi-byte keys, compared against the
+# numbers stored in benchmark_baseline.json.
+#
+# Usage: python benchmark_XOR_cipher.py --sizes 1K,1M,64M
+#        python benchmark_XOR_cipher.py --sizes 1G --paths bytes,file
+#        python benchmark_XOR_cipher.py --save-baseline
+#
+
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import XOR_cipher
+from XOR_cipher import XORCipher
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+
+PATHS = ("string", "list", "bytes", "file")
+KEYS = {"single": 67, "multi": b"sixteen byte key"}
+DEFAULT_SIZES = (1 << 10, 1 << 16, 1 << 20, 1 << 24)
+
+# str and list-of-char copies of a gigabyte do not fit in memory
+TEXT_MAX = 1 << 26
+
+_SIZE_SUFFIXES = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+
+def parse_sizes(text):
+    """
+    "1K,64K,1G" -> [1024, 65536, 1073741824]; the inverse of
+    format_size, so sizes read back from a baseline match exactly.
+    """
+    sizes = []
+    for part in text.upper().split(","):
+        part = part.strip()
+        if part[-1:] in _SIZE_SUFFIXES:
+            sizes.append(int(part[:-1]) * _SIZE_SUFFIXES[part[-1]])
+        else:
+            sizes.append(int(part))
+    return sizes
+
+
+def format_size(size):
+    for suffix in ("G", "M", "K"):
+        unit = _SIZE_SUFFIXES[suffix]
+        if size >= unit and size % unit == 0:
+            return "%d%s" % (size // unit, suffix)
+    return str(size)
+
+
+def backend():
+    """
+    Which XOR kernel large buffers use: results differ by an order of
+    magnitude, so baselines are kept per backend.
+    """
+    return "numpy" if XOR_cipher.np is not None else "int"
+
+
+def _runner(path, size, key, tmp_dir):
+    """
+    Build the input for one path once; return (run, cleanup) where run()
+    does the timed work.
+    """
+    crypt = XORCipher()
+    data = os.urandom(size)
+    if path == "bytes":
+        return (lambda: crypt.encrypt_bytes(data, key)), None
+    if path == "string":
+        text = data.decode("latin-1")
+        return (lambda: crypt.encrypt_string(text, key)), None
+    if path == "list":
+        text = data.decode("latin-1")
+        return (lambda: crypt.encrypt(text, key)), None
+    if path == "file":
+        src = os.path.join(tmp_dir, "plain.bin")
+        dst = os.path.join(tmp_dir, "cipher.bin")
+        with open(src, "wb") as f:
+            f.write(data)
+        del data
+
+        def cleanup():
+            for name in (src, dst):
+                if os.path.exists(name):
+                    os.remove(name)
+
+        return (lambda: crypt.transform_file(src, dst, key)), cleanup
+    raise ValueError("unknown path %r" % path)
+
+
+def measure(path, size, key, repeat=3, tmp_dir=None):
+    """
+    Best-of-repeat throughput of one path in MB/s, or None when the
+    input is too big for that path.
+    """
+    if path in ("string", "list") and size > TEXT_MAX:
+        return None
+    with tempfile.TemporaryDirectory(prefix="xorbench-", dir=tmp_dir) as tmp:
+        run, cleanup = _runner(path, size, key, tmp)
+        try:
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                run()
+                best = min(best, time.perf_counter() - start)
+        finally:
+            if cleanup is not None:
+                cleanup()
+    return size / best / 1e6 if best else float("inf")
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, paths=PATHS, keys=tuple(KEYS), repeat=3, tmp_dir=None):
+    """
+    Measure every path x key x size. Returns a list of result dicts.
+    """
+    rows = []
+    for size in sizes:
+        for path in paths:
+            for key_name in keys:
+                rate = measure(path, size, KEYS[key_name], repeat, tmp_dir)
+                rows.append({
+                    "backend": backend(), "path": path, "key": key_name,
+                    "size": size, "mb_per_s": rate,
+                })
+    return rows
+
+
+def _baseline_key(row):
+    return "%s/%s/%s/%s" % (row["backend"], row["path"], row["key"], format_size(row["size"]))
+
+
+def load_baseline(path=BASELINE_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(rows, path=BASELINE_PATH):
+    """
+    Merge the measured rows into the baseline file (other backends and
+    sizes already stored are kept).
+    """
+    baseline = load_baseline(path)
+    for row in rows:
+        if row["mb_per_s"] is not None:
+            baseline[_baseline_key(row)] = round(row["mb_per_s"], 1)
+    with open(path, "w") as f:
+        json.dump(dict(sorted(baseline.items())), f, indent=2)
+        f.write("\n")
+
+
+def check_baseline(rows, baseline, tolerance=0.5):
+    """
+    Rows slower than (1 - tolerance) x their stored baseline, as
+    (key, measured, baseline) tuples. Rows without a baseline pass.
+    """
+    slow = []
+    for row in rows:
+        expected = baseline.get(_baseline_key(row))
+        if expected is None or row["mb_per_s"] is None:
+            continue
+        if row["mb_per_s"] < expected * (1 - tolerance):
+            slow.append((_baseline_key(row), row["mb_per_s"], expected))
+    return slow
+
+
+def format_table(rows):
+    lines = ["%-8s %-7s %-7s %8s %12s" % ("size", "path", "key", "backend", "MB/s")]
+    for row in rows:
+        rate = "skipped" if row["mb_per_s"] is None else "%.1f" % row["mb_per_s"]
+        lines.append("%-8s %-7s %-7s %8s %12s" % (
+            format_size(row["size"]), row["path"], row["key"], row["backend"], rate))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Throughput benchmark of XORCipher.")
+    parser.add_argument("--sizes", type=parse_sizes,
+                        default=",".join(format_size(s) for s in DEFAULT_SIZES),
+                        help="comma separated input sizes, e.g. 1K,1M,1G")
+    parser.add_argument("--paths", default=",".join(PATHS),
+                        help="subset of %s" % ",".join(PATHS))
+    parser.add_argument("--keys", default=",".join(KEYS), help="subset of %s" % ",".join(KEYS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tmp-dir", help="directory for the file benchmark")
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="allowed slowdown against the baseline (default: 0.5 = 50%%)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store these results as the new baseline instead of checking")
+    args = parser.parse_args(argv)
+
+    rows = run_benchmarks(
+        args.sizes,
+        args.paths.split(","), args.keys.split(","), args.repeat, args.tmp_dir,
+    )
+    print(format_table(rows))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=2)
+
+    if args.save_baseline:
+        save_baseline(rows, args.baseline)
+        print("baseline saved to %s" % args.baseline)
+        return 0
+
+    slow = check_baseline(rows, load_baseline(args.baseline), args.tolerance)
+    for key, measured, expected in slow:
+        print("SLOWER THAN BASELINE: %s %.1f MB/s (baseline %.1f)" % (key, measured, expected),
+              file=sys.stderr)
+    return 1 if slow else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -12,10 +12,19 @@
 #
 
 
+import io
+import os
+import random
+import shutil
+import tempfile
 import unittest
 from unittest import TestCase, mock
 
-from XOR_cipher import XORCipher
+import benchmark_XOR_cipher
+from XOR_cipher import NUMPY_MIN_SIZE, XORCipher, xor_bytes, xor_into
+
+# test_decrypt_file replaces decrypt_string on the class itself
+_decrypt_string = XORCipher.decrypt_string
 
 
 class TestXORCipher(TestCase):
@@ -33,6 +42,10 @@ class TestXORCipher(TestCase):
         # self.XORCipher_1 = XORCipher(key)
         pass
 
+    @classmethod
+    def tearDownClass(cls):
+        XORCipher.decrypt_string = _decrypt_string
+
     @mock.patch('XOR_cipher.XORCipher.__init__')
     def test__init__(self, mock__init__):
         """
@@ -132,5 +145,232 @@ class TestXORCipher(TestCase):
         XORCipher.decrypt_string.assert_called_with(file, key)
 
 
+class TestXORCipherBytes(TestCase):
+    """
+    Test the buffer-based core with real values.
+    """
+
+    def test_string_api_matches_char_by_char_xor(self):
+        """
+        The string wrappers give the same result as chr(ord(ch) ^ key),
+        including keys above 255 and chars outside Latin-1.
+        """
+
+        crypt = XORCipher()
+        for key in (67, 255, 256, 1000):
+            reduced = key
+            while reduced > 255:
+                reduced -= 255
+            for content in ("hallo welt", "gr\u00fc\u00dfe \u20ac \U0001f600"):
+                expected = "".join(chr(ord(ch) ^ reduced) for ch in content)
+                self.assertEqual(crypt.encrypt_string(content, key), expected)
+                self.assertEqual(crypt.encrypt(content, key), list(expected))
+                self.assertEqual(crypt.decrypt(list(expected), key), list(content))
+
+    def test_multi_byte_key_repeats(self):
+        """
+        A bytes key is repeated over the content.
+        """
+
+        crypt = XORCipher(b"xy")
+        self.assertEqual(crypt.encrypt_bytes(b"\0\0\0\0\0"), b"xyxyx")
+
+    def test_bytes_round_trip(self):
+        """
+        encrypt_bytes/decrypt_bytes round-trip on both sides of the
+        NumPy size threshold and agree with a byte-by-byte XOR.
+        """
+
+        crypt = XORCipher()
+        key = b"secret key"
+        for size in (0, 1, 9, NUMPY_MIN_SIZE - 1, NUMPY_MIN_SIZE + 13):
+            data = os.urandom(size)
+            expected = bytes(b ^ key[i % len(key)] for i, b in enumerate(data))
+            self.assertEqual(crypt.encrypt_bytes(memoryview(data), key), expected)
+            self.assertEqual(crypt.decrypt_bytes(bytearray(expected), key), data)
+
+    def test_key_offset(self):
+        """
+        xor_bytes can start in the middle of the key stream.
+        """
+
+        data = os.urandom(100)
+        whole = xor_bytes(data, b"abc")
+        self.assertEqual(xor_bytes(data[40:], b"abc", offset=40), whole[40:])
+
+
+class TestXORCipherFiles(TestCase):
+    """
+    Test the chunked file modes on a real temporary file.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.src = os.path.join(self.tmp, "plain.bin")
+        self.data = os.urandom(300001)
+        with open(self.src, "wb") as f:
+            f.write(self.data)
+        self.crypt = XORCipher(b"0123456789abc")
+        self.expected = xor_bytes(self.data, b"0123456789abc")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def read(self, path):
+        with open(path, "rb") as f:
+            return f.read()
+
+    def test_output_path_modes(self):
+        """
+        Buffered, mmap and parallel runs all keep the key phase right.
+        """
+
+        dst = os.path.join(self.tmp, "cipher.bin")
+        for use_mmap in (False, True):
+            for workers in (1, 3):
+                stats = self.crypt.transform_file(
+                    self.src, dst, chunk_size=4096, use_mmap=use_mmap, workers=workers)
+                self.assertEqual(self.read(dst), self.expected)
+                self.assertEqual(stats.bytes, len(self.data))
+
+    def test_in_place_round_trip(self):
+        """
+        dst=None overwrites the source; doing it twice restores it.
+        """
+
+        for use_mmap in (False, True):
+            self.crypt.transform_file(self.src, None, chunk_size=4096, use_mmap=use_mmap, workers=2)
+            self.assertEqual(self.read(self.src), self.expected)
+            self.crypt.transform_file(self.src, None, chunk_size=4096, use_mmap=use_mmap)
+            self.assertEqual(self.read(self.src), self.data)
+
+    def test_file_objects(self):
+        """
+        Binary file objects are streamed.
+        """
+
+        out = io.BytesIO()
+        self.crypt.transform_file(io.BytesIO(self.data), out, chunk_size=1000)
+        self.assertEqual(out.getvalue(), self.expected)
+
+    def test_file_object_to_path(self):
+        """
+        A file object can be written to a path, also through
+        encrypt_file with its default-style output argument.
+        """
+
+        dst = os.path.join(self.tmp, "cipher.bin")
+        self.crypt.transform_file(io.BytesIO(self.data), dst, chunk_size=1000)
+        self.assertEqual(self.read(dst), self.expected)
+        self.assertTrue(XORCipher(5).encrypt_file(io.BytesIO(b"hello"), 5, output=dst))
+        self.assertEqual(self.read(dst), xor_bytes(b"hello", b"\x05"))
+
+    def test_encrypt_decrypt_file(self):
+        """
+        encrypt_file/decrypt_file write to caller-chosen paths and
+        report False for unreadable input.
+        """
+
+        cipher = os.path.join(self.tmp, "cipher.bin")
+        plain = os.path.join(self.tmp, "plain.out")
+        self.assertTrue(self.crypt.encrypt_file(self.src, output=cipher))
+        self.assertTrue(self.crypt.decrypt_file(cipher, 0, output=plain))
+        self.assertEqual(self.read(plain), self.data)
+        self.assertEqual(self.crypt.last_stats.bytes, len(self.data))
+        self.assertFalse(self.crypt.encrypt_file(os.path.join(self.tmp, "missing"), output=cipher))
+
+
+class TestXORCipherProperties(TestCase):
+    """
+    Property tests on many random inputs: lengths around the NumPy
+    threshold and the 8-byte word size, random keys and key offsets.
+    """
+
+    EXAMPLES = 300
+
+    def setUp(self):
+        self.rng = random.Random(20191)
+
+    def random_case(self):
+        rng = self.rng
+        size = rng.choice([
+            rng.randint(0, 64),
+            rng.randint(NUMPY_MIN_SIZE - 16, NUMPY_MIN_SIZE + 16),
+            rng.randint(0, 4 * NUMPY_MIN_SIZE),
+        ])
+        data = rng.randbytes(size)
+        key = rng.randbytes(rng.randint(1, 40))
+        return data, key, rng.randint(0, 1000)
+
+    def test_round_trip(self):
+        """
+        decrypt(encrypt(data)) == data for bytes and in-place buffers.
+        """
+
+        crypt = XORCipher()
+        for _ in range(self.EXAMPLES):
+            data, key, offset = self.random_case()
+            with self.subTest(size=len(data), key_len=len(key)):
+                self.assertEqual(crypt.decrypt_bytes(crypt.encrypt_bytes(data, key), key), data)
+                buffer = bytearray(data)
+                xor_into(buffer, key, offset)
+                xor_into(buffer, key, offset)
+                self.assertEqual(bytes(buffer), data)
+
+    def test_matches_reference(self):
+        """
+        Every output byte is data[i] ^ key[(offset + i) % len(key)].
+        """
+
+        for _ in range(self.EXAMPLES // 3):
+            data, key, offset = self.random_case()
+            expected = bytes(b ^ key[(offset + i) % len(key)] for i, b in enumerate(data))
+            with self.subTest(size=len(data), key_len=len(key)):
+                self.assertEqual(xor_bytes(data, key, offset), expected)
+
+    def test_split_anywhere(self):
+        """
+        Encrypting two pieces with the right offset equals one pass,
+        which is what the chunked and parallel file modes rely on.
+        """
+
+        for _ in range(self.EXAMPLES // 3):
+            data, key, offset = self.random_case()
+            cut = self.rng.randint(0, len(data))
+            joined = xor_bytes(data[:cut], key, offset) + xor_bytes(data[cut:], key, offset + cut)
+            self.assertEqual(joined, xor_bytes(data, key, offset))
+
+    def test_string_round_trip(self):
+        """
+        Random text, including astral chars, survives a string round trip.
+        """
+
+        crypt = XORCipher()
+        for _ in range(self.EXAMPLES // 3):
+            text = "".join(
+                chr(self.rng.choice([self.rng.randint(0, 255), self.rng.randint(0, 0x10FFFF)]))
+                for _ in range(self.rng.randint(0, 50))
+            )
+            key = self.rng.randint(1, 100000)
+            self.assertEqual(crypt.decrypt_string(crypt.encrypt_string(text, key), key), text)
+
+
+@unittest.skipUnless(os.environ.get("XOR_BENCHMARK"), "set XOR_BENCHMARK=1 to compare with the baseline")
+class TestXORCipherThroughput(TestCase):
+    """
+    Fail when the bytes and file paths get slower than the stored
+    baseline (benchmark_baseline.json, refreshed with
+    python benchmark_XOR_cipher.py --save-baseline). The figures depend
+    on the machine, so this only runs with XOR_BENCHMARK set.
+    """
+
+    def test_no_regression_against_baseline(self):
+        baseline = benchmark_XOR_cipher.load_baseline()
+        rows = benchmark_XOR_cipher.run_benchmarks(sizes=[1 << 24], paths=("bytes", "file"), repeat=3)
+        if not any(benchmark_XOR_cipher._baseline_key(row) in baseline for row in rows):
+            self.skipTest("no baseline stored for the %s backend" % benchmark_XOR_cipher.backend())
+        self.assertEqual(benchmark_XOR_cipher.check_baseline(rows, baseline, tolerance=0.5), [])
+
+
 if __name__ == '__main__':
     unittest.main()
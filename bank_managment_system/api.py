@@ -0,0 +1,328 @@
+"""
+HTTP/JSON API of the bank management system.
+
+A headless front end to the same backend the Tk GUI uses, built on the
+standard library's ThreadingHTTPServer: one thread per client
+connection, each borrowing a pooled SQLite connection per request.
+Connections are kept alive (HTTP/1.1), so a client pays the TCP
+handshake once.
+
+    GET    /accounts?after=<acc_no>&limit=<n>   page of accounts
+    POST   /accounts                            {name, age, address, balance, account_type, mobile_number}
+    GET    /accounts/<acc_no>
+    PATCH  /accounts/<acc_no>                   {name | age | address}
+    DELETE /accounts/<acc_no>
+    POST   /accounts/<acc_no>/deposit           {amount}
+    POST   /accounts/<acc_no>/withdraw          {amount}
+    GET    /accounts/<acc_no>/ledger?limit=<n>
+    POST   /transfers                           {src, dst, amount}
+    GET    /summary                             {accounts, total_balance}
+    GET    /employees
+    POST   /employees                           {name, password, salary, position}
+    PATCH  /employees/<name>                    {name | pass | salary | position}
+
+Usage: python api.py --port 8080 --db bankmanaging.db
+"""
+
+import argparse
+import json
+import re
+import sqlite3
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import backend
+import dal
+import transactions
+
+ACCOUNT_FIELDS = ("acc_no", "name", "age", "address", "balance", "account_type", "mobile_number")
+
+
+class ApiError(Exception):
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _account(row):
+    return dict(zip(ACCOUNT_FIELDS, row))
+
+
+def _int(value, name):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ApiError(400, "%s must be an integer" % name)
+
+
+def _limit(query):
+    # below 1 is refused: SQLite reads LIMIT -1 as "no limit"
+    limit = _int(query.get("limit", 100), "limit")
+    if limit < 1:
+        raise ApiError(400, "limit must be at least 1")
+    return min(limit, 1000)
+
+
+def _require(body, *names):
+    missing = [name for name in names if body.get(name) in (None, "")]
+    if missing:
+        raise ApiError(400, "missing field(s): %s" % ", ".join(missing))
+    return [body[name] for name in names]
+
+
+def _one_field(body, allowed):
+    fields = [name for name in body if name in allowed]
+    if len(fields) != 1:
+        raise ApiError(400, "send exactly one of: %s" % ", ".join(allowed))
+    return fields[0], body[fields[0]]
+
+
+# ----- handlers: (query, body, *path groups) -> (status, payload) -----
+
+def list_accounts(query, body):
+    after = query.get("after")
+    limit = _limit(query)
+    rows = backend.list_customers_page(None if after is None else _int(after, "after"), None, limit)
+    return 200, {"accounts": [_account(row) for row in rows], "total": backend.count_customers()}
+
+
+def create_account(query, body):
+    name, age, address, balance, acc_type, mobile = _require(
+        body, "name", "age", "address", "balance", "account_type", "mobile_number")
+    if _int(balance, "balance") < 0:
+        raise ApiError(400, "balance must not be negative")
+    acc_no = backend.create_customer(name, _int(age, "age"), address, int(balance), acc_type,
+                                     _int(mobile, "mobile_number"))
+    return 201, {"acc_no": acc_no}
+
+
+def get_account(query, body, acc_no):
+    details = backend.get_details(acc_no)
+    if details is False:
+        raise ApiError(404, "no account %s" % acc_no)
+    return 200, _account(details)
+
+
+def update_account(query, body, acc_no):
+    field, value = _one_field(body, dal.CUSTOMER_FIELDS)
+    if field == "age":
+        value = _int(value, "age")
+    if not backend.check_acc_no(acc_no):
+        raise ApiError(404, "no account %s" % acc_no)
+    with backend.session() as conn:
+        dal.update_customer(conn, int(acc_no), field, value)
+    return get_account(query, body, acc_no)
+
+
+def delete_account(query, body, acc_no):
+    if not backend.check_acc_no(acc_no):
+        raise ApiError(404, "no account %s" % acc_no)
+    backend.delete_acc(acc_no)
+    return 200, {"deleted": int(acc_no)}
+
+
+def _post(operation, body, acc_no):
+    amount = _int(_require(body, "amount")[0], "amount")
+    with backend.session() as conn:
+        balance = operation(conn, int(acc_no), amount)
+    return 200, {"acc_no": int(acc_no), "balance": balance}
+
+
+def deposit(query, body, acc_no):
+    return _post(transactions.deposit, body, acc_no)
+
+
+def withdraw(query, body, acc_no):
+    return _post(transactions.withdraw, body, acc_no)
+
+
+def ledger(query, body, acc_no):
+    limit = _limit(query)
+    with backend.session() as conn:
+        rows = dal.ledger_entries(conn, int(acc_no), limit)
+    keys = ("id", "amount", "kind", "counterparty", "created_at")
+    return 200, {"acc_no": int(acc_no), "entries": [dict(zip(keys, row)) for row in rows]}
+
+
+def transfer(query, body):
+    src, dst, amount = (_int(value, name) for value, name in
+                        zip(_require(body, "src", "dst", "amount"), ("src", "dst", "amount")))
+    with backend.session() as conn:
+        transactions.transfer(conn, src, dst, amount)
+    return 200, {"src": src, "dst": dst, "amount": amount}
+
+
+def summary(query, body):
+    return 200, {"accounts": backend.count_customers(), "total_balance": backend.all_money() or 0}
+
+
+def list_employees(query, body):
+    keys = ("name", "salary", "position")
+    return 200, {"employees": [dict(zip(keys, row[:3])) for row in backend.show_employees()]}
+
+
+def create_employee(query, body):
+    name, password, salary, position = _require(body, "name", "password", "salary", "position")
+    if backend.check_name_in_staff(name):
+        raise ApiError(409, "employee %s already exists" % name)
+    backend.create_employee(name, password, _int(salary, "salary"), position)
+    return 201, {"name": name}
+
+
+def update_employee(query, body, name):
+    field, value = _one_field(body, dal.EMPLOYEE_FIELDS)
+    if not backend.check_name_in_staff(name):
+        raise ApiError(404, "no employee %s" % name)
+    with backend.session() as conn:
+        dal.update_employee(conn, name, field, value)
+    return 200, {"name": value if field == "name" else name}
+
+
+ROUTES = [
+    ("GET", r"/accounts", list_accounts),
+    ("POST", r"/accounts", create_account),
+    ("GET", r"/accounts/(\d+)", get_account),
+    ("PATCH", r"/accounts/(\d+)", update_account),
+    ("DELETE", r"/accounts/(\d+)", delete_account),
+    ("POST", r"/accounts/(\d+)/deposit", deposit),
+    ("POST", r"/accounts/(\d+)/withdraw", withdraw),
+    ("GET", r"/accounts/(\d+)/ledger", ledger),
+    ("POST", r"/transfers", transfer),
+    ("GET", r"/summary", summary),
+    ("GET", r"/employees", list_employees),
+    ("POST", r"/employees", create_employee),
+    ("PATCH", r"/employees/([^/]+)", update_employee),
+]
+_ROUTES = [(method, re.compile(pattern + "$"), handler) for method, pattern, handler in ROUTES]
+
+# errors raised below the handlers -> HTTP status
+_ERROR_STATUS = (
+    (transactions.UnknownAccount, 404),
+    (transactions.InsufficientFunds, 409),
+    (transactions.TransactionError, 400),
+    # e.g. renaming an employee to a name that is taken
+    (sqlite3.IntegrityError, 409),
+    # numbers too large for an SQLite integer
+    (OverflowError, 400),
+    (ValueError, 400),
+)
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "BankAPI/1.0"
+    # headers and body go out in separate writes; without TCP_NODELAY
+    # the body waits for the client's delayed ACK (~40 ms per request)
+    disable_nagle_algorithm = True
+    quiet = True
+
+    def _dispatch(self, method):
+        url = urlsplit(self.path)
+        # always drain the body, or the next request on this kept-alive
+        # connection would start in the middle of it
+        raw = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        allowed = []
+        for route_method, pattern, handler in _ROUTES:
+            match = pattern.match(url.path.rstrip("/") or "/")
+            if match is None:
+                continue
+            if route_method != method:
+                allowed.append(route_method)
+                continue
+            try:
+                query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                status, payload = handler(query, self._parse_body(raw), *map(unquote, match.groups()))
+            except ApiError as err:
+                status, payload = err.status, {"error": str(err)}
+            except tuple(kind for kind, _ in _ERROR_STATUS) as err:
+                status = next(code for kind, code in _ERROR_STATUS if isinstance(err, kind))
+                payload = {"error": str(err)}
+            except Exception as err:
+                # still answer, or the client is left waiting on a dropped
+                # kept-alive connection
+                self.log_error("%s %s failed: %r", method, url.path, err)
+                status, payload = 500, {"error": "internal error"}
+            return self._send(status, payload)
+        if allowed:
+            return self._send(405, {"error": "use " + ", ".join(allowed)}, {"Allow": ", ".join(allowed)})
+        return self._send(404, {"error": "no route %s" % url.path})
+
+    def _parse_body(self, raw):
+        if not raw:
+            return {}
+        try:
+            body = json.loads(raw)
+        except ValueError:
+            raise ApiError(400, "body is not valid JSON")
+        if not isinstance(body, dict):
+            raise ApiError(400, "body must be a JSON object")
+        return body
+
+    def _send(self, status, payload, headers=None):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PATCH(self):
+        self._dispatch("PATCH")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+    def log_error(self, format, *args):
+        # errors are logged even when requests are not
+        super().log_message(format, *args)
+
+
+def make_server(host="127.0.0.1", port=8080, db=backend.DATABASE, pool_size=16, verbose=False):
+    """
+    Open the database through backend's pool and return a server ready
+    for serve_forever(); port 0 picks a free port (see server_address).
+    """
+    backend.connect_database(db, pool_size=pool_size)
+    handler = type("Handler", (ApiHandler,), {"quiet": not verbose})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP/JSON API of the bank management system.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--db", default=backend.DATABASE, help="SQLite file (default: %(default)s)")
+    parser.add_argument("--pool-size", type=int, default=16, help="pooled SQLite connections")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    server = make_server(args.host, args.port, args.db, args.pool_size, args.verbose)
+    print("serving %s on http://%s:%d" % (args.db, *server.server_address[:2]))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        backend.pool.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
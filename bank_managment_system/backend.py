@@ -1,229 +1,220 @@
-import sqlite3
+import bulk
+import dal
+import transactions
+from connection_pool import ConnectionPool
+
+DATABASE = "bankmanaging.db"
+
+# shared by every thread of the GUI or the HTTP API
+pool = None
 
 
 # making connection with database
-def connect_database():
-    global conn
-    global cur
-    conn = sqlite3.connect("bankmanaging.db")
-
-    cur = conn.cursor()
-
-    cur.execute(
-        "create table if not exists bank (acc_no int, name text, age int, address text, balance int, account_type text, mobile_number int)")
-    cur.execute("create table if not exists staff (name text, pass text,salary int, position text)")
-    cur.execute("create table if not exists admin (name text, pass text)")
-    cur.execute("insert into admin values('arpit','123')")
-    conn.commit()
-    cur.execute("select acc_no from bank")
-    acc = cur.fetchall()
-    global acc_no
-    if len(acc) == 0:
-        acc_no = 1
-    else:
-        acc_no = int(acc[-1][0]) + 1
+def connect_database(path=DATABASE, pool_size=8, **pool_options):
+    global pool
+    if pool is not None:
+        pool.close()
+    pool = ConnectionPool(path, size=pool_size, **pool_options)
+
+
+# the calling thread's connection; committed when the block ends
+def session():
+    return pool.connection()
 
 
 # check admin dtails in database
 def check_admin(name, password):
-    cur.execute("select * from admin")
-    data = cur.fetchall()
-
-    if data[0][0] == name and data[0][1] == password:
-        return True
-    return
+    with session() as conn:
+        if dal.admin_login_ok(conn, name, password):
+            return True
+        return
 
 
 # create employee in database
 def create_employee(name, password, salary, positon):
-    print(password)
-    cur.execute("insert into staff values(?,?,?,?)", (name, password, salary, positon))
-    conn.commit()
+    with session() as conn:
+        dal.insert_employee(conn, name, password, salary, positon)
 
 
 # check employee details in dabase for employee login
 def check_employee(name, password):
-    print(password)
-    print(name)
-    cur.execute("select name,pass from staff")
-    data = cur.fetchall()
-    print(data)
-    if len(data) == 0:
-        return False
-    for i in range(len(data)):
-        if data[i][0] == name and data[i][1] == password:
-            return True
-
-    return False
+    with session() as conn:
+        return dal.employee_login_ok(conn, name, password)
 
 
 # create customer details in database
 def create_customer(name, age, address, balance, acc_type, mobile_number):
-    global acc_no
-    cur.execute("insert into bank values(?,?,?,?,?,?,?)",
-                (acc_no, name, age, address, balance, acc_type, mobile_number))
-    conn.commit()
-    acc_no = acc_no + 1
-    return acc_no - 1
+    with session() as conn:
+        return dal.insert_customer(conn, name, age, address, balance, acc_type, mobile_number)
 
 
 # check account in database
 def check_acc_no(acc_no):
-    cur.execute("select acc_no from bank")
-    list_acc_no = cur.fetchall()
-
-    for i in range(len(list_acc_no)):
-        if list_acc_no[i][0] == int(acc_no):
-            return True
-    return False
+    with session() as conn:
+        return dal.account_exists(conn, int(acc_no))
 
 
 # get all details of a particular customer from database
 def get_details(acc_no):
-    cur.execute("select * from bank where acc_no=?", (acc_no))
-    global detail
-    detail = cur.fetchall()
-    print(detail)
-    if len(detail) == 0:
-        return False
-    else:
-        return (detail[0][0], detail[0][1], detail[0][2], detail[0][3], detail[0][4], detail[0][5], detail[0][6])
+    with session() as conn:
+        detail = dal.get_account(conn, int(acc_no))
+        if detail is None:
+            return False
+        return tuple(detail)
 
 
 # add new balance of customer in bank database
 def update_balance(new_money, acc_no):
-    cur.execute("select balance from bank where acc_no=?", (acc_no,))
-    bal = cur.fetchall()
-    bal = bal[0][0]
-    new_bal = bal + int(new_money)
-
-    cur.execute("update bank set balance=? where acc_no=?", (new_bal, acc_no))
-    conn.commit()
+    with session() as conn:
+        try:
+            transactions.deposit(conn, int(acc_no), new_money)
+        except (transactions.TransactionError, ValueError):
+            return False
+        return True
 
 
 # deduct balance from customer bank database
 def deduct_balance(new_money, acc_no):
-    cur.execute("select balance from bank where acc_no=?", (acc_no,))
-    bal = cur.fetchall()
-    bal = bal[0][0]
-    if bal < int(new_money):
-        return False
-    else:
-        new_bal = bal - int(new_money)
-
-        cur.execute("update bank set balance=? where acc_no=?", (new_bal, acc_no))
-        conn.commit()
+    with session() as conn:
+        try:
+            transactions.withdraw(conn, int(acc_no), new_money)
+        except (transactions.TransactionError, ValueError):
+            return False
+        return True
+
+
+# move money between two accounts, False if the source cannot cover it
+# or an account does not exist
+def transfer(src_acc_no, dst_acc_no, amount):
+    with session() as conn:
+        try:
+            transactions.transfer(conn, int(src_acc_no), int(dst_acc_no), amount)
+        except (transactions.TransactionError, ValueError):
+            return False
+        return True
+
+
+# load many customers at once from a CSV file or an iterable of rows;
+# returns how many were imported
+def import_customers(source, batch_size=bulk.DEFAULT_BATCH_SIZE):
+    with session() as conn:
+        return bulk.import_customers(conn, source, batch_size)
+
+
+# post many (acc_no, amount) credits/debits in one transaction, False if
+# any of them is rejected (then none is posted)
+def post_batch(postings, kind="batch", batch_size=bulk.DEFAULT_BATCH_SIZE):
+    with session() as conn:
+        try:
+            bulk.post_batch(conn, postings, kind, batch_size)
+        except transactions.TransactionError:
+            return False
         return True
 
 
+# write all customers to a CSV or NDJSON file; returns the row count
+def export_customers(out, fmt="csv"):
+    with session() as conn:
+        return bulk.export_customers(conn, out, fmt)
+
+
 # gave balance of a particular account number from database
 def check_balance(acc_no):
-    cur.execute("select balance from bank where acc_no=?", (acc_no))
-    bal = cur.fetchall()
-    return bal[0][0]
+    with session() as conn:
+        return dal.get_balance(conn, int(acc_no))
 
 
 # update_name_in_bank_table
 def update_name_in_bank_table(new_name, acc_no):
-    print(new_name)
-    conn.execute("update bank set name='{}' where acc_no={}".format(new_name, acc_no))
-    conn.commit()
+    with session() as conn:
+        dal.update_customer(conn, int(acc_no), "name", new_name)
 
 
 # update_age_in_bank_table
 def update_age_in_bank_table(new_name, acc_no):
-    print(new_name)
-    conn.execute("update bank set age={} where acc_no={}".format(new_name, acc_no))
-    conn.commit()
+    with session() as conn:
+        dal.update_customer(conn, int(acc_no), "age", new_name)
 
 
 # update_address_in_bank_table
 def update_address_in_bank_table(new_name, acc_no):
-    print(new_name)
-    conn.execute("update bank set address='{}' where acc_no={}".format(new_name, acc_no))
-    conn.commit()
+    with session() as conn:
+        dal.update_customer(conn, int(acc_no), "address", new_name)
 
 
 # list of all customers in bank
 def list_all_customers():
-    cur.execute("select * from bank")
-    deatil = cur.fetchall()
+    with session() as conn:
+        return dal.list_customers(conn)
+
+
+# one page of customers ordered by acc_no: the limit accounts after
+# acc_no `after`, or before acc_no `before` when going back
+def list_customers_page(after=None, before=None, limit=100):
+    with session() as conn:
+        return dal.customers_page(conn, after, before, limit)
 
-    return deatil
+
+# number of customer accounts
+def count_customers():
+    with session() as conn:
+        return dal.count_customers(conn)
 
 
 # delete account from database
 def delete_acc(acc_no):
-    cur.execute("delete from bank where acc_no=?", (acc_no))
-    conn.commit()
+    with session() as conn:
+        dal.delete_account(conn, int(acc_no))
 
 
 # show employees detail from staff table
 def show_employees():
-    cur.execute("select name, salary, position,pass from staff")
-    detail = cur.fetchall()
-    return detail
+    with session() as conn:
+        return dal.list_employees(conn)
 
 
 # return all money in bank
 def all_money():
-    cur.execute("select balance from bank")
-    bal = cur.fetchall()
-    print(bal)
-    if len(bal) == 0:
-        return False
-    else:
-        total = 0
-        for i in bal:
-            total = total + i[0]
+    with session() as conn:
+        total = dal.total_balance(conn)
+        if total is None:
+            return False
         return total
 
 
 # return a list of all employees name
 def show_employees_for_update():
-    cur.execute("select * from staff")
-    detail = cur.fetchall()
-    return detail
+    with session() as conn:
+        return dal.list_staff(conn)
 
 
 # update employee name from data base
 def update_employee_name(new_name, old_name):
-    print(new_name, old_name)
-    cur.execute("update staff set name='{}' where name='{}'".format(new_name, old_name))
-    conn.commit()
+    with session() as conn:
+        dal.update_employee(conn, old_name, "name", new_name)
 
 
 def update_employee_password(new_pass, old_name):
-    print(new_pass, old_name)
-    cur.execute("update staff set pass='{}' where name='{}'".format(new_pass, old_name))
-    conn.commit()
+    with session() as conn:
+        dal.update_employee(conn, old_name, "pass", new_pass)
 
 
 def update_employee_salary(new_salary, old_name):
-    print(new_salary, old_name)
-    cur.execute("update staff set salary={} where name='{}'".format(new_salary, old_name))
-    conn.commit()
+    with session() as conn:
+        dal.update_employee(conn, old_name, "salary", new_salary)
 
 
 def update_employee_position(new_pos, old_name):
-    print(new_pos, old_name)
-    cur.execute("update staff set position='{}' where name='{}'".format(new_pos, old_name))
-    conn.commit()
+    with session() as conn:
+        dal.update_employee(conn, old_name, "position", new_pos)
 
 
 # get name and balance from bank of a particular account number
 def get_detail(acc_no):
-    cur.execute("select name, balance from bank where acc_no=?", (acc_no))
-    details = cur.fetchall()
-    return details
+    with session() as conn:
+        return dal.get_name_and_balance(conn, int(acc_no))
 
 
 def check_name_in_staff(name):
-    cur = conn.cursor()
-    cur.execute("select name from staff")
-    details = cur.fetchall()
-
-    for i in details:
-        if i[0] == name:
-            return True
-    return False
+    with session() as conn:
+        return dal.employee_exists(conn, name)
@@ -0,0 +1,109 @@
+"""
+Background execution of backend calls for the Tk frontend.
+
+Tk is single threaded: a button handler that queries SQLite itself
+freezes the whole window until the query returns. A BackgroundRunner
+hands the call to a small thread pool instead. The worker puts the
+outcome on a queue, and a root.after() poll on the main thread drains
+that queue and runs the handler's continuation there, the only place
+where widgets may be touched:
+
+    def show_balance(balance):
+        label.config(text=balance)
+
+    runner.submit(backend.check_balance, acc_no, on_done=show_balance)
+
+While anything is in flight the indicator label reads "Loading..." and
+the window shows a busy cursor. A request identical to one still in
+flight (same key, by default the function and its arguments) is
+dropped, so hammering a button runs the query once.
+"""
+
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+# how often the main thread looks for finished requests
+POLL_INTERVAL_MS = 50
+
+
+class BackgroundRunner:
+
+    def __init__(self, root, workers=4, poll_ms=POLL_INTERVAL_MS, indicator=None):
+        """
+        root: the Tk window (anything with after()); workers: threads
+        running backend calls, at most the connection pool size;
+        indicator: optional Label that shows the loading text.
+        """
+        self.root = root
+        self.poll_ms = poll_ms
+        self.indicator = indicator
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bank-backend")
+        self._results = queue.SimpleQueue()
+        self._in_flight = set()
+        self._polling = False
+
+    def submit(self, fn, *args, on_done=None, on_error=None, key=None):
+        """
+        Run fn(*args) on a worker thread; afterwards call on_done(result)
+        or on_error(exception) on the Tk thread. Returns False when the
+        request was coalesced with an identical one still running.
+        """
+        if key is None:
+            key = (fn, args)
+        if key in self._in_flight:
+            return False
+        self._in_flight.add(key)
+        self._executor.submit(self._run, key, fn, args, on_done, on_error)
+        self._set_busy(True)
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_ms, self._poll)
+        return True
+
+    def busy(self):
+        return bool(self._in_flight)
+
+    def _run(self, key, fn, args, on_done, on_error):
+        # worker thread: no widget access here
+        try:
+            outcome = (on_done, fn(*args))
+        except Exception as err:
+            outcome = (on_error, err)
+            if on_error is None:
+                outcome = (self._report, err)
+        self._results.put((key,) + outcome)
+
+    def _poll(self):
+        while True:
+            try:
+                key, callback, value = self._results.get_nowait()
+            except queue.Empty:
+                break
+            # released first, so the continuation may resubmit it
+            self._in_flight.discard(key)
+            if callback is None:
+                continue
+            try:
+                callback(value)
+            except Exception as err:
+                self._report(err)
+        if self._in_flight:
+            self.root.after(self.poll_ms, self._poll)
+        else:
+            self._polling = False
+            self._set_busy(False)
+
+    def _report(self, err):
+        report = getattr(self.root, "report_callback_exception", None)
+        if report is None:
+            raise err
+        report(type(err), err, err.__traceback__)
+
+    def _set_busy(self, busy):
+        if self.indicator is not None:
+            self.indicator.config(text="Loading..." if busy else "")
+        if hasattr(self.root, "config"):
+            self.root.config(cursor="watch" if busy else "")
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,125 @@
+"""
+Bulk operations of the bank management system.
+
+Loading customers or posting a day's transactions row by row pays one
+statement round trip and one commit (an fsync) per row. Here rows are
+fed to executemany in batches of batch_size, all inside one
+BEGIN IMMEDIATE transaction, so a million rows cost one commit and the
+import either lands completely or not at all. Exports stream rows from
+a cursor instead of fetchall(), so memory stays flat.
+"""
+
+import csv
+import io
+import json
+import os
+from itertools import islice
+
+from transactions import TransactionError, immediate
+
+CUSTOMER_COLUMNS = ("acc_no", "name", "age", "address", "balance", "account_type", "mobile_number")
+DEFAULT_BATCH_SIZE = 10_000
+
+
+def _batches(rows, size):
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _customer_row(record):
+    # dicts may leave columns (e.g. acc_no) out; tuples are in
+    # CUSTOMER_COLUMNS order without acc_no
+    if isinstance(record, dict):
+        return tuple(record.get(column) for column in CUSTOMER_COLUMNS)
+    return (None,) + tuple(record)
+
+
+def _csv_record(record):
+    # a CSV cell cannot hold NULL; csv.writer writes it as ""
+    return {column: None if value == "" else value for column, value in record.items()}
+
+
+def _open_source(source):
+    if isinstance(source, (str, os.PathLike)):
+        return open(source, newline="", encoding="utf-8")
+    return None
+
+
+# load customers from a CSV file (path or text file object with a header
+# row) or an iterable of dicts/tuples; returns how many were imported
+def import_customers(conn, source, batch_size=DEFAULT_BATCH_SIZE):
+    opened = _open_source(source)
+    try:
+        if opened is not None or isinstance(source, io.TextIOBase):
+            source = map(_csv_record, csv.DictReader(opened or source))
+        count = 0
+        with immediate(conn):
+            for batch in _batches(map(_customer_row, source), batch_size):
+                # a missing acc_no is assigned by sqlite (the rowid)
+                conn.executemany(
+                    "insert into bank (acc_no, name, age, address, balance, account_type, mobile_number)"
+                    " values (?, ?, ?, ?, coalesce(?, 0), ?, ?)",
+                    batch,
+                )
+                count += len(batch)
+        return count
+    finally:
+        if opened is not None:
+            opened.close()
+
+
+# apply many (acc_no, amount) postings at once, credits positive and
+# debits negative; all of them commit or none does
+def post_batch(conn, postings, kind="batch", batch_size=DEFAULT_BATCH_SIZE):
+    count = 0
+    with immediate(conn):
+        for batch in _batches(postings, batch_size):
+            batch = [(int(acc_no), int(amount)) for acc_no, amount in batch]
+            cur = conn.executemany(
+                "update bank set balance = balance + ?2 where acc_no = ?1 and balance + ?2 >= 0",
+                batch,
+            )
+            if cur.rowcount != len(batch):
+                raise TransactionError(
+                    "%d of %d postings hit an unknown account or would overdraw one;"
+                    " nothing was posted" % (len(batch) - cur.rowcount, len(batch))
+                )
+            conn.executemany(
+                "insert into ledger (acc_no, amount, kind) values (?, ?, ?)",
+                [(acc_no, amount, kind) for acc_no, amount in batch],
+            )
+            count += len(batch)
+    return count
+
+
+# stream every customer to a CSV or NDJSON file (path or text file
+# object); returns how many rows were written
+def export_customers(conn, out, fmt="csv", batch_size=DEFAULT_BATCH_SIZE):
+    if fmt not in ("csv", "ndjson"):
+        raise ValueError("fmt must be 'csv' or 'ndjson'")
+    opened = None
+    if isinstance(out, (str, os.PathLike)):
+        opened = out = open(out, "w", newline="", encoding="utf-8")
+    try:
+        cur = conn.execute("select %s from bank order by acc_no" % ", ".join(CUSTOMER_COLUMNS))
+        cur.arraysize = batch_size
+        if fmt == "csv":
+            writer = csv.writer(out)
+            writer.writerow(CUSTOMER_COLUMNS)
+        count = 0
+        while True:
+            rows = cur.fetchmany()
+            if not rows:
+                return count
+            if fmt == "csv":
+                writer.writerows(rows)
+            else:
+                out.writelines(json.dumps(dict(zip(CUSTOMER_COLUMNS, row))) + "\n" for row in rows)
+            count += len(rows)
+    finally:
+        if opened is not None:
+            opened.close()
@@ -0,0 +1,127 @@
+"""
+Connection pool and sessions for the bank management system.
+
+A ConnectionPool owns up to `size` SQLite connections to one database
+file. A thread borrows one with
+
+    with pool.connection() as conn:
+        ...
+
+and gets it back exclusively until the block ends; nested blocks in the
+same thread reuse the same connection. Leaving the outermost block
+commits (or rolls back on an exception) and returns the connection, so
+tellers, the GUI and the HTTP API can share one pool safely.
+"""
+
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+import dal
+
+DEFAULT_PRAGMAS = {
+    # readers never block the single writer
+    "journal_mode": "wal",
+    # in WAL mode NORMAL is still crash-safe and avoids an fsync per commit
+    "synchronous": "normal",
+    # read the file through a 256 MiB memory map instead of read() calls
+    "mmap_size": 256 * 1024 * 1024,
+    # negative = KiB of page cache per connection
+    "cache_size": -16 * 1024,
+    "temp_store": "memory",
+}
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool:
+
+    def __init__(self, path, size=8, timeout=30.0, pragmas=None):
+        """
+        path: database file; size: most connections open at once;
+        timeout: seconds to wait for a free connection and for SQLite's
+        write lock; pragmas: overrides/additions to DEFAULT_PRAGMAS.
+        The schema is migrated once, when the pool is created.
+        """
+        self.path = path
+        self.size = size
+        self.timeout = timeout
+        self.pragmas = dict(DEFAULT_PRAGMAS, **(pragmas or {}))
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._all = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._closed = False
+
+        with self.connection() as conn:
+            dal.migrate(conn)
+
+    def _open(self):
+        # check_same_thread=False: a connection moves between threads,
+        # but the pool hands it to one thread at a time
+        conn = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False)
+        for name, value in self.pragmas.items():
+            conn.execute("pragma %s = %s" % (name, value))
+        return conn
+
+    def _acquire(self):
+        if self._closed:
+            raise RuntimeError("connection pool is closed")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                try:
+                    conn = self._open()
+                except BaseException:
+                    self._created -= 1
+                    raise
+                self._all.append(conn)
+                return conn
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise PoolTimeout("no free connection after %.1fs (pool size %d)"
+                              % (self.timeout, self.size)) from None
+
+    @contextmanager
+    def connection(self):
+        """
+        The calling thread's connection for the duration of the block.
+        """
+        held = getattr(self._local, "conn", None)
+        if held is not None:
+            yield held
+            return
+
+        conn = self._acquire()
+        self._local.conn = conn
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        else:
+            if conn.in_transaction:
+                try:
+                    conn.commit()
+                except BaseException:
+                    conn.rollback()
+                    raise
+        finally:
+            self._local.conn = None
+            self._idle.put(conn)
+
+    def close(self):
+        self._closed = True
+        with self._lock:
+            for conn in self._all:
+                conn.close()
+            self._all.clear()
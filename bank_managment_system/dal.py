@@ -0,0 +1,284 @@
+"""
+Data-access layer of the bank management system.
+
+Holds the schema and one parameterised statement per operation. Every
+function takes an open sqlite3 connection and leaves committing to the
+caller, so backend.py decides how connections and transactions are
+shared. sqlite3 keeps the compiled statements in its per-connection
+statement cache, so repeated calls skip the SQL parser.
+
+Accounts are keyed by an INTEGER PRIMARY KEY (the rowid B-tree) and
+staff names by a unique index, so every lookup is O(log n).
+"""
+
+import sqlite3
+
+BANK_TABLE = (
+    "create table if not exists bank ("
+    " acc_no integer primary key,"
+    " name text, age integer, address text,"
+    " balance integer not null default 0,"
+    " account_type text, mobile_number integer)"
+)
+
+# the admin account every new installation starts with
+DEFAULT_ADMIN = ("arpit", "123")
+
+# columns the update helpers may touch; values are always bound
+CUSTOMER_FIELDS = ("name", "age", "address")
+EMPLOYEE_FIELDS = ("name", "pass", "salary", "position")
+
+
+def _table_exists(conn, table):
+    row = conn.execute(
+        "select exists(select 1 from sqlite_master where type = 'table' and name = ?)", (table,)
+    ).fetchone()
+    return bool(row[0])
+
+
+def _is_rowid_key(conn, table, column):
+    for _, name, col_type, _, _, pk in conn.execute("pragma table_info(%s)" % table):
+        if name == column:
+            return pk == 1 and col_type.upper() == "INTEGER"
+    return False
+
+
+def _migrate_legacy(conn):
+    # databases created before this schema have acc_no as a plain int
+    # column and may hold repeated staff names
+    if _table_exists(conn, "bank") and not _is_rowid_key(conn, "bank", "acc_no"):
+        conn.execute("alter table bank rename to bank_legacy")
+        conn.execute(BANK_TABLE)
+        conn.execute(
+            "insert or replace into bank"
+            " select acc_no, name, age, address, coalesce(balance, 0), account_type, mobile_number"
+            " from bank_legacy order by rowid"
+        )
+        conn.execute("drop table bank_legacy")
+    if _table_exists(conn, "staff"):
+        # keep the newest row of every name so the unique index can be built
+        conn.execute(
+            "delete from staff where rowid not in (select max(rowid) from staff group by name)"
+        )
+
+
+# Schema migrations, applied in order. PRAGMA user_version records how
+# many have run; every step is also safe to repeat on a database that
+# predates the version counter.
+
+def _v1_accounts_and_staff(conn):
+    _migrate_legacy(conn)
+    conn.execute(BANK_TABLE)
+    conn.execute("create table if not exists staff (name text not null, pass text, salary integer, position text)")
+    conn.execute("create unique index if not exists staff_name on staff (name)")
+    conn.execute("create table if not exists admin (name text, pass text)")
+
+
+def _v2_ledger(conn):
+    # append-only record of every posting; amount is signed
+    conn.execute(
+        "create table if not exists ledger ("
+        " id integer primary key,"
+        " acc_no integer not null,"
+        " amount integer not null,"
+        " kind text not null,"
+        " counterparty integer,"
+        " created_at text not null default current_timestamp)"
+    )
+    conn.execute("create index if not exists ledger_acc_no on ledger (acc_no, id)")
+
+
+def _v3_single_admin_rows(conn):
+    # earlier versions inserted the default admin again on every start-up
+    conn.execute("delete from admin where rowid not in (select min(rowid) from admin group by name)")
+    conn.execute("create unique index if not exists admin_name on admin (name)")
+    conn.execute("insert or ignore into admin values (?, ?)", DEFAULT_ADMIN)
+
+
+def _v4_bank_summary(conn):
+    # one-row running totals, so the total of all balances is a single
+    # row read; the triggers keep it current for every writer
+    conn.execute(
+        "create table if not exists bank_summary ("
+        " id integer primary key check (id = 1),"
+        " accounts integer not null,"
+        " total_balance integer not null)"
+    )
+    conn.execute(
+        "insert or replace into bank_summary"
+        " select 1, count(*), coalesce(sum(balance), 0) from bank"
+    )
+    conn.execute(
+        "create trigger if not exists bank_summary_insert after insert on bank begin"
+        " update bank_summary set accounts = accounts + 1,"
+        " total_balance = total_balance + new.balance where id = 1; end"
+    )
+    conn.execute(
+        "create trigger if not exists bank_summary_update after update of balance on bank begin"
+        " update bank_summary set total_balance = total_balance - old.balance + new.balance"
+        " where id = 1; end"
+    )
+    conn.execute(
+        "create trigger if not exists bank_summary_delete after delete on bank begin"
+        " update bank_summary set accounts = accounts - 1,"
+        " total_balance = total_balance - old.balance where id = 1; end"
+    )
+
+
+MIGRATIONS = (_v1_accounts_and_staff, _v2_ledger, _v3_single_admin_rows, _v4_bank_summary)
+
+
+# bring the schema up to date; returns the schema version
+def migrate(conn):
+    while True:
+        # the write lock makes concurrent start-ups run each step once
+        conn.execute("begin immediate")
+        try:
+            version = conn.execute("pragma user_version").fetchone()[0]
+            if version >= len(MIGRATIONS):
+                conn.commit()
+                return version
+            MIGRATIONS[version](conn)
+            conn.execute("pragma user_version = %d" % (version + 1))
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+
+def _exists(conn, sql, params):
+    return bool(conn.execute("select exists(%s)" % sql, params).fetchone()[0])
+
+
+# ----- admin and staff -----
+
+def admin_login_ok(conn, name, password):
+    return _exists(conn, "select 1 from admin where name = ? and pass = ?", (name, password))
+
+
+def employee_login_ok(conn, name, password):
+    return _exists(conn, "select 1 from staff where name = ? and pass = ?", (name, password))
+
+
+def employee_exists(conn, name):
+    return _exists(conn, "select 1 from staff where name = ?", (name,))
+
+
+def insert_employee(conn, name, password, salary, position):
+    conn.execute("insert into staff values (?, ?, ?, ?)", (name, password, salary, position))
+
+
+def update_employee(conn, name, field, value):
+    if field not in EMPLOYEE_FIELDS:
+        raise ValueError("unknown staff field %r" % field)
+    conn.execute("update staff set %s = ? where name = ?" % field, (value, name))
+
+
+def list_employees(conn):
+    return conn.execute("select name, salary, position, pass from staff").fetchall()
+
+
+def list_staff(conn):
+    return conn.execute("select * from staff").fetchall()
+
+
+# ----- customers -----
+
+# returns the new account number (the rowid sqlite assigned)
+def insert_customer(conn, name, age, address, balance, acc_type, mobile_number):
+    cur = conn.execute(
+        "insert into bank (name, age, address, balance, account_type, mobile_number)"
+        " values (?, ?, ?, ?, ?, ?)",
+        (name, age, address, balance, acc_type, mobile_number),
+    )
+    return cur.lastrowid
+
+
+def account_exists(conn, acc_no):
+    return _exists(conn, "select 1 from bank where acc_no = ?", (acc_no,))
+
+
+def get_account(conn, acc_no):
+    return conn.execute("select * from bank where acc_no = ?", (acc_no,)).fetchone()
+
+
+def get_name_and_balance(conn, acc_no):
+    return conn.execute("select name, balance from bank where acc_no = ?", (acc_no,)).fetchall()
+
+
+def get_balance(conn, acc_no):
+    row = conn.execute("select balance from bank where acc_no = ?", (acc_no,)).fetchone()
+    return None if row is None else row[0]
+
+
+def update_customer(conn, acc_no, field, value):
+    if field not in CUSTOMER_FIELDS:
+        raise ValueError("unknown customer field %r" % field)
+    conn.execute("update bank set %s = ? where acc_no = ?" % field, (value, acc_no))
+
+
+def delete_account(conn, acc_no):
+    conn.execute("delete from bank where acc_no = ?", (acc_no,))
+
+
+def list_customers(conn):
+    return conn.execute("select * from bank order by acc_no").fetchall()
+
+
+# Keyset pagination: a page is the next limit accounts after (or the
+# previous ones before) a known acc_no, found by a range scan of the
+# primary key, so page 10000 costs the same as page 1 (OFFSET would
+# walk every skipped row).
+def customers_page(conn, after=None, before=None, limit=100):
+    if before is not None:
+        rows = conn.execute(
+            "select * from bank where acc_no < ? order by acc_no desc limit ?", (before, limit)
+        ).fetchall()
+        rows.reverse()
+        return rows
+    return conn.execute(
+        "select * from bank where acc_no > ? order by acc_no limit ?",
+        (-1 if after is None else after, limit),
+    ).fetchall()
+
+
+def count_customers(conn):
+    return conn.execute("select accounts from bank_summary where id = 1").fetchone()[0]
+
+
+# total of all balances, or None for an empty bank; read from the
+# trigger-maintained bank_summary row instead of scanning bank
+def total_balance(conn):
+    accounts, total = conn.execute(
+        "select accounts, total_balance from bank_summary where id = 1"
+    ).fetchone()
+    return total if accounts else None
+
+
+# ----- ledger -----
+
+def add_ledger_entry(conn, acc_no, amount, kind, counterparty=None):
+    conn.execute(
+        "insert into ledger (acc_no, amount, kind, counterparty) values (?, ?, ?, ?)",
+        (acc_no, amount, kind, counterparty),
+    )
+
+
+def ledger_entries(conn, acc_no, limit=100):
+    return conn.execute(
+        "select id, amount, kind, counterparty, created_at from ledger"
+        " where acc_no = ? order by id desc limit ?",
+        (acc_no, limit),
+    ).fetchall()
+
+
+def connect(path, timeout=30.0):
+    """
+    Open the database in WAL mode (readers never block the writer) and
+    make sure the schema is current. timeout is how long a writer waits
+    for the write lock before failing with "database is locked".
+    """
+    conn = sqlite3.connect(path, timeout=timeout)
+    conn.execute("pragma journal_mode = wal")
+    migrate(conn)
+    return conn
@@ -3,6 +3,7 @@ import tkinter.messagebox
 from tkinter import *
 
 import backend
+from background import BackgroundRunner
 
 backend.connect_database()
 
@@ -29,13 +30,15 @@ def create():
         if len(name) != 0 and len(age) != 0 and len(address) != 0 and len(balance) != 0 and len(acc_type) != 0 and len(
                 mobile_number) != 0:
 
-            acc_no = backend.create_customer(name, age, address, balance, acc_type, mobile_number)
+            def show_acc_no(acc_no):
+                label = Label(create_employee_frame, text='Your account number is {}'.format(acc_no))
+                label.grid(row=14)
 
-            label = Label(create_employee_frame, text='Your account number is {}'.format(acc_no))
-            label.grid(row=14)
+                button = Button(create_employee_frame, text="Exit", command=delete_create)
+                button.grid(row=15)
 
-            button = Button(create_employee_frame, text="Exit", command=delete_create)
-            button.grid(row=15)
+            runner.submit(backend.create_customer, name, age, address, balance, acc_type, mobile_number,
+                          on_done=show_acc_no)
         else:
             label = Label(create_employee_frame, text='Please fill all entries')
             label.grid(row=14)
@@ -114,10 +117,7 @@ def show():
         search_frame.grid_forget()
         page2()
 
-    acc_no = entry11.get()
-    r = check_string_in_account_no(acc_no)
-    if len(acc_no) != 0 and r:
-        details = backend.get_details(acc_no)
+    def show_details(details):
         if details != False:
             search_frame.grid_forget()
             global show_frame
@@ -140,13 +140,16 @@ def show():
             label.grid(row=6, pady=6)
             button = Button(show_frame, text='Exit', command=clear_show_frame, width=20, height=2, bg='red', fg='white')
             button.grid(row=7, pady=6)
-            mainloop()
         else:
             label = Label(search_frame, text="Account Not Found")
             label.grid()
             button = Button(search_frame, text='Exit', command=back_page2)
             button.grid()
 
+    acc_no = entry11.get()
+    r = check_string_in_account_no(acc_no)
+    if len(acc_no) != 0 and r:
+        runner.submit(backend.get_details, acc_no, on_done=show_details)
     else:
         label = Label(search_frame, text="Enter correct account number")
         label.grid()
@@ -162,33 +165,32 @@ def add():
             search_frame.grid_forget()
             page2()
 
-        global result
-        global acc_no
-        acc_no = entry11.get()
-        r = check_string_in_account_no(acc_no)
-        if len(acc_no) != 0 and r:
-            result = backend.check_acc_no(acc_no)
-            print(result)
-            if not result:
+        # get_detail is empty for an unknown account, so one query both
+        # checks the number and fetches what the form shows
+        def show_add_form(detail):
+            if not detail:
                 label = Label(search_frame, text="invalid account number")
                 label.grid(pady=2)
                 button = Button(search_frame, text="Exit", command=back_page2)
                 button.grid()
-                mainloop()
             else:
-                def update_money():
-                    new_money = entry12.get()
-                    backend.update_balance(new_money, acc_no)
+                def money_added(result):
+                    # False: the posting was rejected; keep the form
+                    if not result:
+                        tkinter.messagebox.showinfo('Error', 'Deposit failed, check the amount')
+                        return
                     add_frame.grid_forget()
                     page2()
 
+                def update_money():
+                    new_money = entry12.get()
+                    runner.submit(backend.update_balance, new_money, acc_no, on_done=money_added)
+
                 search_frame.grid_forget()
                 global add_frame
                 add_frame = Frame(tk)
                 add_frame.grid(padx=400, pady=300)
 
-                detail = backend.get_detail(acc_no)
-
                 label = Label(add_frame, text='Account holder name:   {}'.format(detail[0][0]))
                 label.grid(row=0, pady=3)
 
@@ -204,7 +206,11 @@ def add():
                 button = Button(add_frame, text='Add', command=update_money)
                 button.grid(row=4)
 
-                mainloop()
+        global acc_no
+        acc_no = entry11.get()
+        r = check_string_in_account_no(acc_no)
+        if len(acc_no) != 0 and r:
+            runner.submit(backend.get_detail, acc_no, on_done=show_add_form)
         else:
             label = Label(search_frame, text="Enter correct account number")
             label.grid(pady=2)
@@ -240,40 +246,29 @@ def withdraw():
             search_frame.grid_forget()
             page2()
 
-        global result
-        global acc_no
-        acc_no = entry11.get()
-        r = check_string_in_account_no(acc_no)
-        if len(acc_no) != 0 and r:
-            result = backend.check_acc_no(acc_no)
-            print(result)
-            if not result:
+        def show_withdraw_form(detail):
+            if not detail:
                 label = Label(search_frame, text="invalid account number")
                 label.grid(pady=2)
                 button = Button(search_frame, text="Exit", command=go_page2)
                 button.grid()
-                mainloop()
             else:
+                def money_deducted(result):
+                    # False: the posting was rejected; keep the form
+                    if not result:
+                        tkinter.messagebox.showinfo('Error', 'Insufficient Balance or invalid amount')
+                        return
+                    add_frame.grid_forget()
+                    page2()
+
                 def deduct_money():
                     new_money = entry12.get()
-                    result = backend.deduct_balance(new_money, acc_no)
-                    if result:
-                        add_frame.grid_forget()
-                        page2()
-                    else:
-                        label = Label(search_frame, text="Insufficient Balance")
-                        label.grid(row=4)
-
-                        button = Button(search_frame, text='Exit', command=go_page2)
-                        button.grid(row=5)
-
-                        mainloop()
+                    runner.submit(backend.deduct_balance, new_money, acc_no, on_done=money_deducted)
 
                 search_frame.grid_forget()
                 global add_frame
                 add_frame = Frame(tk)
                 add_frame.grid(padx=400, pady=300)
-                detail = backend.get_detail(acc_no)
 
                 label = Label(add_frame, text='Account holder name:   {}'.format(detail[0][0]))
                 label.grid(row=0, pady=3)
@@ -290,7 +285,11 @@ def withdraw():
                 button = Button(add_frame, text='Withdraw', command=deduct_money)
                 button.grid(row=4)
 
-                mainloop()
+        global acc_no
+        acc_no = entry11.get()
+        r = check_string_in_account_no(acc_no)
+        if len(acc_no) != 0 and r:
+            runner.submit(backend.get_detail, acc_no, on_done=show_withdraw_form)
         else:
             label = Label(search_frame, text="Enter correct account number")
             label.grid(row=4)
@@ -328,27 +327,19 @@ def check():
             search_frame.grid_forget()
             page2()
 
-        global result
-        global acc_no
-        acc_no = entry11.get()
-        r = check_string_in_account_no(acc_no)
-
-        if len(acc_no) != 0 and r:
-            result = backend.check_acc_no(acc_no)
-            print(result)
-            if not result:
+        # check_balance is None for an unknown account
+        def show_balance(balance):
+            if balance is None:
                 label = Label(search_frame, text="invalid account number")
                 label.grid(pady=2)
                 button = Button(search_frame, text="Exit", command=back_page2)
                 button.grid()
-                mainloop()
             else:
                 def delete_check_frame():
                     check_frame.grid_forget()
                     page2()
 
                 search_frame.grid_forget()
-                balance = backend.check_balance(acc_no)
                 global check_frame
                 check_frame = Frame(tk)
                 check_frame.grid(padx=500, pady=300)
@@ -359,7 +350,12 @@ def check():
                 button = Button(check_frame, text='Back', command=delete_check_frame, width=20, height=2, bg='red')
                 button.grid(row=1)
 
-                mainloop()
+        global acc_no
+        acc_no = entry11.get()
+        r = check_string_in_account_no(acc_no)
+
+        if len(acc_no) != 0 and r:
+            runner.submit(backend.check_balance, acc_no, on_done=show_balance)
         else:
             label = Label(search_frame, text="Enter correct entry")
             label.grid(pady=2)
@@ -406,7 +402,7 @@ def update():
                 r = check_string_in_account_no(new_name)
                 if len(new_name) != 0:
                     # function in backend that updates name in table
-                    backend.update_name_in_bank_table(new_name, acc_no)
+                    runner.submit(backend.update_name_in_bank_table, new_name, acc_no)
                     entry_name.destroy()
                     submit_button.destroy()
                     name_label.destroy()
@@ -434,7 +430,7 @@ def update():
                 r = check_string_in_account_no(new_age)
                 if len(new_age) != 0 and r:
                     # function in backend that updates name in table
-                    backend.update_age_in_bank_table(new_age, acc_no)
+                    runner.submit(backend.update_age_in_bank_table, new_age, acc_no)
                     entry_name.destroy()
                     submit_button.destroy()
                     age_label.destroy()
@@ -461,7 +457,7 @@ def update():
                 new_address = entry_name.get()
                 if len(new_address) != 0:
                     # function in backend that updates name in table
-                    backend.update_address_in_bank_table(new_address, acc_no)
+                    runner.submit(backend.update_address_in_bank_table, new_address, acc_no)
                     entry_name.destroy()
                     submit_button.destroy()
                     address_label.destroy()
@@ -484,9 +480,7 @@ def update():
 
         acc_no = entry_acc.get()
 
-        r = check_string_in_account_no(acc_no)
-        if r:
-            result = backend.check_acc_no(acc_no)
+        def show_update_options(result):
             if result:
                 search_frame.grid_forget()
                 global update_customer_frame
@@ -507,7 +501,6 @@ def update():
 
                 exit_button = Button(update_customer_frame, text='Exit', command=back_to_page2_from_update)
                 exit_button.grid(row=4)
-                mainloop()
             else:
                 label = Label(search_frame, text='Invalid account number')
                 label.grid()
@@ -515,6 +508,9 @@ def update():
                 button = Button(search_frame, text='Exit', command=back_to_page2)
                 button.grid()
 
+        r = check_string_in_account_no(acc_no)
+        if r:
+            runner.submit(backend.check_acc_no, acc_no, on_done=show_update_options)
         else:
             label = Label(search_frame, text='Fill account number')
             label.grid()
@@ -539,26 +535,80 @@ def update():
     button.grid()
 
 
+# rows shown at once by the list of all members
+PAGE_SIZE = 20
+# mouse wheel on Windows/macOS, and on X11
+WHEEL_EVENTS = ('<MouseWheel>', '<Button-4>', '<Button-5>')
+
+
 def allmembers():
+    # Only PAGE_SIZE row labels are ever created; paging fetches the
+    # next or previous PAGE_SIZE accounts by acc_no and refills them, so
+    # the view costs the same for ten customers or ten million.
     def clear_list_frame():
+        for sequence in WHEEL_EVENTS:
+            list_frame.unbind_all(sequence)
         list_frame.grid_forget()
         page2()
 
+    def fetch(after=None, before=None):
+        return backend.list_customers_page(after, before, PAGE_SIZE), backend.count_customers()
+
+    def show(page):
+        rows, count = page
+        if not rows:
+            return
+        shown[:] = rows
+        for row_label, i in zip(row_labels, rows + [None] * (PAGE_SIZE - len(rows))):
+            if i is None:
+                row_label.config(text='')
+            else:
+                row_label.config(text="{}\t\t\t{}\t\t\t{}\t\t\t{}\t\t\t{}".format(i[0], i[1], i[2], i[3], i[4]))
+        position.config(text='Accounts {} to {} of {}'.format(rows[0][0], rows[-1][0], count))
+
+    # a burst of wheel events asks for the same page; the runner runs it once
+    def next_page(event=None):
+        if shown:
+            runner.submit(fetch, shown[-1][0], None, on_done=show)
+
+    def previous_page(event=None):
+        if shown:
+            runner.submit(fetch, None, shown[0][0], on_done=show)
+
+    def scroll(event):
+        if event.num == 5 or event.delta < 0:
+            next_page()
+        else:
+            previous_page()
+
     frame1.grid_forget()
-    details = backend.list_all_customers()
     global tk
 
     global list_frame
     list_frame = Frame(tk)
     list_frame.grid(padx=50, pady=50)
     label = Label(list_frame, text="Acc_no\t\t\tName\t\t\tAge\t\t\tAddress\t\t\tbalance")
-    label.grid(pady=6)
-    for i in details:
-        label = Label(list_frame, text="{}\t\t\t{}\t\t\t{}\t\t\t{}\t\t\t{}".format(i[0], i[1], i[2], i[3], i[4]))
-        label.grid(pady=4)
+    label.grid(pady=6, columnspan=2)
+    row_labels = []
+    for _ in range(PAGE_SIZE):
+        label = Label(list_frame, text='')
+        label.grid(pady=4, columnspan=2)
+        row_labels.append(label)
+    position = Label(list_frame, text='No accounts')
+    position.grid(pady=6, columnspan=2)
+
+    shown = []
+    runner.submit(fetch, on_done=show)
+
+    button = Button(list_frame, text='Previous', width=20, height=2, command=previous_page)
+    button.grid(row=PAGE_SIZE + 2, column=0)
+    button = Button(list_frame, text='Next', width=20, height=2, command=next_page)
+    button.grid(row=PAGE_SIZE + 2, column=1)
+    for sequence in WHEEL_EVENTS:
+        list_frame.bind_all(sequence, scroll)
 
     button = Button(list_frame, text='Back', width=20, height=2, bg='red', command=clear_list_frame)
-    button.grid()
+    button.grid(columnspan=2)
     mainloop()
 
 
@@ -570,24 +620,28 @@ def delete():
             search_frame.grid_forget()
             page2()
 
-        global result
-        global acc_no
-        acc_no = entry11.get()
-        r = check_string_in_account_no(acc_no)
-        if len(acc_no) != 0 and r:
-            result = backend.check_acc_no(acc_no)
-            print(result)
+        def delete_if_exists(acc_no):
+            if not backend.check_acc_no(acc_no):
+                return False
+            backend.delete_acc(acc_no)
+            return True
+
+        def account_deleted(result):
             if not result:
 
                 label = Label(search_frame, text="invalid account number")
                 label.grid(pady=2)
                 button = Button(search_frame, text="Exit", command=back_page2)
                 button.grid()
-                mainloop()
             else:
-                backend.delete_acc(acc_no)
                 search_frame.grid_forget()
                 page2()
+
+        global acc_no
+        acc_no = entry11.get()
+        r = check_string_in_account_no(acc_no)
+        if len(acc_no) != 0 and r:
+            runner.submit(delete_if_exists, acc_no, on_done=account_deleted)
         else:
             label = Label(search_frame, text="Enter correct account number")
             label.grid(pady=2)
@@ -671,9 +725,11 @@ def create_employee():
         salary = entry16.get()
         position = entry17.get()
         if len(name) != 0 and len(password) != 0 and len(salary) != 0 and len(position) != 0:
-            backend.create_employee(name, password, salary, position)
-            frame_create_emp.grid_forget()
-            page1()
+            def employee_created(result):
+                frame_create_emp.grid_forget()
+                page1()
+
+            runner.submit(backend.create_employee, name, password, salary, position, on_done=employee_created)
         else:
             label = Label(frame_create_emp, text="Please fill all entries")
             label.grid(pady=2)
@@ -733,7 +789,7 @@ def update_employee():
                     new_name = entry19.get()
                     if len(new_name) != 0:
                         old_name = staff_name.get()
-                        backend.update_employee_name(new_name, old_name)
+                        runner.submit(backend.update_employee_name, new_name, old_name)
                         entry19.destroy()
                         update_button.destroy()
                     else:
@@ -754,7 +810,7 @@ def update_employee():
                     new_password = entry19.get()
                     old_name = staff_name.get()
                     if len(new_password) != 0:
-                        backend.update_employee_password(new_password, old_name)
+                        runner.submit(backend.update_employee_password, new_password, old_name)
                         entry19.destroy()
                         update_button.destroy()
                     else:
@@ -777,7 +833,7 @@ def update_employee():
                     if len(new_salary) != 0 and r:
 
                         old_name = staff_name.get()
-                        backend.update_employee_salary(new_salary, old_name)
+                        runner.submit(backend.update_employee_salary, new_salary, old_name)
                         entry19.destroy()
                         update_button.destroy()
                     else:
@@ -799,7 +855,7 @@ def update_employee():
                     if len(new_position) != 0:
 
                         old_name = staff_name.get()
-                        backend.update_employee_position(new_position, old_name)
+                        runner.submit(backend.update_employee_position, new_position, old_name)
                         entry19.destroy()
                         update_button.destroy()
                     else:
@@ -836,9 +892,7 @@ def update_employee():
             button = Button(update_frame, text='Back', command=back_to_page1_from_update, width=14, height=2)
             button.grid(row=5, column=0, pady=2)
 
-        name = staff_name.get()
-        if len(name) != 0:
-            result = backend.check_name_in_staff(name)
+        def employee_found(result):
             if result:
 
                 update_that_particular_employee()
@@ -849,6 +903,9 @@ def update_employee():
                 button = Button(show_employee_frame, text='Exit', command=back_to_page1)
                 button.grid()
 
+        name = staff_name.get()
+        if len(name) != 0:
+            runner.submit(backend.check_name_in_staff, name, on_done=employee_found)
         else:
             label = Label(show_employee_frame, text='Fill the name')
             label.grid()
@@ -886,15 +943,16 @@ def show_employee():
     label = Label(show_employee_frame, text='Name\t\t\tSalary\t\t\tPosition\t\t\tpassword', font='bold')
     label.grid(row=0)
 
-    details = backend.show_employees()
+    def show_details(details):
+        for i in details:
+            label = Label(show_employee_frame, text="{}\t\t\t{}\t\t\t{}\t\t\t{}".format(i[0], i[1], i[2], i[3]))
+            label.grid(pady=4)
 
-    for i in details:
-        label = Label(show_employee_frame, text="{}\t\t\t{}\t\t\t{}\t\t\t{}".format(i[0], i[1], i[2], i[3]))
-        label.grid(pady=4)
+        button = Button(show_employee_frame, text='Exit', command=back_to_main_page1, width=20, height=2, bg='red',
+                        font='bold')
+        button.grid()
 
-    button = Button(show_employee_frame, text='Exit', command=back_to_main_page1, width=20, height=2, bg='red',
-                    font='bold')
-    button.grid()
+    runner.submit(backend.show_employees, on_done=show_details)
 
     mainloop()
 
@@ -906,8 +964,6 @@ def Total_money():
 
     page1_frame.grid_forget()
 
-    all = backend.all_money()
-
     global all_money
     all_money = Frame(tk)
     all_money.grid(padx=500, pady=300)
@@ -915,8 +971,9 @@ def Total_money():
     label = Label(all_money, text="Total Amount of money")
     label.grid(row=0, pady=6)
 
-    label = Label(all_money, text='{}'.format(all))
+    label = Label(all_money, text='')
     label.grid(row=1)
+    runner.submit(backend.all_money, on_done=lambda all: label.config(text='{}'.format(all)))
 
     button = Button(all_money, text="Back", command=back_to_main_page1_from_total_money, width=15, height=2)
     button.grid(row=3)
@@ -963,11 +1020,7 @@ def page1():
 
         mainloop()
 
-    name = entry1.get()
-    password = entry2.get()
-    if len(name) != 0 and len(password) != 0:
-        result = backend.check_admin(name, password)
-        print(result)
+    def show_admin_page(result):
         if result:
             admin_frame.grid_forget()
 
@@ -989,14 +1042,16 @@ def page1():
 
             button12 = Button(page1_frame, text="Back", command=back_to_main, width=20, height=2)
             button12.grid(row=4, pady=6)
-
-            mainloop()
         else:
             label = Label(admin_frame, text="Invalid id and pasasword")
             label.grid(row=6, pady=10)
             button = Button(admin_frame, text='Exit', command=back_to_main2)
             button.grid(row=7)
-            mainloop()
+
+    name = entry1.get()
+    password = entry2.get()
+    if len(name) != 0 and len(password) != 0:
+        runner.submit(backend.check_admin, name, password, on_done=show_admin_page)
     else:
         label = Label(admin_frame, text="Please fill All Entries")
         label.grid(row=6, pady=10)
@@ -1025,22 +1080,21 @@ def employee_login():
 
         mainloop()
 
+    def show_employee_page(result):
+        if result:
+            employee_frame.grid_forget()
+            page2()
+        else:
+            label = Label(employee_frame, text="Invalid id and pasasword")
+            label.grid(row=6, pady=10)
+            button = Button(employee_frame, text='Exit', command=back_to_main3)
+            button.grid(row=7)
+
     def check_emp():
         name = entry1.get()
         password = entry2.get()
         if len(name) != 0 and len(password) != 0:
-            result = backend.check_employee(name, password)
-            print(result)
-            if result:
-                employee_frame.grid_forget()
-                page2()
-            else:
-                label = Label(employee_frame, text="Invalid id and pasasword")
-                label.grid(row=6, pady=10)
-                button = Button(employee_frame, text='Exit', command=back_to_main3)
-                button.grid(row=7)
-
-                mainloop()
+            runner.submit(backend.check_employee, name, password, on_done=show_employee_page)
         else:
             label = Label(employee_frame, text="Please Fill All Entries")
             label.grid(row=6, pady=10)
@@ -1113,6 +1167,12 @@ tk.title('Bank Managing System')
 tk.minsize(1200, 800)
 tk.maxsize(1200, 800)
 
+# database calls run on worker threads; this label shows while they do
+loading = Label(tk, text='', bg='black', fg='white')
+loading.place(relx=1.0, rely=1.0, anchor='se')
+global runner
+runner = BackgroundRunner(tk, indicator=loading)
+
 global frame
 frame = Frame(tk, bg='black')
 frame.grid(padx=500, pady=250)
@@ -1126,3 +1186,4 @@ button.grid(row=1, pady=20)
 button = Button(frame, text="Exit", command=tk.destroy)
 button.grid(row=2, pady=20)
 tk.mainloop()
+runner.shutdown()
@@ -0,0 +1,266 @@
+"""
+Load generator for the bank HTTP API.
+
+N client threads, each with its own kept-alive connection, replay a
+weighted mix of operations (balance lookups, deposits, withdrawals,
+transfers, new accounts, listings and employee reads) against api.py
+and the SQLite file behind it. Latency is measured per request;
+the report gives count, errors, p50/p95/p99 and throughput per
+operation and overall.
+
+Without --url an API server is started in-process on a free port
+against --db, which is seeded with --accounts accounts first.
+
+Usage: python loadtest.py --clients 16 --duration 10
+       python loadtest.py --url http://127.0.0.1:8080 --clients 64 --requests 500
+       python loadtest.py --mix lookup=80,deposit=10,withdraw=10 --json result.json
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+
+DEFAULT_MIX = {
+    "lookup": 40,
+    "deposit": 20,
+    "withdraw": 15,
+    "transfer": 10,
+    "list": 5,
+    "create": 5,
+    "employees": 3,
+    "summary": 2,
+}
+
+
+def parse_mix(text):
+    """
+    "lookup=80,deposit=20" -> {"lookup": 80, "deposit": 20}
+    """
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise ValueError("unknown operation %r (choose from %s)" % (name, ", ".join(DEFAULT_MIX)))
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def percentile(sorted_values, q):
+    """
+    Nearest-rank percentile (q in 0..100) of an already sorted list.
+    """
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * q // 100))
+    return sorted_values[int(rank) - 1]
+
+
+class Client:
+    # one kept-alive connection; request() returns (status, payload)
+
+    def __init__(self, host, port, timeout=30.0):
+        self.conn = http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def request(self, method, path, body=None):
+        # bytes, so http.client sends headers and body in one segment
+        data = None if body is None else json.dumps(body).encode()
+        headers = {"Content-Type": "application/json"} if data is not None else {}
+        self.conn.request(method, path, data, headers)
+        response = self.conn.getresponse()
+        return response.status, json.loads(response.read() or b"null")
+
+    def close(self):
+        self.conn.close()
+
+
+def _operation(name, rng, accounts):
+    # -> (method, path, body, statuses that count as success)
+    acc_no = rng.choice(accounts)
+    if name == "lookup":
+        return "GET", "/accounts/%d" % acc_no, None, (200,)
+    if name == "deposit":
+        return "POST", "/accounts/%d/deposit" % acc_no, {"amount": rng.randint(1, 500)}, (200,)
+    if name == "withdraw":
+        # an overdraft refused with 409 is a correct answer, not an error
+        return "POST", "/accounts/%d/withdraw" % acc_no, {"amount": rng.randint(1, 500)}, (200, 409)
+    if name == "transfer":
+        src, dst = rng.sample(accounts, 2)
+        return "POST", "/transfers", {"src": src, "dst": dst, "amount": rng.randint(1, 200)}, (200, 409)
+    if name == "list":
+        return "GET", "/accounts?after=%d&limit=50" % (acc_no - 1), None, (200,)
+    if name == "create":
+        body = {"name": "load%d" % rng.randrange(10 ** 6), "age": rng.randint(18, 90), "address": "street",
+                "balance": 1000, "account_type": "savings", "mobile_number": rng.randrange(10 ** 9)}
+        return "POST", "/accounts", body, (201,)
+    if name == "employees":
+        return "GET", "/employees", None, (200,)
+    if name == "summary":
+        return "GET", "/summary", None, (200,)
+    raise ValueError("unknown operation %r" % name)
+
+
+def seed_accounts(host, port, count, balance=10_000):
+    client = Client(host, port)
+    try:
+        accounts = []
+        for i in range(count):
+            status, payload = client.request("POST", "/accounts", {
+                "name": "seed%d" % i, "age": 30, "address": "street", "balance": balance,
+                "account_type": "savings", "mobile_number": i,
+            })
+            if status != 201:
+                raise RuntimeError("seeding failed: %s %s" % (status, payload))
+            accounts.append(payload["acc_no"])
+        return accounts
+    finally:
+        client.close()
+
+
+def run_load(host, port, accounts, clients=8, duration=None, requests=None, mix=None, seed=0):
+    """
+    Drive the API with `clients` threads until `duration` seconds pass
+    or every client sent `requests` requests. Returns the report dict.
+    """
+    if duration is None and requests is None:
+        duration = 10.0
+    if len(accounts) < 2:
+        raise ValueError("need at least two accounts")
+    mix = mix or DEFAULT_MIX
+    names, weights = list(mix), list(mix.values())
+    samples = {name: [] for name in names}
+    errors = {name: 0 for name in names}
+    lock = threading.Lock()
+    start_barrier = threading.Barrier(clients + 1)
+
+    def worker(index):
+        rng = random.Random(seed * 1000 + index)
+        client = Client(host, port)
+        mine = {name: [] for name in names}
+        failed = {name: 0 for name in names}
+        start_barrier.wait()
+        deadline = None if duration is None else time.perf_counter() + duration
+        sent = 0
+        try:
+            while (requests is None or sent < requests) and (deadline is None or time.perf_counter() < deadline):
+                name = rng.choices(names, weights)[0]
+                method, path, body, ok = _operation(name, rng, accounts)
+                began = time.perf_counter()
+                try:
+                    status, _ = client.request(method, path, body)
+                except (OSError, http.client.HTTPException, ValueError):
+                    client.close()
+                    client = Client(host, port)
+                    status = None
+                mine[name].append(time.perf_counter() - began)
+                if status not in ok:
+                    failed[name] += 1
+                sent += 1
+        finally:
+            client.close()
+            with lock:
+                for name in names:
+                    samples[name].extend(mine[name])
+                    errors[name] += failed[name]
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    start_barrier.wait()
+    began = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return make_report(samples, errors, time.perf_counter() - began, clients)
+
+
+def _stats(latencies, errors, elapsed):
+    latencies = sorted(latencies)
+    ms = lambda q: None if not latencies else round(percentile(latencies, q) * 1000, 3)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": ms(50),
+        "p95_ms": ms(95),
+        "p99_ms": ms(99),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else None,
+    }
+
+
+def make_report(samples, errors, elapsed, clients):
+    report = {
+        "clients": clients,
+        "elapsed_s": round(elapsed, 3),
+        "operations": {name: _stats(samples[name], errors[name], elapsed) for name in samples if samples[name]},
+    }
+    report["total"] = _stats([x for values in samples.values() for x in values], sum(errors.values()), elapsed)
+    return report
+
+
+def format_report(report):
+    lines = ["%d clients, %.1f s" % (report["clients"], report["elapsed_s"]),
+             "%-10s %9s %7s %9s %9s %9s %10s" % ("operation", "requests", "errors", "p50 ms", "p95 ms",
+                                                 "p99 ms", "req/s")]
+    rows = sorted(report["operations"].items()) + [("total", report["total"])]
+    for name, stats in rows:
+        lines.append("%-10s %9d %7d %9s %9s %9s %10s" % (
+            name, stats["requests"], stats["errors"], stats["p50_ms"], stats["p95_ms"], stats["p99_ms"],
+            stats["throughput_rps"]))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load generator for the bank HTTP API.")
+    parser.add_argument("--url", help="API to test; default: start one in-process on --db")
+    parser.add_argument("--db", help="SQLite file for the in-process server (default: a temporary file)")
+    parser.add_argument("--clients", type=int, default=8, help="concurrent clients")
+    parser.add_argument("--duration", type=float, help="seconds to run (default: 10 unless --requests)")
+    parser.add_argument("--requests", type=int, help="requests per client")
+    parser.add_argument("--accounts", type=int, default=200, help="accounts to seed first")
+    parser.add_argument("--mix", type=parse_mix, help="weights, e.g. lookup=60,deposit=20,withdraw=20")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args(argv)
+
+    server = tmp = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    else:
+        import api
+        import backend
+
+        db = args.db
+        if db is None:
+            tmp = tempfile.TemporaryDirectory(prefix="bank-load-")
+            db = os.path.join(tmp.name, "bank.db")
+        server = api.make_server(port=0, db=db, pool_size=max(8, args.clients))
+        host, port = server.server_address[:2]
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    try:
+        accounts = seed_accounts(host, port, args.accounts)
+        report = run_load(host, port, accounts, args.clients, args.duration, args.requests, args.mix, args.seed)
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+            backend.pool.close()
+        if tmp is not None:
+            tmp.cleanup()
+
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 1 if report["total"]["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,483 @@
+#
+# Test bank backend
+# *****************
+#
+# Usage: python test_backend.py
+#
+
+
+import os
+import io
+import json
+import random
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+
+import api
+import backend
+import bulk
+import dal
+import loadtest
+import transactions
+from background import BackgroundRunner
+from connection_pool import ConnectionPool, PoolTimeout
+
+
+class TestDataAccessLayer(unittest.TestCase):
+
+    def setUp(self):
+        self.conn = dal.connect(":memory:")
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_customer_round_trip(self):
+        acc_no = dal.insert_customer(self.conn, "ann", 30, "main st", 100, "savings", 555)
+        self.assertTrue(dal.account_exists(self.conn, acc_no))
+        self.assertFalse(dal.account_exists(self.conn, acc_no + 1))
+        self.assertEqual(dal.get_account(self.conn, acc_no),
+                         (acc_no, "ann", 30, "main st", 100, "savings", 555))
+        dal.update_customer(self.conn, acc_no, "name", "o'hara")
+        self.assertEqual(dal.get_name_and_balance(self.conn, acc_no), [("o'hara", 100)])
+        dal.delete_account(self.conn, acc_no)
+        self.assertIsNone(dal.get_account(self.conn, acc_no))
+
+    def test_staff_login_uses_unique_name(self):
+        dal.insert_employee(self.conn, "bob", "pw", 10, "clerk")
+        self.assertTrue(dal.employee_login_ok(self.conn, "bob", "pw"))
+        self.assertFalse(dal.employee_login_ok(self.conn, "bob", "nope"))
+        with self.assertRaises(sqlite3.IntegrityError):
+            dal.insert_employee(self.conn, "bob", "other", 20, "clerk")
+
+    def test_lookups_use_indexes(self):
+        plans = [
+            self.conn.execute("explain query plan " + sql, params).fetchall()
+            for sql, params in (
+                ("select 1 from bank where acc_no = ?", (1,)),
+                ("select 1 from staff where name = ? and pass = ?", ("a", "b")),
+            )
+        ]
+        for plan in plans:
+            self.assertTrue(any("SEARCH" in row[-1] for row in plan), plan)
+
+    def test_keyset_pages(self):
+        accounts = [dal.insert_customer(self.conn, "c%d" % i, 1, "x", 0, "s", i) for i in range(10)]
+        dal.delete_account(self.conn, accounts[4])
+        first = dal.customers_page(self.conn, limit=4)
+        second = dal.customers_page(self.conn, after=first[-1][0], limit=4)
+        self.assertEqual([row[0] for row in first + second], accounts[:4] + accounts[5:9])
+        self.assertEqual(dal.customers_page(self.conn, before=second[0][0], limit=4), first)
+        self.assertEqual(dal.customers_page(self.conn, after=accounts[-1]), [])
+        plan = self.conn.execute(
+            "explain query plan select * from bank where acc_no > ? order by acc_no limit ?", (0, 4)
+        ).fetchall()
+        self.assertTrue(any("SEARCH" in row[-1] for row in plan), plan)
+
+    def test_summary_follows_every_write(self):
+        self.assertIsNone(dal.total_balance(self.conn))
+        a = dal.insert_customer(self.conn, "a", 1, "x", 100, "s", 1)
+        b = dal.insert_customer(self.conn, "b", 1, "x", 50, "s", 1)
+        self.conn.commit()
+        transactions.deposit(self.conn, a, 25)
+        transactions.transfer(self.conn, a, b, 10)
+        bulk.post_batch(self.conn, [(a, 1), (b, 2)])
+        dal.update_customer(self.conn, a, "name", "ann")
+        dal.delete_account(self.conn, b)
+        self.conn.commit()
+        bulk.import_customers(self.conn, [("c", 1, "x", 7, "s", 1)] * 3)
+        self.assertEqual(
+            (dal.count_customers(self.conn), dal.total_balance(self.conn)),
+            self.conn.execute("select count(*), sum(balance) from bank").fetchone(),
+        )
+        self.assertEqual(dal.total_balance(self.conn), 100 + 25 - 10 + 1 + 21)
+
+    def test_update_field_whitelist(self):
+        with self.assertRaises(ValueError):
+            dal.update_customer(self.conn, 1, "balance = 0 --", 1)
+        with self.assertRaises(ValueError):
+            dal.update_employee(self.conn, "bob", "salary; drop table staff", 1)
+
+    def test_legacy_database_is_migrated(self):
+        conn = sqlite3.connect(":memory:")
+        conn.execute("create table bank (acc_no int, name text, age int, address text,"
+                     " balance int, account_type text, mobile_number int)")
+        conn.execute("create table staff (name text, pass text, salary int, position text)")
+        conn.execute("insert into bank values (7, 'old', 1, 'x', 5, 's', 1)")
+        conn.executemany("insert into staff values (?, ?, ?, ?)",
+                         [("eve", "a", 1, "m"), ("eve", "b", 2, "m")])
+        conn.commit()
+        dal.migrate(conn)
+        dal.migrate(conn)
+        self.assertEqual(dal.get_account(conn, 7)[1], "old")
+        self.assertEqual(dal.total_balance(conn), 5)
+        self.assertEqual(dal.insert_customer(conn, "new", 2, "y", 0, "s", 2), 8)
+        self.assertTrue(dal.employee_login_ok(conn, "eve", "b"))
+        self.assertFalse(dal.employee_login_ok(conn, "eve", "a"))
+        conn.close()
+
+
+class TestTransactions(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "bank.db")
+        self.conn = dal.connect(self.path)
+        self.accounts = [
+            dal.insert_customer(self.conn, "c%d" % i, 30, "x", 1000, "savings", i) for i in range(10)
+        ]
+        self.conn.commit()
+
+    def tearDown(self):
+        self.conn.close()
+        shutil.rmtree(self.tmp)
+
+    def test_postings_and_ledger(self):
+        a, b = self.accounts[:2]
+        self.assertEqual(transactions.deposit(self.conn, a, 50), 1050)
+        self.assertEqual(transactions.withdraw(self.conn, a, 1050), 0)
+        with self.assertRaises(transactions.InsufficientFunds):
+            transactions.withdraw(self.conn, a, 1)
+        with self.assertRaises(transactions.UnknownAccount):
+            transactions.deposit(self.conn, 10 ** 6, 1)
+        with self.assertRaises(ValueError):
+            transactions.deposit(self.conn, a, 0)
+        transactions.transfer(self.conn, b, a, 300)
+        self.assertEqual(dal.get_balance(self.conn, a), 300)
+        self.assertEqual(
+            [row[1:4] for row in dal.ledger_entries(self.conn, a)],
+            [(300, "transfer", b), (-1050, "withdrawal", None), (50, "deposit", None)],
+        )
+
+    def test_failed_transfer_changes_nothing(self):
+        a = self.accounts[0]
+        with self.assertRaises(transactions.UnknownAccount):
+            transactions.transfer(self.conn, a, 10 ** 6, 10)
+        self.assertEqual(dal.get_balance(self.conn, a), 1000)
+        self.assertEqual(dal.ledger_entries(self.conn, a), [])
+
+    def test_concurrent_transfers_conserve_money(self):
+        def teller(seed):
+            conn = dal.connect(self.path)
+            rng = random.Random(seed)
+            for _ in range(100):
+                src, dst = rng.sample(self.accounts, 2)
+                try:
+                    transactions.transfer(conn, src, dst, rng.randint(1, 500))
+                except transactions.InsufficientFunds:
+                    pass
+            conn.close()
+
+        threads = [threading.Thread(target=teller, args=(seed,)) for seed in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        total, lowest = self.conn.execute("select sum(balance), min(balance) from bank").fetchone()
+        self.assertEqual(total, 10 * 1000)
+        self.assertGreaterEqual(lowest, 0)
+        # every balance is explained by its ledger
+        mismatched = self.conn.execute(
+            "select count(*) from bank where balance !="
+            " 1000 + (select coalesce(sum(amount), 0) from ledger where ledger.acc_no = bank.acc_no)"
+        ).fetchone()[0]
+        self.assertEqual(mismatched, 0)
+
+
+class TestBulk(unittest.TestCase):
+
+    def setUp(self):
+        self.conn = dal.connect(":memory:")
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_import_in_batches_and_export_round_trip(self):
+        rows = [("c%d" % i, 20 + i, "x", 10 * i, "savings", i) for i in range(25)]
+        self.assertEqual(bulk.import_customers(self.conn, rows, batch_size=7), 25)
+        self.assertEqual(dal.total_balance(self.conn), sum(10 * i for i in range(25)))
+
+        out = io.StringIO()
+        self.assertEqual(bulk.export_customers(self.conn, out, batch_size=4), 25)
+        other = dal.connect(":memory:")
+        self.assertEqual(bulk.import_customers(other, io.StringIO(out.getvalue())), 25)
+        self.assertEqual(dal.list_customers(other), dal.list_customers(self.conn))
+        other.close()
+
+        out = io.StringIO()
+        bulk.export_customers(self.conn, out, fmt="ndjson")
+        first = json.loads(out.getvalue().splitlines()[0])
+        self.assertEqual(first, dict(zip(bulk.CUSTOMER_COLUMNS, dal.get_account(self.conn, 1))))
+
+    def test_falsy_values_are_kept(self):
+        rows = [{"name": "zero", "age": 0, "address": "", "balance": 0, "account_type": "s", "mobile_number": 0},
+                {"name": "rich", "balance": 50}]
+        self.assertEqual(bulk.import_customers(self.conn, rows), 2)
+        self.assertEqual(dal.get_account(self.conn, 1), (1, "zero", 0, "", 0, "s", 0))
+        self.assertEqual(dal.get_account(self.conn, 2)[4], 50)
+        self.assertEqual(dal.total_balance(self.conn), 50)
+        self.assertEqual(bulk.post_batch(self.conn, [(1, 5)]), 1)
+        self.assertEqual(dal.get_account(self.conn, 1)[4], 5)
+
+    def test_failed_import_leaves_nothing(self):
+        rows = [{"acc_no": 1, "name": "a"}, {"acc_no": 2, "name": "b"}, {"acc_no": 1, "name": "dup"}]
+        with self.assertRaises(sqlite3.IntegrityError):
+            bulk.import_customers(self.conn, rows, batch_size=2)
+        self.assertEqual(dal.list_customers(self.conn), [])
+
+    def test_post_batch_is_all_or_nothing(self):
+        bulk.import_customers(self.conn, [("c", 1, "x", 100, "s", 1)] * 3)
+        self.assertEqual(bulk.post_batch(self.conn, [(1, 5), (2, -100), (3, 7)], "interest"), 3)
+        self.assertEqual([row[4] for row in dal.list_customers(self.conn)], [105, 0, 107])
+        self.assertEqual(dal.ledger_entries(self.conn, 1)[0][1:3], (5, "interest"))
+
+        with self.assertRaises(transactions.TransactionError):
+            bulk.post_batch(self.conn, [(1, 1), (2, -1)], batch_size=1)
+        with self.assertRaises(transactions.TransactionError):
+            bulk.post_batch(self.conn, [(1, 1), (99, 1)])
+        self.assertEqual([row[4] for row in dal.list_customers(self.conn)], [105, 0, 107])
+        self.assertEqual(self.conn.execute("select count(*) from ledger").fetchone()[0], 3)
+
+
+class TestConnectionPool(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "bank.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_pragmas_and_idempotent_migrations(self):
+        for _ in range(2):
+            pool = ConnectionPool(self.path, size=2, pragmas={"mmap_size": 1 << 20})
+            with pool.connection() as conn:
+                self.assertEqual(conn.execute("pragma journal_mode").fetchone()[0], "wal")
+                self.assertEqual(conn.execute("pragma synchronous").fetchone()[0], 1)
+                self.assertEqual(conn.execute("pragma mmap_size").fetchone()[0], 1 << 20)
+                self.assertEqual(conn.execute("pragma user_version").fetchone()[0], len(dal.MIGRATIONS))
+                self.assertEqual(conn.execute("select count(*) from admin").fetchone()[0], 1)
+            pool.close()
+
+    def test_thread_gets_same_connection_until_released(self):
+        pool = ConnectionPool(self.path, size=1, timeout=0.2)
+        with pool.connection() as outer:
+            with pool.connection() as inner:
+                self.assertIs(inner, outer)
+            errors = []
+
+            def other_thread():
+                try:
+                    with pool.connection():
+                        pass
+                except PoolTimeout as err:
+                    errors.append(err)
+
+            thread = threading.Thread(target=other_thread)
+            thread.start()
+            thread.join()
+            self.assertEqual(len(errors), 1)
+        pool.close()
+
+    def test_block_commits_or_rolls_back(self):
+        pool = ConnectionPool(self.path, size=2)
+        with pool.connection() as conn:
+            dal.insert_customer(conn, "kept", 1, "x", 0, "s", 1)
+        with self.assertRaises(RuntimeError):
+            with pool.connection() as conn:
+                dal.insert_customer(conn, "dropped", 1, "x", 0, "s", 1)
+                raise RuntimeError
+        with pool.connection() as conn:
+            self.assertEqual([row[1] for row in dal.list_customers(conn)], ["kept"])
+        pool.close()
+
+    def test_backend_shares_pool_across_threads(self):
+        backend.connect_database(self.path, pool_size=3)
+        accounts = [backend.create_customer("c", 1, "x", 100, "s", 1) for _ in range(4)]
+
+        def teller(seed):
+            rng = random.Random(seed)
+            for _ in range(50):
+                src, dst = rng.sample(accounts, 2)
+                backend.transfer(src, dst, rng.randint(1, 50))
+
+        threads = [threading.Thread(target=teller, args=(seed,)) for seed in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(backend.all_money(), 400)
+        self.assertTrue(backend.check_admin(*dal.DEFAULT_ADMIN))
+        backend.pool.close()
+
+    def test_backend_postings_report_failures(self):
+        backend.connect_database(self.path, pool_size=1)
+        acc = backend.create_customer("c", 1, "x", 100, "s", 1)
+        self.assertTrue(backend.update_balance(5, acc))
+        self.assertFalse(backend.update_balance(5, 999))
+        self.assertFalse(backend.deduct_balance(5, 999))
+        self.assertFalse(backend.deduct_balance(500, acc))
+        self.assertFalse(backend.transfer(acc, 999, 5))
+        self.assertEqual(backend.all_money(), 105)
+        backend.pool.close()
+
+
+class TestHttpApi(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.server = api.make_server(port=0, db=os.path.join(self.tmp, "bank.db"), pool_size=4)
+        self.host, self.port = self.server.server_address[:2]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.client = loadtest.Client(self.host, self.port)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+        backend.pool.close()
+        shutil.rmtree(self.tmp)
+
+    def test_account_life_cycle(self):
+        request = self.client.request
+        status, created = request("POST", "/accounts", {
+            "name": "ann", "age": 30, "address": "x", "balance": 100, "account_type": "s", "mobile_number": 5})
+        self.assertEqual(status, 201)
+        acc = "/accounts/%d" % created["acc_no"]
+        self.assertEqual(request("POST", acc + "/deposit", {"amount": 50}), (200, {"acc_no": created["acc_no"], "balance": 150}))
+        self.assertEqual(request("POST", acc + "/withdraw", {"amount": 500})[0], 409)
+        self.assertEqual(request("POST", acc + "/withdraw", {"amount": -1})[0], 400)
+        self.assertEqual(request("PATCH", acc, {"name": "o'hara"})[1]["name"], "o'hara")
+        self.assertEqual(request("GET", acc + "/ledger")[1]["entries"][0]["amount"], 50)
+        self.assertEqual(request("GET", "/summary"), (200, {"accounts": 1, "total_balance": 150}))
+        self.assertEqual(request("DELETE", acc)[0], 200)
+        self.assertEqual(request("GET", acc)[0], 404)
+        self.assertEqual(request("POST", "/transfers", {"src": 1, "dst": 2, "amount": 1})[0], 404)
+
+    def test_employees_and_bad_requests(self):
+        request = self.client.request
+        body = {"name": "bob", "password": "pw", "salary": 10, "position": "clerk"}
+        self.assertEqual(request("POST", "/employees", body)[0], 201)
+        self.assertEqual(request("POST", "/employees", body)[0], 409)
+        self.assertEqual(request("PATCH", "/employees/bob", {"salary": 20})[0], 200)
+        self.assertEqual(request("GET", "/employees")[1]["employees"],
+                         [{"name": "bob", "salary": 20, "position": "clerk"}])
+        self.assertEqual(request("DELETE", "/accounts")[0], 405)
+        self.assertEqual(request("POST", "/accounts", {"name": "x"})[0], 400)
+        self.assertEqual(request("GET", "/nowhere")[0], 404)
+        # the connection is still usable after errors with bodies
+        self.assertEqual(request("GET", "/summary")[0], 200)
+
+    def test_every_error_gets_an_answer(self):
+        request = self.client.request
+        for name in ("e1", "e2"):
+            request("POST", "/employees", {"name": name, "password": "pw", "salary": 1, "position": "p"})
+        self.assertEqual(request("PATCH", "/employees/e2", {"name": "e1"})[0], 409)
+        status, created = request("POST", "/accounts", {
+            "name": "ann", "age": 30, "address": "x", "balance": 1, "account_type": "s", "mobile_number": 5})
+        acc = "/accounts/%d" % created["acc_no"]
+        self.assertEqual(request("POST", acc + "/deposit", {"amount": 10 ** 30})[0], 400)
+        self.assertEqual(request("POST", acc + "/withdraw", {"amount": 5}),
+                         (409, {"error": "insufficient funds in account %d" % created["acc_no"]}))
+        self.assertEqual(request("POST", "/accounts/999/deposit", {"amount": 5}),
+                         (404, {"error": "no account 999"}))
+        self.assertEqual(request("PATCH", acc, {"age": "abc"})[0], 400)
+        self.assertEqual(request("PATCH", acc, {"age": "31"})[1]["age"], 31)
+        self.assertEqual(request("GET", "/accounts?limit=-1")[0], 400)
+        self.assertEqual(request("GET", acc + "/ledger?limit=0")[0], 400)
+        self.assertEqual(len(request("GET", "/accounts?limit=1")[1]["accounts"]), 1)
+
+    def test_load_generator_report(self):
+        accounts = loadtest.seed_accounts(self.host, self.port, 5)
+        report = loadtest.run_load(self.host, self.port, accounts, clients=3, requests=20)
+        self.assertEqual(report["total"]["requests"], 60)
+        self.assertEqual(report["total"]["errors"], 0)
+        self.assertLessEqual(report["total"]["p50_ms"], report["total"]["p99_ms"])
+        self.assertEqual(loadtest.percentile([1, 2, 3, 4], 50), 2)
+        self.assertEqual(loadtest.percentile(list(range(1, 101)), 99), 99)
+
+
+class FakeRoot:
+    # stands in for Tk: after() callbacks run when the test pumps them
+
+    def __init__(self):
+        self.scheduled = []
+        self.cursor = ""
+
+    def after(self, ms, callback):
+        self.scheduled.append(callback)
+
+    def config(self, cursor):
+        self.cursor = cursor
+
+    def pump(self, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while self.scheduled and time.monotonic() < deadline:
+            time.sleep(0.001)
+            self.scheduled.pop(0)()
+
+
+class FakeLabel:
+
+    def __init__(self):
+        self.text = ""
+
+    def config(self, text):
+        self.text = text
+
+
+class TestBackgroundRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.root = FakeRoot()
+        self.label = FakeLabel()
+        self.runner = BackgroundRunner(self.root, workers=2, poll_ms=1, indicator=self.label)
+
+    def tearDown(self):
+        self.runner.shutdown()
+
+    def test_work_off_thread_result_on_caller_thread(self):
+        seen = []
+        self.runner.submit(threading.get_ident, on_done=lambda worker: seen.append((worker, threading.get_ident())))
+        self.assertEqual((self.label.text, self.root.cursor), ("Loading...", "watch"))
+        self.root.pump()
+        [(worker, caller)] = seen
+        self.assertNotEqual(worker, caller)
+        self.assertEqual(caller, threading.get_ident())
+        self.assertEqual((self.label.text, self.root.cursor), ("", ""))
+        self.assertFalse(self.runner.busy())
+
+    def test_repeated_requests_are_coalesced(self):
+        release = threading.Event()
+        calls = []
+
+        def slow_query(acc_no):
+            calls.append(acc_no)
+            release.wait(5)
+            return acc_no
+
+        results = []
+        self.assertTrue(self.runner.submit(slow_query, 7, on_done=results.append))
+        self.assertFalse(self.runner.submit(slow_query, 7, on_done=results.append))
+        self.assertTrue(self.runner.submit(slow_query, 8, on_done=results.append))
+        release.set()
+        self.root.pump()
+        self.assertEqual(sorted(calls), [7, 8])
+        self.assertEqual(sorted(results), [7, 8])
+        self.assertTrue(self.runner.submit(slow_query, 7, on_done=results.append))
+        self.root.pump()
+        self.assertEqual(len(calls), 3)
+
+    def test_errors_reach_on_error(self):
+        errors = []
+        self.runner.submit(int, "x", on_done=self.fail, on_error=errors.append)
+        self.root.pump()
+        self.assertIsInstance(errors[0], ValueError)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+Transaction engine of the bank management system.
+
+Every posting runs inside BEGIN IMMEDIATE, which takes SQLite's write
+lock up front, and changes the balance with a single conditional UPDATE
+(balance = balance - ? ... and balance >= ?) instead of reading it into
+Python first. Two tellers posting to the same account therefore
+serialise on the lock and can neither lose an update nor overdraw it.
+Each posting also appends to the ledger table in the same transaction.
+"""
+
+from contextlib import contextmanager
+
+import dal
+
+
+class TransactionError(Exception):
+    pass
+
+
+class UnknownAccount(TransactionError):
+
+    def __init__(self, acc_no):
+        super().__init__("no account %s" % acc_no)
+        self.acc_no = acc_no
+
+
+class InsufficientFunds(TransactionError):
+
+    def __init__(self, acc_no):
+        super().__init__("insufficient funds in account %s" % acc_no)
+        self.acc_no = acc_no
+
+
+@contextmanager
+def immediate(conn):
+    """
+    BEGIN IMMEDIATE ... COMMIT, rolled back if the block raises. While
+    another connection holds the write lock, BEGIN waits up to the
+    connection's timeout.
+    """
+    conn.execute("begin immediate")
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+
+
+def _amount(amount):
+    amount = int(amount)
+    if amount <= 0:
+        raise ValueError("amount must be positive, got %d" % amount)
+    return amount
+
+
+def _credit(conn, acc_no, amount):
+    cur = conn.execute("update bank set balance = balance + ? where acc_no = ?", (amount, acc_no))
+    if cur.rowcount == 0:
+        raise UnknownAccount(acc_no)
+
+
+def _debit(conn, acc_no, amount):
+    cur = conn.execute(
+        "update bank set balance = balance - ? where acc_no = ? and balance >= ?",
+        (amount, acc_no, amount),
+    )
+    if cur.rowcount == 0:
+        if not dal.account_exists(conn, acc_no):
+            raise UnknownAccount(acc_no)
+        raise InsufficientFunds(acc_no)
+
+
+# add money to an account; returns the new balance
+def deposit(conn, acc_no, amount):
+    amount = _amount(amount)
+    with immediate(conn):
+        _credit(conn, acc_no, amount)
+        dal.add_ledger_entry(conn, acc_no, amount, "deposit")
+        return dal.get_balance(conn, acc_no)
+
+
+# take money from an account if it is covered; returns the new balance
+def withdraw(conn, acc_no, amount):
+    amount = _amount(amount)
+    with immediate(conn):
+        _debit(conn, acc_no, amount)
+        dal.add_ledger_entry(conn, acc_no, -amount, "withdrawal")
+        return dal.get_balance(conn, acc_no)
+
+
+# move money between two accounts; both sides commit or neither does
+def transfer(conn, src, dst, amount):
+    amount = _amount(amount)
+    if src == dst:
+        raise ValueError("cannot transfer to the same account")
+    with immediate(conn):
+        _debit(conn, src, amount)
+        _credit(conn, dst, amount)
+        dal.add_ledger_entry(conn, src, -amount, "transfer", dst)
+        dal.add_ledger_entry(conn, dst, amount, "transfer", src)
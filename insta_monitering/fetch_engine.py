@@ -0,0 +1,169 @@
+"""
+Asynchronous HTTP fetching for insta_monitering.
+
+FetchEngine replaces the requests.get calls that blocked the event loop
+and the proxy decorator that patched socket.socket for the whole
+process:
+
+* every proxy gets one aiohttp session with its own connection pool,
+  created on first use and shared by all requests through that proxy
+  (no proxies: one direct session);
+* the proxy list is read once, not on every request;
+* a semaphore bounds how many requests are in flight at once;
+* a failed request (connection error, timeout, 429 or 5xx) is retried
+  a bounded number of times with jittered exponential backoff;
+* every request has its own timeout.
+
+    async with FetchEngine(proxies=load_proxies()) as engine:
+        html = await engine.fetch_text(url)
+
+SOCKS5 proxies need the aiohttp-socks package.
+"""
+
+import asyncio
+import os
+import random
+import sys
+
+import aiohttp
+
+try:
+    from aiohttp_socks import ProxyConnector
+except ImportError:
+    ProxyConnector = None
+
+try:
+    import instagram_monitering.con_file as config
+except Exception:
+    import con_file as config
+
+USER_AGENT = "Mozilla/17.0"
+# answers worth another attempt; other 4xx fail at once
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+_proxy_lists = {}
+
+
+def load_proxies(filename=None):
+    """
+    Proxy hosts from a comma separated file (default: ipList.txt in the
+    working directory), read once per file. A missing file means no
+    proxies.
+    """
+    if filename is None:
+        filename = os.path.join(os.getcwd(), "ipList.txt")
+    if filename not in _proxy_lists:
+        try:
+            with open(filename, "r") as f:
+                hosts = [host.strip() for host in f.read().split(",")]
+        except OSError:
+            hosts = []
+        _proxy_lists[filename] = [host for host in hosts if host]
+    return _proxy_lists[filename]
+
+
+class FetchError(Exception):
+
+    def __init__(self, url, reason):
+        super().__init__(f"{url}: {reason}")
+        self.url = url
+        self.reason = reason
+
+
+class _Retry(Exception):
+    pass
+
+
+class FetchEngine():
+
+    def __init__(self, proxies=(), proxy_port=config.SOCKS5_PROXY_PORT, auth=config.auth,
+                 passcode=config.passcode, concurrency=20, timeout=10.0, retries=4,
+                 backoff=0.5, max_backoff=30.0, limit_per_proxy=10, headers=None):
+        """
+        proxies: SOCKS5 proxy hosts, one picked at random per attempt;
+        concurrency: most requests in flight; timeout: seconds per
+        attempt; retries: attempts after the first; backoff/max_backoff:
+        base and cap of the retry delay; limit_per_proxy: connection
+        pool size of each proxy's session.
+        """
+        if proxies and ProxyConnector is None:
+            raise ImportError("SOCKS5 proxies need the aiohttp-socks package")
+        self.proxies = list(proxies)
+        self.proxy_port = proxy_port
+        self.auth = auth
+        self.passcode = passcode
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.limit_per_proxy = limit_per_proxy
+        self.headers = headers or {"User-agent": USER_AGENT}
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._sessions = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def _session(self, proxy):
+        session = self._sessions.get(proxy)
+        if session is None:
+            if proxy is None:
+                connector = aiohttp.TCPConnector(limit=self.limit_per_proxy, ssl=False)
+            else:
+                credentials = f"{self.auth}:{self.passcode}@" if self.auth else ""
+                connector = ProxyConnector.from_url(
+                    f"socks5://{credentials}{proxy}:{self.proxy_port}",
+                    rdns=True, limit=self.limit_per_proxy, ssl=False,
+                )
+            session = aiohttp.ClientSession(connector=connector, headers=self.headers, timeout=self.timeout)
+            self._sessions[proxy] = session
+        return session
+
+    def backoff_delay(self, attempt):
+        # "full jitter": anywhere up to the exponential cap, so clients
+        # that failed together do not retry together
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    async def _attempt(self, url, timeout):
+        proxy = random.choice(self.proxies) if self.proxies else None
+        async with self._session(proxy).get(url, timeout=timeout) as response:
+            if response.status in RETRY_STATUSES:
+                raise _Retry(f"HTTP {response.status}")
+            if response.status >= 400:
+                raise FetchError(url, f"HTTP {response.status}")
+            return await response.text()
+
+    async def fetch_text(self, url, timeout=None):
+        """
+        Body of url as text; FetchError once every attempt failed.
+        timeout (seconds per attempt) overrides the engine's.
+        """
+        timeout = self.timeout if timeout is None else aiohttp.ClientTimeout(total=timeout)
+        reason = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                await asyncio.sleep(self.backoff_delay(attempt - 1))
+            try:
+                async with self._semaphore:
+                    return await self._attempt(url, timeout)
+            except _Retry as err:
+                reason = str(err)
+            except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as err:
+                reason = repr(err)
+            print(f"fetch {url} attempt {attempt + 1} failed: {reason}", file=sys.stderr)
+        raise FetchError(url, reason)
+
+    async def fetch_many(self, urls):
+        """
+        fetch_text for every url at once (bounded by the semaphore);
+        results in order, a FetchError in place of each failure.
+        """
+        return await asyncio.gather(*(self.fetch_text(url) for url in urls), return_exceptions=True)
+
+    async def close(self):
+        sessions, self._sessions = list(self._sessions.values()), {}
+        for session in sessions:
+            await session.close()
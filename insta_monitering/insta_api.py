@@ -1,53 +1,50 @@
-from concurrent.futures import ThreadPoolExecutor
-
 import tornado.ioloop
 import tornado.web
-from tornado.concurrent import run_on_executor
-from tornado.gen import coroutine
 
 # import file
 try:
     from instagram_monitering.insta_datafetcher import *
-    from instagram_monitering.subpinsta import *
+    from instagram_monitering.scheduler import DEFAULT_INTERVAL, WORKERS, Scheduler
 except:
     from insta_datafetcher import *
-    from subpinsta import *
-MAX_WORKERS = 10
+    from scheduler import DEFAULT_INTERVAL, WORKERS, Scheduler
 
 
-class StartHandlerinsta(tornado.web.RequestHandler):
-    executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+class SchedulerHandler(tornado.web.RequestHandler):
+    # every monitored target runs on the one Scheduler of the application
 
-    @run_on_executor
-    def background_task(self, user, tags, type, productId):
-        try:
-            instasubprocess(user=user, tags=tags, type=type, productId=productId)
-        except:
-            print("error::background_task>>", sys.exc_info()[1])
+    def initialize(self, scheduler):
+        self.scheduler = scheduler
 
-    @coroutine
-    def get(self):
+
+class StartHandlerinsta(SchedulerHandler):
+
+    async def get(self):
         try:
             q = self.get_argument("q")
             user = self.get_argument("userId")
             type = self.get_argument("type")
             productId = self.get_argument("productId")
+            interval = int(self.get_argument("interval", DEFAULT_INTERVAL))
         except:
             self.send_error(400)
+            return
         if " " in q:
             q = q.replace(" ", "")
-        self.background_task(user=user, tags=q, type=type, productId=productId)
+        target = await self.scheduler.start(user=user, tags=q, type=type, productId=productId, interval=interval)
         temp = {}
         temp["query"] = q
         temp["userId"] = user
         temp["status"] = True
         temp["productId"] = productId
+        temp["interval"] = target["interval"]
         print("{0}, {1}, {2}, {3}".format(temp["userId"], temp["productId"], temp["query"], temp["status"]))
         self.write(ujson.dumps(temp))
 
 
-class StopHandlerinsta(tornado.web.RequestHandler):
-    def get(self):
+class StopHandlerinsta(SchedulerHandler):
+
+    async def get(self):
         try:
             q = self.get_argument("q")
             user = self.get_argument("userId")
@@ -55,8 +52,8 @@ class StopHandlerinsta(tornado.web.RequestHandler):
             productId = self.get_argument("productId")
         except:
             self.send_error(400)
-        obj = InstaPorcessClass()
-        result = obj.deletProcess(tags=q, user=user, productId=productId)
+            return
+        result = await self.scheduler.stop(tags=q, user=user, productId=productId)
         temp = {}
         temp["query"] = q
         temp["userId"] = user
@@ -66,8 +63,9 @@ class StopHandlerinsta(tornado.web.RequestHandler):
         self.write(ujson.dumps(temp))
 
 
-class StatusHandlerinsta(tornado.web.RequestHandler):
-    def get(self):
+class StatusHandlerinsta(SchedulerHandler):
+
+    async def get(self):
         try:
             q = self.get_argument("q")
             user = self.get_argument("userId")
@@ -75,13 +73,16 @@ class StatusHandlerinsta(tornado.web.RequestHandler):
             # tags = self.get_argument("hashtags")
         except:
             self.send_error(400)
-        obj = InstaPorcessClass()
-        result = obj.statusCheck(tags=q, user=user, productId=productId)
+            return
+        result = await self.scheduler.status(tags=q, user=user, productId=productId)
         temp = {}
         temp["query"] = q
         temp["userId"] = user
-        temp["status"] = result
+        temp["status"] = result is not None
         temp["productId"] = productId
+        if result is not None:
+            # schedule details: interval, nextRun, lastRun, running
+            temp.update(result)
         print("{0}, {1}, {2}, {3}".format(temp["userId"], temp["productId"], temp["query"], temp["status"]))
         self.write(ujson.dumps(temp))
 
@@ -134,12 +135,18 @@ class SenderHandlerinstaGreater(tornado.web.RequestHandler):
 
 
 if __name__ == '__main__':
-    application = tornado.web.Application([(r"/instagram/monitoring/start", StartHandlerinsta),
-                                           (r"/instagram/monitoring/stop", StopHandlerinsta),
-                                           (r"/instagram/monitoring/status", StatusHandlerinsta),
+    scheduler = Scheduler(workers=WORKERS)
+    application = tornado.web.Application([(r"/instagram/monitoring/start", StartHandlerinsta, dict(scheduler=scheduler)),
+                                           (r"/instagram/monitoring/stop", StopHandlerinsta, dict(scheduler=scheduler)),
+                                           (r"/instagram/monitoring/status", StatusHandlerinsta, dict(scheduler=scheduler)),
                                            (r"/instagram/monitoring/less", SenderHandlerinstaLess),
                                            (r"/instagram/monitoring/greater", SenderHandlerinstaGreater), ])
 
     application.listen(7074)
+    # the scheduler's workers run on the server's own event loop
+    tornado.ioloop.IOLoop.current().spawn_callback(scheduler.run)
     print("server running")
-    tornado.ioloop.IOLoop.instance().start()
+    try:
+        tornado.ioloop.IOLoop.current().start()
+    finally:
+        scheduler.close()
@@ -2,53 +2,28 @@
 # if I forget the code structure
 # please pray to god for help
 import asyncio
-import multiprocessing
-import os
-import random
+import functools
 import re
-import socket
 import sys
 import time
 
 import bs4
 import pymongo
-import requests
-import socks
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 import ujson
-import urllib3
 
 try:
     import instagram_monitering.con_file as config
+    from instagram_monitering.fetch_engine import FetchEngine, FetchError, load_proxies
 except Exception as e:
     print(e)
     import con_file as config
+    from fetch_engine import FetchEngine, FetchError, load_proxies
 
-
-class PorxyApplyingDecorator(object):
-
-    def __init__(self):
-        filename = os.getcwd() + "/" + "ipList.txt"
-        with open(filename, "r") as f:
-            ipdata = f.read()
-        self._IP = random.choice(ipdata.split(","))
-
-    def __call__(self, function_to_call_for_appling_proxy):
-        SOCKS5_PROXY_HOST = self._IP
-        # default_socket = socket.socket
-        socks.set_default_proxy(socks.SOCKS5,
-                                SOCKS5_PROXY_HOST,
-                                config.SOCKS5_PROXY_PORT,
-                                True,
-                                config.auth,
-                                config.passcode)
-        socket.socket = socks.socksocket
-
-        def wrapper_function(url):
-            # this is used for applyting socks5 proxy over the request
-            return function_to_call_for_appling_proxy(url)
-
-        socks.set_default_proxy()
-        return wrapper_function
+# seconds per attempt: the tag/profile page is large, post pages are not
+PAGE_TIMEOUT = 24
+POST_TIMEOUT = 10
 
 
 async def dataprocess(htmldata):
@@ -74,36 +49,29 @@ async def dataprocess(htmldata):
     return maindict
 
 
-async def datapullpost(future, url):
-    while True:
-        @PorxyApplyingDecorator()
-        async def request_pull(url):
-            data = None
-            print(url)
-            urllib3.disable_warnings()
-            user_agent = {'User-agent': 'Mozilla/17.0'}
-            try:
-                data = requests.get(url=url, headers=user_agent, timeout=10, verify=False).text
-            except Exception as e:
-                print(e)
-                data = None
-            finally:
-                return data
-
-        data = await request_pull(url)
-        if data != None:
-            break
-    data = await dataprocess(htmldata=data)
-    # here processing of data has to occur
+async def datapullpost(future, url, engine):
+    # a post that cannot be fetched or parsed gets no owner/location data
+    # instead of being retried forever
+    try:
+        data = await engine.fetch_text(url, timeout=POST_TIMEOUT)
+        data = await dataprocess(htmldata=data)
+    except FetchError as err:
+        print(f"exception : {err}")
+        data = {}
+    except Exception as err:
+        print(f"exception : {err}")
+        print("error::datapullpost>>", sys.exc_info()[1])
+        data = {}
     future.set_result(data)
 
 
 class MoniteringClass():
 
-    def __init__(self, user, tags, type, productId):
-
+    def __init__(self, user, tags, type, productId, mon=None):
+        # mon: a shared MongoClient (the scheduler's), left open by __del__
+        self._owns_client = mon is None
         try:
-            self.mon = pymongo.MongoClient(host=config.host, port=config.mongoPort)
+            self.mon = mon or pymongo.MongoClient(host=config.host, port=config.mongoPort)
             db = self.mon[productId + ":" + user + ":insta"]
             self._collection = db[tags]
             if type == "hashtags":
@@ -113,10 +81,20 @@ class MoniteringClass():
         except Exception as err:
             print(f"exception {err}")
             print("error::MointeringClass.__init__>>", sys.exc_info()[1])
+        try:
+            # upserts look posts up by id; unique also stops duplicates
+            # when two cycles overlap (fails harmlessly on old collections
+            # that already hold duplicates)
+            self._collection.create_index("id", unique=True)
+        except Exception as err:
+            print(f"exception {err}")
+            print("error::MointeringClass.__init__>>", sys.exc_info()[1])
 
-    def _dataProcessing(self, data):
-        loop = asyncio.get_event_loop()
+    async def _dataProcessing(self, data, engine):
+        loop = asyncio.get_running_loop()
         userdata = []
+        media_post = []
+        top_post = []
         try:
             if not isinstance(data, dict):
                 raise Exception
@@ -124,7 +102,6 @@ class MoniteringClass():
             top_post = data['tag']["top_posts"]["nodes"]
             print("media post ::", len(media_post))
             print("top_post::", len(top_post))
-            futures = []
             for i in media_post:
                 tempdict = {}
                 tempdict["url"] = "https://www.instagram.com/p/" + i["code"] + "/"
@@ -136,10 +113,9 @@ class MoniteringClass():
                 tempdict["code"] = i["code"]
                 userdata.append(tempdict)
             for i in userdata:
-                i["future"] = asyncio.Future()
-                futures.append(i["future"])
-                asyncio.ensure_future(datapullpost(future=i["future"], url=i["url"]))
-            loop.run_until_complete(asyncio.wait(futures))
+                i["future"] = loop.create_future()
+            # the engine bounds how many of these are in flight at once
+            await asyncio.gather(*(datapullpost(future=i["future"], url=i["url"], engine=engine) for i in userdata))
             for i in userdata:
                 i["data"] = i["future"].result()
         except Exception as err:
@@ -152,78 +128,74 @@ class MoniteringClass():
             print("top post::", len(top_post))
             return userdata, media_post, top_post
 
-    def _insertFunction(self, record):
+    def _insertMany(self, records):
+        # one round trip for the whole cycle: a post is written only if no
+        # document with its id exists yet ($setOnInsert), as before
+        if not records:
+            return
         try:
-            records = self._collection.find({"id": record["id"]})
-            if records.count() == 0:
-                # record["timestamp"] = time.time()
-                self._collection.insert(record)
+            self._collection.bulk_write(
+                [UpdateOne({"id": record["id"]}, {"$setOnInsert": record}, upsert=True) for record in records],
+                ordered=False,
+            )
+        except BulkWriteError as err:
+            print(f"Execption : {err.details.get('writeErrors')}")
+            print("error::Monitering.insertMany>>", sys.exc_info()[1])
         except Exception as err:
             print(f"Execption : {err}")
-            print("error::Monitering.insertFunction>>", sys.exc_info()[1])
+            print("error::Monitering.insertMany>>", sys.exc_info()[1])
 
     def _lastProcess(self, userdata, media_post, top_post):
         mainlist = []
         try:
+            # code -> post; a code in both lists keeps its media_post entry
+            # and is written once
+            posts = {}
+            for post in media_post + top_post:
+                posts.setdefault(post["code"], post)
             for i in userdata:
-                for j in media_post:
-                    if i["code"] == j["code"]:
-                        tempdict = j.copy()
-                        tofind = ["owner", "location"]
-                        for z in tofind:
-                            try:
-                                tempdict[z + "data"] = i["data"][z]
-                            except Exception as e:
-                                print(f"exception : {e}")
-                                pass
-                        mainlist.append(tempdict)
-                        self._insertFunction(tempdict.copy())
-                for k in top_post:
-                    if i["code"] == k["code"]:
-                        tempdict = k.copy()
-                        tofind = ["owner", "location"]
-                        for z in tofind:
-                            try:
-                                tempdict[z + "data"] = i["data"][z]
-                            except Exception as err:
-                                print(f"Exception :{err}")
-                                pass
-                        mainlist.append(tempdict)
-                        self._insertFunction(tempdict.copy())
+                post = posts.pop(i["code"], None)
+                if post is None:
+                    continue
+                tempdict = post.copy()
+                tofind = ["owner", "location"]
+                for z in tofind:
+                    try:
+                        tempdict[z + "data"] = i["data"][z]
+                    except Exception as e:
+                        print(f"exception : {e}")
+                        pass
+                mainlist.append(tempdict)
+            self._insertMany([record.copy() for record in mainlist])
         except Exception as err:
             print(f"Exception : {err}")
             print("error::lastProcess>>", sys.exc_info()[1])
+        return mainlist
 
-    def request_data_from_instagram(self):
+    async def request_data_async(self, engine, executor=None):
         try:
-            while True:
-                @PorxyApplyingDecorator()
-                def reqest_pull(url):
-                    print(url)
-                    data = None
-                    urllib3.disable_warnings()
-                    user_agent = {'User-agent': 'Mozilla/17.0'}
-                    try:
-                        data = requests.get(url=url, headers=user_agent, timeout=24, verify=False).text
-                    except Exception as err:
-                        print(f"Exception : {err}")
-                        data = None
-                    finally:
-                        return data
-
-                data = reqest_pull(self._url)
-                if data != None:
-                    break
+            data = await engine.fetch_text(self._url, timeout=PAGE_TIMEOUT)
             datadict = ujson.loads(data)
-            userdata, media_post, top_post = self._dataProcessing(datadict)
-            finallydata = (self._lastProcess(userdata=userdata, media_post=media_post, top_post=top_post))
+            userdata, media_post, top_post = await self._dataProcessing(datadict, engine)
+            # the bulk write blocks: keep it off the event loop
+            loop = asyncio.get_running_loop()
+            finallydata = await loop.run_in_executor(executor, functools.partial(
+                self._lastProcess, userdata=userdata, media_post=media_post, top_post=top_post))
             # print(ujson.dumps(finallydata))
         except Exception as e:
             print(f"exception : {e}\n")
             print("error::Monitering.request_data_from_instagram>>", sys.exc_info()[1])
 
+    def request_data_from_instagram(self):
+        async def run():
+            async with FetchEngine(proxies=load_proxies()) as engine:
+                await self.request_data_async(engine)
+
+        asyncio.run(run())
+
     def __del__(self):
-        self.mon.close()
+        if self._owns_client:
+            self.mon.close()
 
 
 def hashtags(user, tags, type, productId):
@@ -235,52 +207,9 @@ def hashtags(user, tags, type, productId):
         print("error::hashtags>>", sys.exc_info()[1])
 
 
-class theradPorcess(multiprocessing.Process):
-
-    def __init__(self, user, tags, type, productId):
-        try:
-            multiprocessing.Process.__init__(self)
-            self.user = user
-            self.tags = tags
-            self.type = type
-            self.productId = productId
-        except Exception as err:
-            print(f"exception : {err}\n")
-            print("errorthreadPorcess:>>", sys.exc_info()[1])
-
-    def run(self):
-        try:
-            hashtags(user=self.user, tags=self.tags, type=self.type, productId=self.productId)
-        except Exception as err:
-            print(f"exception : {err}\n")
-            print("error::run>>", sys.exc_info()[1])
-
-
 class InstaPorcessClass():
 
-    def _dbProcessReader(self, user, tags, productId):
-        value = True
-        mon = pymongo.MongoClient(host=config.host, port=config.mongoPort)
-        try:
-            db = mon["insta_process"]
-            collection = db["process"]
-            temp = {}
-            temp["user"] = user
-            temp["tags"] = tags
-            temp["productId"] = productId
-            records = collection.find(temp).count()
-            if records == 0:
-                raise Exception
-            value = True
-        except Exception as err:
-            print(f"exception : {err}\n")
-            value = False
-            print("error::dbProcessReader:>>", sys.exc_info()[1])
-        finally:
-            mon.close()
-            return value
-
-    def _processstart(self, user, tags, productId):
+    def _processstart(self, user, tags, type, productId, interval):
         mon = pymongo.MongoClient(host=config.host, port=config.mongoPort)
         try:
             db = mon["insta_process"]
@@ -289,26 +218,21 @@ class InstaPorcessClass():
             temp["user"] = user
             temp["tags"] = tags
             temp["productId"] = productId
-            collection.insert(temp)
+            # one schedule entry per target, due at once
+            collection.update_one(temp, {"$set": {"type": type, "interval": interval, "next_run": time.time()}},
+                                  upsert=True)
         except Exception as err:
             print(f"execption : {err}\n")
             print("error::processstart>>", sys.exc_info()[1])
         finally:
             mon.close()
 
-    def startprocess(self, user, tags, type, productId):
+    def startprocess(self, user, tags, type, productId, interval=300):
+        # adds the target to the shared schedule (scheduler.py); a running
+        # scheduler picks it up on its next sync instead of a new process
+        # polling it
         try:
-            self._processstart(user=user, tags=tags, productId=productId)
-            while True:
-                # therad = theradPorcess(user=user, tags=tags, type=type)
-                # therad.start()
-                hashtags(user=user, tags=tags, type=type, productId=productId)
-                check = self._dbProcessReader(user=user, tags=tags, productId=productId)
-                print(check)
-                if check == False:
-                    break
-                time.sleep(300)
-                # therad.join()
+            self._processstart(user=user, tags=tags, type=type, productId=productId, interval=interval)
         except Exception as err:
             print(f"exception : {err}\n")
             print("error::startPoress::>>", sys.exc_info()[1])
@@ -435,7 +359,10 @@ def main():
         type = sys.argv[3]
         productId = sys.argv[4]
         obj = InstaPorcessClass()
+        # only registers the target: the one running scheduler
+        # (scheduler.py or insta_api.py) polls it, so it is never polled twice
         obj.startprocess(user=user, tags=tags, type=type, productId=productId)
+        print("scheduled", user, tags, productId)
     except Exception as err:
         print(f"exception : {err}")
         print("error::main>>", sys.exc_info()[1])
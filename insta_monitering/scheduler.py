@@ -0,0 +1,325 @@
+"""
+One scheduler for every monitored tag/profile.
+
+Monitoring used to cost a process per target, each with its own
+MongoClient and its own sleep loop. Here every target is an entry in a
+priority queue ordered by its next poll time. A dispatcher hands due
+targets to a fixed pool of async workers. The workers share one
+FetchEngine and one MongoClient. Blocking Mongo calls run on a thread
+pool, so the event loop (the Tornado one, in insta_api) keeps serving.
+
+The schedule lives in insta_process.process, the collection
+InstaPorcessClass already used. There is one document per
+(user, tags, productId) with its type, interval, next_run and last_run.
+A restarted scheduler resumes where it stopped. The collection is
+re-read every SYNC_INTERVAL seconds, so targets added or deleted by
+another process (InstaPorcessClass, the CLI) are picked up as well.
+
+    scheduler = Scheduler(workers=8)
+    await scheduler.run()                         # until cancelled
+    await scheduler.start("user", "python", "hashtags", "product", interval=600)
+"""
+
+import asyncio
+import functools
+import heapq
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pymongo
+
+try:
+    import instagram_monitering.con_file as config
+    from instagram_monitering.fetch_engine import FetchEngine, load_proxies
+    from instagram_monitering.insta_datafetcher import MoniteringClass
+except Exception as e:
+    print(e)
+    import con_file as config
+    from fetch_engine import FetchEngine, load_proxies
+    from insta_datafetcher import MoniteringClass
+
+WORKERS = 8
+# seconds between two polls of a target; the old per-process loop slept 300
+DEFAULT_INTERVAL = 300
+MIN_INTERVAL = 30
+# seconds between two reads of the schedule collection
+SYNC_INTERVAL = 30
+
+
+def target_key(user, tags, productId):
+    return (user, tags, productId)
+
+
+def _key_filter(key):
+    user, tags, productId = key
+    return {"user": user, "tags": tags, "productId": productId}
+
+
+def _schedule_fields(doc):
+    """
+    (type, interval, next_run) of a schedule document, next_run None
+    if it has none yet. ValueError or TypeError if a value is not a
+    number.
+    """
+    interval = doc.get("interval")
+    interval = DEFAULT_INTERVAL if interval in (None, "") else float(interval)
+    next_run = doc.get("next_run")
+    next_run = None if next_run in (None, "") else float(next_run)
+    return doc.get("type") or "hashtags", max(MIN_INTERVAL, interval), next_run
+
+
+class Scheduler():
+
+    def __init__(self, workers=WORKERS, collection=None, poll=None, sync_interval=SYNC_INTERVAL,
+                 engine_factory=None):
+        """
+        collection: schedule collection (default insta_process.process on
+        config.host); poll: coroutine function(target) run for each due
+        target (default: fetch and store its posts); engine_factory:
+        returns the FetchEngine shared by the workers.
+        """
+        self._owns_client = collection is None
+        if collection is None:
+            collection = pymongo.MongoClient(host=config.host, port=config.mongoPort)["insta_process"]["process"]
+        self.collection = collection
+        self.mon = collection.database.client
+        self.workers = workers
+        self.sync_interval = sync_interval
+        self._poll = poll or self._poll_instagram
+        self._engine_factory = engine_factory or (lambda: FetchEngine(proxies=load_proxies()))
+        self.engine = None
+        # (next_run, seq, key); entries whose next_run no longer matches
+        # the target's are stale and skipped
+        self._heap = []
+        self._seq = 0
+        self._targets = {}
+        self._running = set()
+        self._monitors = {}
+        self._due = None
+        self._wake = None
+        self._next_sync = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+
+    async def _db(self, function, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(function, *args, **kwargs))
+
+    # ----- schedule -----
+
+    def _push(self, target):
+        self._seq += 1
+        heapq.heappush(self._heap, (target["next_run"], self._seq, target["key"]))
+        if self._wake is not None:
+            self._wake.set()
+
+    def _add(self, key, type, interval, next_run, last_run=None):
+        target = self._targets.get(key)
+        if target is None:
+            target = self._targets[key] = {"key": key, "last_run": last_run}
+        target["type"] = type
+        target["interval"] = interval
+        target["next_run"] = next_run
+        if key not in self._running:
+            self._push(target)
+        return target
+
+    def _remove(self, key):
+        self._monitors.pop(key, None)
+        return self._targets.pop(key, None) is not None
+
+    async def sync(self):
+        """
+        Bring the in-memory schedule in line with the collection.
+        """
+        docs = await self._db(lambda: list(self.collection.find({}, {"_id": 0})))
+        now = time.time()
+        seen = set()
+        for doc in docs:
+            if not all(doc.get(name) for name in ("user", "tags", "productId")):
+                continue
+            key = target_key(doc["user"], doc["tags"], doc["productId"])
+            seen.add(key)
+            try:
+                type, interval, next_run = _schedule_fields(doc)
+            except (TypeError, ValueError) as err:
+                # one bad document must not stop the others from loading;
+                # a target already running keeps its settings
+                print(f"exception : {err}\n")
+                print("error::Scheduler.sync>> skipping", key)
+                continue
+            target = self._targets.get(key)
+            if target is None:
+                self._add(key, type, interval, next_run or now, doc.get("last_run"))
+            else:
+                target["type"] = type
+                target["interval"] = interval
+        for key in set(self._targets) - seen:
+            self._remove(key)
+        self._next_sync = time.monotonic() + self.sync_interval
+
+    async def start(self, user, tags, type, productId, interval=DEFAULT_INTERVAL):
+        """
+        Monitor a target (or change its type/interval); its first poll is
+        due at once.
+        """
+        key = target_key(user, tags, productId)
+        interval = max(MIN_INTERVAL, float(interval))
+        now = time.time()
+        await self._db(self.collection.update_one, _key_filter(key),
+                       {"$set": {"type": type, "interval": interval, "next_run": now}}, upsert=True)
+        return self._add(key, type, interval, now)
+
+    async def stop(self, user, tags, productId):
+        """
+        Stop monitoring a target; a poll in progress finishes but is not
+        rescheduled. False if it was not monitored.
+        """
+        key = target_key(user, tags, productId)
+        result = await self._db(self.collection.delete_many, _key_filter(key))
+        return self._remove(key) or result.deleted_count > 0
+
+    async def status(self, user, tags, productId):
+        """
+        Schedule entry of a target as a dict, or None if not monitored.
+        Targets not loaded yet (added by another process since the last
+        sync) are read from the collection.
+        """
+        key = target_key(user, tags, productId)
+        target = self._targets.get(key)
+        if target is not None:
+            return {"type": target["type"], "interval": target["interval"], "nextRun": target["next_run"],
+                    "lastRun": target["last_run"], "running": key in self._running}
+        doc = await self._db(self.collection.find_one, _key_filter(key), {"_id": 0})
+        if doc is None:
+            return None
+        try:
+            type, interval, next_run = _schedule_fields(doc)
+        except (TypeError, ValueError):
+            # sync() skips it too: it is never polled
+            return None
+        return {"type": type, "interval": interval, "nextRun": next_run,
+                "lastRun": doc.get("last_run"), "running": False}
+
+    def __len__(self):
+        return len(self._targets)
+
+    # ----- workers -----
+
+    async def _poll_instagram(self, target):
+        user, tags, productId = target["key"]
+        monitor = self._monitors.get(target["key"])
+        if monitor is None:
+            # the constructor creates the collection's index: blocking
+            monitor = await self._db(MoniteringClass, user=user, tags=tags, type=target["type"],
+                                     productId=productId, mon=self.mon)
+            self._monitors[target["key"]] = monitor
+        await monitor.request_data_async(self.engine, executor=self._executor)
+
+    async def _worker(self):
+        while True:
+            key = await self._due.get()
+            try:
+                target = self._targets.get(key)
+                if target is not None:
+                    await self._poll(target)
+                    await self._reschedule(key)
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                print(f"exception : {err}\n")
+                print("error::Scheduler.worker>>", sys.exc_info()[1])
+                await self._reschedule(key)
+            finally:
+                self._running.discard(key)
+                self._due.task_done()
+
+    async def _reschedule(self, key):
+        target = self._targets.get(key)
+        if target is None:
+            # stopped while it was being polled
+            return
+        now = time.time()
+        target["last_run"] = now
+        target["next_run"] = now + target["interval"]
+        self._running.discard(key)
+        self._push(target)
+        try:
+            await self._db(self.collection.update_one, _key_filter(key),
+                           {"$set": {"last_run": now, "next_run": target["next_run"]}})
+        except Exception as err:
+            print(f"exception : {err}\n")
+            print("error::Scheduler.reschedule>>", sys.exc_info()[1])
+
+    def _pop_due(self, now):
+        while self._heap and self._heap[0][0] <= now:
+            next_run, _, key = heapq.heappop(self._heap)
+            target = self._targets.get(key)
+            if target is None or target["next_run"] != next_run or key in self._running:
+                continue
+            self._running.add(key)
+            self._due.put_nowait(key)
+
+    async def _dispatch(self):
+        while True:
+            if time.monotonic() >= self._next_sync:
+                try:
+                    await self.sync()
+                except Exception as err:
+                    print(f"exception : {err}\n")
+                    print("error::Scheduler.sync>>", sys.exc_info()[1])
+                    self._next_sync = time.monotonic() + self.sync_interval
+            self._pop_due(time.time())
+            wait = self._next_sync - time.monotonic()
+            if self._heap:
+                wait = min(wait, self._heap[0][0] - time.time())
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), max(0, wait))
+            except asyncio.TimeoutError:
+                pass
+
+    async def run(self):
+        """
+        Poll targets as they come due until cancelled.
+        """
+        self._due = asyncio.Queue()
+        self._wake = asyncio.Event()
+        self.engine = self._engine_factory()
+        tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+        try:
+            await self._dispatch()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self.engine.close()
+            self._monitors.clear()
+
+    def close(self):
+        """
+        Release the thread pool and, unless it was passed in, the
+        MongoClient. Call once run() has returned.
+        """
+        self._executor.shutdown(wait=False)
+        if self._owns_client:
+            self.mon.close()
+
+
+def main(workers=WORKERS):
+    scheduler = None
+    try:
+        scheduler = Scheduler(workers=workers)
+        asyncio.run(scheduler.run())
+    except KeyboardInterrupt:
+        pass
+    except Exception as err:
+        print(f"exception : {err}")
+        print("error::main>>", sys.exc_info()[1])
+    finally:
+        if scheduler is not None:
+            scheduler.close()
+
+
+if __name__ == '__main__':
+    main(workers=int(sys.argv[1]) if len(sys.argv) > 1 else WORKERS)
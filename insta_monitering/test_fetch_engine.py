@@ -0,0 +1,124 @@
+#
+# Test the fetch engine against a local stub server
+# *************************************************
+#
+# Usage: python test_fetch_engine.py
+#
+
+
+import asyncio
+import os
+import tempfile
+import unittest
+
+try:
+    from aiohttp import web
+
+    import fetch_engine
+except ImportError:
+    web = None
+
+
+@unittest.skipIf(web is None, "needs aiohttp")
+class TestFetchEngine(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.hits = {}
+        self.in_flight = 0
+        self.most_in_flight = 0
+        app = web.Application()
+        app.router.add_get("/ok", self.ok)
+        app.router.add_get("/flaky", self.flaky)
+        app.router.add_get("/missing", self.missing)
+        app.router.add_get("/slow", self.slow)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base = "http://127.0.0.1:%d" % port
+
+    async def asyncTearDown(self):
+        await self.runner.cleanup()
+
+    def count(self, request):
+        self.hits[request.path] = self.hits.get(request.path, 0) + 1
+        return self.hits[request.path]
+
+    async def ok(self, request):
+        self.count(request)
+        self.in_flight += 1
+        self.most_in_flight = max(self.most_in_flight, self.in_flight)
+        await asyncio.sleep(0.02)
+        self.in_flight -= 1
+        return web.Response(text=request.headers.get("User-agent", ""))
+
+    async def flaky(self, request):
+        # two 503s, then an answer
+        if self.count(request) <= 2:
+            return web.Response(status=503)
+        return web.Response(text="finally")
+
+    async def missing(self, request):
+        self.count(request)
+        return web.Response(status=404)
+
+    async def slow(self, request):
+        self.count(request)
+        await asyncio.sleep(1)
+        return web.Response(text="late")
+
+    def engine(self, **kwargs):
+        kwargs.setdefault("backoff", 0.001)
+        return fetch_engine.FetchEngine(**kwargs)
+
+    async def test_one_session_and_bounded_concurrency(self):
+        async with self.engine(concurrency=3) as engine:
+            results = await engine.fetch_many([self.base + "/ok"] * 12)
+            self.assertEqual(len(engine._sessions), 1)
+        self.assertEqual(results, [fetch_engine.USER_AGENT] * 12)
+        self.assertEqual(self.hits["/ok"], 12)
+        self.assertLessEqual(self.most_in_flight, 3)
+        self.assertEqual(engine._sessions, {})
+
+    async def test_retries_server_errors(self):
+        async with self.engine(retries=3) as engine:
+            self.assertEqual(await engine.fetch_text(self.base + "/flaky"), "finally")
+        self.assertEqual(self.hits["/flaky"], 3)
+
+    async def test_gives_up_after_retries(self):
+        async with self.engine(retries=1) as engine:
+            with self.assertRaises(fetch_engine.FetchError):
+                await engine.fetch_text(self.base + "/slow", timeout=0.05)
+        self.assertEqual(self.hits["/slow"], 2)
+
+    async def test_client_errors_are_not_retried(self):
+        async with self.engine(retries=3) as engine:
+            results = await engine.fetch_many([self.base + "/missing", self.base + "/ok"])
+        self.assertIsInstance(results[0], fetch_engine.FetchError)
+        self.assertEqual(results[1], fetch_engine.USER_AGENT)
+        self.assertEqual(self.hits["/missing"], 1)
+
+    def test_backoff_is_jittered_and_capped(self):
+        engine = self.engine(backoff=1, max_backoff=5)
+        delays = [engine.backoff_delay(10) for _ in range(50)]
+        self.assertTrue(all(0 <= delay <= 5 for delay in delays))
+        self.assertGreater(len(set(delays)), 1)
+
+
+class TestProxyList(unittest.TestCase):
+
+    @unittest.skipIf(web is None, "needs aiohttp")
+    def test_read_once(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "ipList.txt")
+            with open(path, "w") as f:
+                f.write("10.0.0.1, 10.0.0.2,\n")
+            self.assertEqual(fetch_engine.load_proxies(path), ["10.0.0.1", "10.0.0.2"])
+            os.remove(path)
+            self.assertEqual(fetch_engine.load_proxies(path), ["10.0.0.1", "10.0.0.2"])
+        self.assertEqual(fetch_engine.load_proxies(os.path.join(tmp, "missing.txt")), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+#
+# Test how monitoring cycles store posts
+# **************************************
+#
+# Usage: python test_insta_datafetcher.py
+#
+
+
+import unittest
+
+try:
+    import mongomock
+
+    import insta_datafetcher
+except ImportError:
+    mongomock = None
+
+
+def post(code, id):
+    return {"id": id, "code": code, "likes": 1}
+
+
+@unittest.skipIf(mongomock is None, "needs mongomock and the insta_monitering requirements")
+class TestStorePosts(unittest.TestCase):
+
+    def setUp(self):
+        self.monitor = insta_datafetcher.MoniteringClass(
+            user="u", tags="python", type="hashtags", productId="p", mon=mongomock.MongoClient())
+        self.collection = self.monitor._collection
+
+    def cycle(self, media_post, top_post):
+        userdata = [{"code": p["code"], "data": {"owner": {"name": p["code"]}}} for p in media_post + top_post]
+        return self.monitor._lastProcess(userdata=userdata, media_post=media_post, top_post=top_post)
+
+    def test_one_document_per_post_across_cycles(self):
+        stored = self.cycle([post("a", 1), post("b", 2)], [post("a", 1)])
+        self.assertEqual([p["code"] for p in stored], ["a", "b"])
+        self.assertEqual(stored[0]["ownerdata"], {"name": "a"})
+        self.cycle([post("b", 2), post("c", 3)], [post("a", 1)])
+        self.assertEqual(sorted(doc["id"] for doc in self.collection.find()), [1, 2, 3])
+
+    def test_existing_documents_are_left_alone(self):
+        self.cycle([post("a", 1)], [])
+        changed = dict(post("a", 1), likes=99)
+        self.monitor._insertMany([changed, post("d", 4)])
+        self.assertEqual(self.collection.find_one({"id": 1})["likes"], 1)
+        self.assertEqual(self.collection.count_documents({}), 2)
+        self.monitor._insertMany([])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+#
+# Test the monitoring scheduler
+# *****************************
+#
+# Usage: python test_scheduler.py
+#
+
+
+import asyncio
+import time
+import unittest
+
+try:
+    import mongomock
+
+    import scheduler
+except ImportError:
+    mongomock = None
+
+
+class NoEngine:
+
+    async def close(self):
+        pass
+
+
+@unittest.skipIf(mongomock is None, "needs mongomock and the insta_monitering requirements")
+class TestScheduler(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.min_interval = scheduler.MIN_INTERVAL
+        scheduler.MIN_INTERVAL = 0
+        self.collection = mongomock.MongoClient()["insta_process"]["process"]
+        self.polled = []
+        self.in_flight = 0
+        self.most_in_flight = 0
+
+    async def asyncTearDown(self):
+        scheduler.MIN_INTERVAL = self.min_interval
+
+    async def poll(self, target):
+        self.polled.append(target["key"][1])
+        self.in_flight += 1
+        self.most_in_flight = max(self.most_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+
+    def scheduler(self, workers=2):
+        return scheduler.Scheduler(workers=workers, collection=self.collection, poll=self.poll,
+                                   engine_factory=NoEngine)
+
+    async def run_for(self, sched, seconds):
+        task = asyncio.ensure_future(sched.run())
+        await asyncio.sleep(seconds)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    async def test_targets_polled_by_their_own_interval(self):
+        sched = self.scheduler()
+        await sched.start("u", "fast", "hashtags", "p", interval=0.05)
+        await sched.start("u", "slow", "hashtags", "p", interval=10)
+        await self.run_for(sched, 0.3)
+        self.assertEqual(self.polled.count("slow"), 1)
+        self.assertGreaterEqual(self.polled.count("fast"), 3)
+        status = await sched.status("u", "slow", "p")
+        self.assertEqual(status["interval"], 10)
+        self.assertGreater(status["nextRun"], time.time() + 5)
+        self.assertFalse(status["running"])
+
+    async def test_workers_bound_concurrency(self):
+        sched = self.scheduler(workers=3)
+        for i in range(10):
+            await sched.start("u", "tag%d" % i, "hashtags", "p", interval=60)
+        await self.run_for(sched, 0.2)
+        self.assertEqual(sorted(self.polled), sorted("tag%d" % i for i in range(10)))
+        self.assertLessEqual(self.most_in_flight, 3)
+
+    async def test_stop_and_status(self):
+        sched = self.scheduler()
+        await sched.start("u", "tag", "profile", "p", interval=0.05)
+        self.assertEqual((await sched.status("u", "tag", "p"))["type"], "profile")
+        self.assertTrue(await sched.stop("u", "tag", "p"))
+        self.assertFalse(await sched.stop("u", "tag", "p"))
+        self.assertIsNone(await sched.status("u", "tag", "p"))
+        await self.run_for(sched, 0.1)
+        self.assertEqual(self.polled, [])
+        self.assertEqual(self.collection.count_documents({}), 0)
+
+    async def test_schedule_survives_a_restart(self):
+        sched = self.scheduler()
+        await sched.start("u", "tag", "hashtags", "p", interval=3600)
+        await self.run_for(sched, 0.1)
+        doc = self.collection.find_one({"tags": "tag"})
+        self.assertEqual(doc["interval"], 3600)
+        self.assertGreater(doc["next_run"], time.time() + 3000)
+        # a new scheduler picks the entry up without polling early, plus
+        # a target another process added
+        self.collection.insert_one({"user": "u", "tags": "other", "productId": "p"})
+        restarted = self.scheduler()
+        await self.run_for(restarted, 0.1)
+        self.assertEqual(self.polled, ["tag", "other"])
+        self.assertEqual(len(restarted), 2)
+        self.assertEqual((await restarted.status("u", "other", "p"))["interval"], scheduler.DEFAULT_INTERVAL)
+
+    async def test_malformed_documents_are_skipped(self):
+        self.collection.insert_one({"user": "u", "tags": "bad", "productId": "p", "interval": "often"})
+        self.collection.insert_one({"user": "u", "tags": "text", "productId": "p", "interval": "120"})
+        self.collection.insert_one({"user": "u", "tags": "good", "productId": "p", "interval": 60})
+        sched = self.scheduler()
+        await sched.sync()
+        self.assertIsNone(await sched.status("u", "bad", "p"))
+        self.assertEqual((await sched.status("u", "text", "p"))["interval"], 120)
+        self.assertEqual((await sched.status("u", "good", "p"))["interval"], 60)
+        # a running target keeps its settings when its document goes bad
+        self.collection.update_one({"tags": "good"}, {"$set": {"interval": "never"}})
+        await sched.sync()
+        self.assertEqual((await sched.status("u", "good", "p"))["interval"], 60)
+        sched.close()
+
+    async def test_status_of_targets_not_synced_yet(self):
+        sched = self.scheduler()
+        await sched.sync()
+        # registered by the CLI or another process after the sync
+        self.collection.insert_one({"user": "u", "tags": "cli", "productId": "p", "type": "profile",
+                                    "interval": 120, "next_run": 5})
+        self.collection.insert_one({"user": "u", "tags": "bad", "productId": "p", "interval": "often"})
+        self.assertEqual(len(sched), 0)
+        self.assertEqual(await sched.status("u", "cli", "p"), {
+            "type": "profile", "interval": 120, "nextRun": 5, "lastRun": None, "running": False})
+        self.assertIsNone(await sched.status("u", "bad", "p"))
+        self.assertIsNone(await sched.status("u", "missing", "p"))
+        sched.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
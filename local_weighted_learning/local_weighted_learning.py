@@ -1,10 +1,12 @@
 # Required imports to run this file
+from concurrent.futures import ProcessPoolExecutor
+
 import matplotlib.pyplot as plt
 import numpy as np
 
 
 # weighted matrix
-def weighted_matrix(point: np.mat, training_data_x: np.mat, bandwidth: float) -> np.mat:
+def weighted_matrix(point: np.matrix, training_data_x: np.matrix, bandwidth: float) -> np.matrix:
     """
     Calculate the weight for every point in the
     data set. It takes training_point , query_point, and tau
@@ -16,31 +18,32 @@ def weighted_matrix(point: np.mat, training_data_x: np.mat, bandwidth: float) ->
     # m is the number of training samples
     m, n = np.shape(training_data_x)
     # Initializing weights as identity matrix
-    weights = np.mat(np.eye((m)))
+    weights = np.asmatrix(np.eye((m)))
     # calculating weights for all training examples [x(i)'s]
     for j in range(m):
-        diff = point - training_data[j]
-        weights[j, j] = np.exp(diff * diff.T / (-2.0 * bandwidth ** 2))
+        diff = point - training_data_x[j]
+        # .item(): NumPy 2 no longer stores a 1x1 matrix into one element
+        weights[j, j] = np.exp((diff * diff.T).item() / (-2.0 * bandwidth ** 2))
     return weights
 
 
 def local_weight(
-    point: np.mat, training_data_x: np.mat, training_data_y: np.mat, bandwidth: float
-) -> np.mat:
+    point: np.matrix, training_data_x: np.matrix, training_data_y: np.matrix, bandwidth: float
+) -> np.matrix:
     """
     Calculate the local weights using the weight_matrix function on training data.
     Return the weighted matrix.
     """
     weight = weighted_matrix(point, training_data_x, bandwidth)
-    W = (training_data.T * (weight * training_data)).I * (
-        training_data.T * weight * training_data_y.T
+    W = (training_data_x.T * (weight * training_data_x)).I * (
+        training_data_x.T * weight * training_data_y.T
     )
     return W
 
 
 def local_weight_regression(
-    training_data_x: np.mat, training_data_y: np.mat, bandwidth: float
-) -> np.mat:
+    training_data_x: np.matrix, training_data_y: np.matrix, bandwidth: float
+) -> np.matrix:
     """
     Calculate predictions for each data point on axis.
     """
@@ -48,14 +51,14 @@ def local_weight_regression(
     ypred = np.zeros(m)
 
     for i, item in enumerate(training_data_x):
-        ypred[i] = item * local_weight(
+        ypred[i] = (item * local_weight(
             item, training_data_x, training_data_y, bandwidth
-        )
+        )).item()
 
     return ypred
 
 
-def load_data(dataset_name: str, cola_name: str, colb_name: str) -> np.mat:
+def load_data(dataset_name: str, cola_name: str, colb_name: str) -> np.matrix:
     """
     Function used for loading data from the seaborn splitting into x and y points
     """
@@ -65,8 +68,8 @@ def load_data(dataset_name: str, cola_name: str, colb_name: str) -> np.mat:
     col_a = np.array(data[cola_name])  # total_bill
     col_b = np.array(data[colb_name])  # tip
 
-    mcol_a = np.mat(col_a)
-    mcol_b = np.mat(col_b)
+    mcol_a = np.asmatrix(col_a)
+    mcol_b = np.asmatrix(col_b)
 
     m = np.shape(mcol_b)[1]
     one = np.ones((1, m), dtype=int)
@@ -77,7 +80,7 @@ def load_data(dataset_name: str, cola_name: str, colb_name: str) -> np.mat:
     return training_data, mcol_b, col_a, col_b
 
 
-def get_preds(training_data: np.mat, mcol_b: np.mat, tau: float) -> np.ndarray:
+def get_preds(training_data: np.matrix, mcol_b: np.matrix, tau: float) -> np.ndarray:
     """
     Get predictions with minimum error for each training data
     """
@@ -86,7 +89,7 @@ def get_preds(training_data: np.mat, mcol_b: np.mat, tau: float) -> np.ndarray:
 
 
 def plot_preds(
-    training_data: np.mat,
+    training_data: np.matrix,
     predictions: np.ndarray,
     col_x: np.ndarray,
     col_y: np.ndarray,
@@ -111,6 +114,195 @@ def plot_preds(
     plt.show()
 
 
+def pairwise_sq_dists(query_x: np.ndarray, training_x: np.ndarray) -> np.ndarray:
+    """
+    Squared euclidean distance between every query row and every training row.
+    The result does not depend on tau, so it is computed once and shared by
+    every candidate bandwidth.
+    """
+    query_x = np.asarray(query_x, dtype=float)
+    training_x = np.asarray(training_x, dtype=float)
+    sq = (
+        np.sum(query_x ** 2, axis=1)[:, None]
+        + np.sum(training_x ** 2, axis=1)[None, :]
+        - 2.0 * query_x @ training_x.T
+    )
+    # rounding can leave tiny negatives where points coincide
+    return np.maximum(sq, 0.0)
+
+
+def _weighted_moments(
+    weights: np.ndarray, training_x: np.ndarray, training_y: np.ndarray
+) -> tuple:
+    """
+    Sufficient statistics X^T W X and X^T W y for every query row at once.
+    weights has one row per query point.
+    """
+    xtwx = np.einsum("qm,mi,mj->qij", weights, training_x, training_x)
+    xtwy = np.einsum("qm,mi,m->qi", weights, training_x, training_y)
+    return xtwx, xtwy
+
+
+def _solve_predictions(
+    query_x: np.ndarray, xtwx: np.ndarray, xtwy: np.ndarray
+) -> np.ndarray:
+    """
+    Solve the per-query normal equations and evaluate theta^T x.
+    The pseudo-inverse keeps tiny bandwidths (near singular systems) finite.
+    """
+    theta = np.einsum("qij,qj->qi", np.linalg.pinv(xtwx), xtwy)
+    return np.einsum("qi,qi->q", query_x, theta)
+
+
+def predict_from_sq_dists(
+    sq_dists: np.ndarray,
+    query_x: np.ndarray,
+    training_x: np.ndarray,
+    training_y: np.ndarray,
+    tau: float,
+    leave_one_out: bool = False,
+) -> np.ndarray:
+    """
+    Vectorised local weighted regression using precomputed squared distances.
+    With leave_one_out the query rows are the training rows and each point
+    gets zero weight in its own fit, which gives a cross-validation estimate.
+    """
+    weights = np.exp(sq_dists / (-2.0 * tau ** 2))
+    if leave_one_out:
+        np.fill_diagonal(weights, 0.0)
+    xtwx, xtwy = _weighted_moments(weights, training_x, training_y)
+    return _solve_predictions(query_x, xtwx, xtwy)
+
+
+# state shared with cross-validation workers, set once per process
+_CV_STATE = {}
+
+
+def _init_cv_worker(
+    sq_dists: np.ndarray, training_x: np.ndarray, training_y: np.ndarray
+) -> None:
+    _CV_STATE["sq_dists"] = sq_dists
+    _CV_STATE["training_x"] = training_x
+    _CV_STATE["training_y"] = training_y
+
+
+def _cv_error(tau: float) -> float:
+    """
+    Leave-one-out mean squared error for one candidate bandwidth.
+    """
+    training_x = _CV_STATE["training_x"]
+    training_y = _CV_STATE["training_y"]
+    preds = predict_from_sq_dists(
+        _CV_STATE["sq_dists"], training_x, training_x, training_y, tau, True
+    )
+    return float(np.mean((preds - training_y) ** 2))
+
+
+def select_tau(
+    training_data_x: np.ndarray,
+    training_data_y: np.ndarray,
+    taus: list,
+    workers: int = None,
+) -> tuple:
+    """
+    Pick the bandwidth with the lowest leave-one-out error.
+    Pairwise squared distances are computed once and reused for every tau;
+    candidates are spread over a process pool when workers > 1.
+    Returns (error curve as an array aligned with taus, best tau).
+    """
+    if len(taus) == 0:
+        raise ValueError("taus must not be empty")
+    training_x = np.asarray(training_data_x, dtype=float)
+    training_y = np.asarray(training_data_y, dtype=float).ravel()
+    sq_dists = pairwise_sq_dists(training_x, training_x)
+    state = (sq_dists, training_x, training_y)
+
+    if workers is not None and workers > 1 and len(taus) > 1:
+        # the arrays travel to each worker once, not once per candidate
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_cv_worker, initargs=state
+        ) as pool:
+            errors = list(pool.map(_cv_error, taus))
+    else:
+        _init_cv_worker(*state)
+        errors = [_cv_error(tau) for tau in taus]
+
+    errors = np.array(errors)
+    return errors, taus[int(np.argmin(errors))]
+
+
+class StreamingLWR:
+    """
+    Local weighted regression for a fixed tau that keeps predictions current
+    as training rows are appended.
+
+    Every query point keeps its running X^T W X and X^T W y; appending k rows
+    only adds their weighted contributions, so an update costs O(q * k)
+    kernel evaluations instead of refitting against the whole training set.
+    """
+
+    def __init__(
+        self,
+        training_data_x: np.ndarray,
+        training_data_y: np.ndarray,
+        tau: float,
+        query_x: np.ndarray = None,
+    ) -> None:
+        self.tau = tau
+        self.training_x = np.asarray(training_data_x, dtype=float)
+        self.training_y = np.asarray(training_data_y, dtype=float).ravel()
+        # by default predict at the training points, like get_preds
+        self.query_x = (
+            self.training_x.copy()
+            if query_x is None
+            else np.asarray(query_x, dtype=float)
+        )
+        self._xtwx, self._xtwy = self._moments(
+            self.query_x, self.training_x, self.training_y
+        )
+
+    def _moments(
+        self, query_x: np.ndarray, training_x: np.ndarray, training_y: np.ndarray
+    ) -> tuple:
+        sq_dists = pairwise_sq_dists(query_x, training_x)
+        weights = np.exp(sq_dists / (-2.0 * self.tau ** 2))
+        return _weighted_moments(weights, training_x, training_y)
+
+    def append(
+        self,
+        new_x: np.ndarray,
+        new_y: np.ndarray,
+        add_as_queries: bool = False,
+    ) -> np.ndarray:
+        """
+        Add training rows and return the updated predictions.
+        With add_as_queries the new rows are also predicted, as get_preds
+        would do for the enlarged training set.
+        """
+        new_x = np.asarray(new_x, dtype=float).reshape(-1, self.training_x.shape[1])
+        new_y = np.asarray(new_y, dtype=float).ravel()
+
+        xtwx, xtwy = self._moments(self.query_x, new_x, new_y)
+        self._xtwx += xtwx
+        self._xtwy += xtwy
+        self.training_x = np.vstack((self.training_x, new_x))
+        self.training_y = np.concatenate((self.training_y, new_y))
+
+        if add_as_queries:
+            xtwx, xtwy = self._moments(new_x, self.training_x, self.training_y)
+            self._xtwx = np.concatenate((self._xtwx, xtwx))
+            self._xtwy = np.concatenate((self._xtwy, xtwy))
+            self.query_x = np.vstack((self.query_x, new_x))
+
+        return self.predictions()
+
+    def predictions(self) -> np.ndarray:
+        """
+        Current predictions for every query point.
+        """
+        return _solve_predictions(self.query_x, self._xtwx, self._xtwy)
+
+
 if __name__ == "__main__":
     training_data, mcol_b, col_a, col_b = load_data("tips", "total_bill", "tip")
     predictions = get_preds(training_data, mcol_b, 0.5)
@@ -0,0 +1,97 @@
+#
+# Test local weighted regression
+# ******************************
+#
+# Usage: python test_local_weighted_learning.py
+#
+
+
+import unittest
+import warnings
+
+import numpy as np
+
+import local_weighted_learning as lwl
+
+
+def make_data(m, seed=0):
+    # a bias column and one feature, as load_data builds them
+    rng = np.random.default_rng(seed)
+    x = rng.uniform(0, 10, m)
+    y = np.sin(x) + 0.3 * x + rng.normal(0, 0.1, m)
+    return np.column_stack((np.ones(m), x)), y
+
+
+class TestLocalWeightedRegression(unittest.TestCase):
+
+    def setUp(self):
+        # the loop version is written against np.matrix
+        catcher = warnings.catch_warnings()
+        catcher.__enter__()
+        self.addCleanup(catcher.__exit__, None, None, None)
+        warnings.simplefilter("ignore", PendingDeprecationWarning)
+        self.x, self.y = make_data(40)
+
+    def test_pairwise_sq_dists(self):
+        query = np.vstack((self.x[:5], self.x[:1]))
+        dists = lwl.pairwise_sq_dists(query, self.x)
+        expected = [[np.sum((q - t) ** 2) for t in self.x] for q in query]
+        np.testing.assert_allclose(dists, expected, atol=1e-9)
+        self.assertTrue((dists >= 0).all())
+        self.assertEqual(dists[5, 0], 0.0)
+
+    def test_vectorised_matches_loop(self):
+        for tau in (0.3, 1.0, 5.0):
+            with self.subTest(tau=tau):
+                expected = lwl.get_preds(np.asmatrix(self.x), np.asmatrix(self.y), tau)
+                preds = lwl.predict_from_sq_dists(
+                    lwl.pairwise_sq_dists(self.x, self.x), self.x, self.x, self.y, tau)
+                np.testing.assert_allclose(preds, expected, rtol=1e-6)
+
+    def test_select_tau_leave_one_out(self):
+        taus = [0.2, 0.5, 1.0, 3.0, 10.0]
+        errors, best = lwl.select_tau(self.x, self.y, taus)
+        # leave-one-out by hand: refit without each point in turn
+        expected = []
+        for tau in taus:
+            squared = []
+            for i in range(len(self.y)):
+                keep = np.arange(len(self.y)) != i
+                query = self.x[i:i + 1]
+                pred = lwl.predict_from_sq_dists(
+                    lwl.pairwise_sq_dists(query, self.x[keep]), query, self.x[keep], self.y[keep], tau)
+                squared.append((pred[0] - self.y[i]) ** 2)
+            expected.append(np.mean(squared))
+        np.testing.assert_allclose(errors, expected, rtol=1e-6)
+        self.assertEqual(best, taus[int(np.argmin(expected))])
+
+    def test_select_tau_process_pool(self):
+        taus = [0.2, 0.5, 1.0, 3.0]
+        serial = lwl.select_tau(self.x, self.y, taus)
+        parallel = lwl.select_tau(self.x, self.y, taus, workers=2)
+        np.testing.assert_allclose(parallel[0], serial[0])
+        self.assertEqual(parallel[1], serial[1])
+
+    def test_select_tau_needs_candidates(self):
+        with self.assertRaisesRegex(ValueError, "taus must not be empty"):
+            lwl.select_tau(self.x, self.y, [])
+
+    def test_streaming_matches_batch(self):
+        tau = 0.8
+        stream = lwl.StreamingLWR(self.x[:20], self.y[:20], tau)
+        stream.append(self.x[20:30], self.y[20:30])
+        preds = stream.append(self.x[30:], self.y[30:])
+        # the queries are still the first 20 points
+        expected = lwl.predict_from_sq_dists(
+            lwl.pairwise_sq_dists(self.x[:20], self.x), self.x[:20], self.x, self.y, tau)
+        np.testing.assert_allclose(preds, expected, rtol=1e-6)
+
+        stream = lwl.StreamingLWR(self.x[:20], self.y[:20], tau)
+        for start in range(20, 40, 5):
+            preds = stream.append(self.x[start:start + 5], self.y[start:start + 5], add_as_queries=True)
+        expected = lwl.get_preds(np.asmatrix(self.x), np.asmatrix(self.y), tau)
+        np.testing.assert_allclose(preds, expected, rtol=1e-6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,6 +7,8 @@
 
 import sqlite3
 
+import notes_db
+
 try:
     from Tkinter import *
 except ImportError:
@@ -27,27 +29,34 @@ connection = sqlite3.connect("data.db")
 # creates a cursor (pointer) to the data base
 cursor = connection.cursor()
 
+# databases created before the search index get it on start-up
+if notes_db.notes_table_exists(connection):
+    notes_db.create_schema(connection)
+
 search = False
 
-results = []
+# the current search (a notes_db.ResultCursor): ranked note ids, with
+# the text of a note read only when it is shown
+results = None
 
-index = 0
 
+def show_result(row):
+    if row is not None:
+        w.outputNotice.delete(1.0, END)
+        w.outputNotice.insert(1.0, row[2])
+    return row
 
-def delete_button(p1):
-    global index
-    global results
-    global cursor
 
+def delete_button(p1):
     # fetch id of the current note
-    id = results[index][0]
-
-    sql_command = """ DELETE FROM notes WHERE id = {0}; """
-    sql_command = sql_command.format(id)
+    if results is None:
+        return
+    row = results.current()
+    if row is None:
+        return
 
-    cursor.execute(sql_command)
-
-    connection.commit()
+    notes_db.delete_note(connection, row[0])
+    results.discard(row[0])
 
 
 def create_button(p1):
@@ -56,17 +65,11 @@ def create_button(p1):
     """
     global cursor
 
-    sql_command = """
-    CREATE TABLE notes ( 
-    id INTEGER PRIMARY KEY, 
-    title TEXT, 
-    note TEXT);"""
-
-    try:
-        cursor.execute(sql_command)
-        w.errorOutput.configure(text="")
-    except:
+    if notes_db.notes_table_exists(connection):
         w.errorOutput.configure(text="The database already exists")
+    else:
+        notes_db.create_schema(connection)
+        w.errorOutput.configure(text="")
 
 
 def add_button(p1):
@@ -77,24 +80,17 @@ def add_button(p1):
         w.errorOutput.configure(text="")
         title = w.inputTitle.get()
         note = w.inputNotice.get(1.0, END)
-        sql_command = """INSERT INTO notes (title,note) VALUES ("{0}","{1}"); """
-        sql_command = sql_command.format(title, note)
-        cursor.execute(sql_command)
-        connection.commit()
+        notes_db.add_note(connection, title, note)
     else:
         w.errorOutput.configure(text="Please fill the fields. ")
 
 
 def back_button(p1):
-    global search
     global results
-    global index
 
     w.errorOutput.configure(text="")
-    index -= 1
-    if (index >= 0 and index < len(results)):
-        w.outputNotice.delete(1.0, END)
-        w.outputNotice.insert(1.0, results[index][2])
+    if results is not None:
+        show_result(results.back())
 
 
 def clear_button(p1):
@@ -114,32 +110,25 @@ def exit_button(p1):
 
 
 def search_button(p1):
-    global cursor
     global results
-    global index
     w.errorOutput.configure(text="")
-    sql_command = """ SELECT * FROM notes WHERE title LIKE "%{0}%";"""
-    sql_command = sql_command.format(w.inputSearchTitle.get())
-    try:
-        cursor.execute(sql_command)
-        results = cursor.fetchall()
-        w.errorOutput.configure(text=str(len(results)) + " results")
-        index = 0
-        if (index >= 0 and index < len(results)):
-            w.outputNotice.delete(1.0, END)
-            w.outputNotice.insert(1.0, results[index][2])
-    except:
+    if not notes_db.notes_table_exists(connection):
         w.errorOutput.configure(text="Please create at first a database.")
+        return
+    # ranked full-text matches on title and note
+    results = notes_db.ResultCursor(connection, w.inputSearchTitle.get())
+    row = show_result(results.current())
+    if row is None:
+        w.errorOutput.configure(text="0 results")
+    else:
+        w.errorOutput.configure(text=str(len(results)) + " results: " + row[3])
 
 
 def next_button(p1):
     global results
-    global index
-    index += 1
     if (len(w.inputSearchTitle.get()) > 0):
-        if (index >= 0 and index < len(results)):
-            w.outputNotice.delete(1.0, END)
-            w.outputNotice.insert(1.0, results[index][2])
+        if results is not None:
+            show_result(results.next())
 
     else:
         w.errorOutput.configure(text="Please fill the search field. ")
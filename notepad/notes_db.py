@@ -0,0 +1,267 @@
+"""
+Storage and search of the notepad notes.
+
+Notes live in the `notes` table. notes_fts is an FTS5 index over their
+title and text, with notes as its external content (the text is not
+stored twice). Triggers keep the index in step with every insert,
+update and delete. A search is then an index lookup ranked by bm25,
+with a highlighted snippet, instead of a LIKE '%...%' scan over every
+title.
+
+A ResultCursor walks the matches of one search without holding them
+all: only the ranked ids are read up front, and note rows are loaded
+when shown.
+
+SQLite builds without FTS5 fall back to a parameterised LIKE over
+title and note.
+"""
+
+import re
+import sqlite3
+from collections import OrderedDict
+
+NOTES_TABLE = "create table if not exists notes (id integer primary key, title text, note text)"
+
+FTS_TABLE = (
+    "create virtual table if not exists notes_fts using fts5("
+    " title, note, content='notes', content_rowid='id',"
+    " tokenize='unicode61 remove_diacritics 2')"
+)
+
+FTS_TRIGGERS = (
+    "create trigger if not exists notes_fts_insert after insert on notes begin"
+    " insert into notes_fts (rowid, title, note) values (new.id, new.title, new.note); end",
+    "create trigger if not exists notes_fts_delete after delete on notes begin"
+    " insert into notes_fts (notes_fts, rowid, title, note) values ('delete', old.id, old.title, old.note); end",
+    "create trigger if not exists notes_fts_update after update on notes begin"
+    " insert into notes_fts (notes_fts, rowid, title, note) values ('delete', old.id, old.title, old.note);"
+    " insert into notes_fts (rowid, title, note) values (new.id, new.title, new.note); end",
+)
+
+# title matches weigh more than matches in the text
+TITLE_WEIGHT = 10.0
+NOTE_WEIGHT = 1.0
+# ids per existence query when skipping notes deleted since a search
+EXISTS_BATCH = 500
+
+
+def fts5_available(conn):
+    try:
+        conn.execute("create virtual table temp.fts5_probe using fts5(x)")
+    except sqlite3.OperationalError:
+        return False
+    conn.execute("drop table temp.fts5_probe")
+    return True
+
+
+def has_fts(conn):
+    return conn.execute(
+        "select exists(select 1 from sqlite_master where name = 'notes_fts')"
+    ).fetchone()[0] == 1
+
+
+def create_schema(conn):
+    """
+    Create the notes table and, where FTS5 is available, its index.
+    Safe on an existing database: an index added to old notes is built
+    from them once.
+    """
+    with conn:
+        conn.execute(NOTES_TABLE)
+        if fts5_available(conn) and not has_fts(conn):
+            conn.execute(FTS_TABLE)
+            for trigger in FTS_TRIGGERS:
+                conn.execute(trigger)
+            conn.execute("insert into notes_fts (notes_fts) values ('rebuild')")
+
+
+def notes_table_exists(conn):
+    return conn.execute(
+        "select exists(select 1 from sqlite_master where type = 'table' and name = 'notes')"
+    ).fetchone()[0] == 1
+
+
+def add_note(conn, title, note):
+    with conn:
+        return conn.execute("insert into notes (title, note) values (?, ?)", (title, note)).lastrowid
+
+
+def note_exists(conn, note_id):
+    return conn.execute("select exists(select 1 from notes where id = ?)", (note_id,)).fetchone()[0] == 1
+
+
+def existing_ids(conn, ids):
+    """
+    The subset of ids still in the table, as a set.
+    """
+    marks = ", ".join("?" * len(ids))
+    return {row[0] for row in conn.execute("select id from notes where id in (%s)" % marks, list(ids))}
+
+
+def delete_note(conn, note_id):
+    with conn:
+        conn.execute("delete from notes where id = ?", (note_id,))
+
+
+def match_query(text):
+    """
+    User input -> FTS5 query: every word must start a word of the note
+    (so "meet ag" finds "meeting agenda"). Words are quoted, so FTS
+    syntax in the input (AND, NEAR, quotes, *) is searched for, not
+    interpreted. None when the input has no words.
+    """
+    words = re.findall(r"\w+", text)
+    if not words:
+        return None
+    return " ".join('"%s"*' % word for word in words)
+
+
+def _like_pattern(text):
+    # fallback without FTS5: text anywhere, % and _ taken literally
+    return "%" + text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+def search_ids(conn, text):
+    """
+    Ids of all notes matching text, best first. Reads no note text.
+    An empty search lists every note by id, to browse them; other input
+    without words matches nothing, with or without FTS5.
+    """
+    if not text.strip():
+        return [row[0] for row in conn.execute("select id from notes order by id")]
+    query = match_query(text)
+    if query is None:
+        return []
+    if has_fts(conn):
+        rows = conn.execute(
+            "select rowid from notes_fts where notes_fts match ? order by bm25(notes_fts, ?, ?), rowid",
+            (query, TITLE_WEIGHT, NOTE_WEIGHT),
+        )
+    else:
+        rows = conn.execute(
+            "select id from notes where title like ?1 escape '\\' or note like ?1 escape '\\'"
+            " order by title like ?1 escape '\\' desc, id",
+            (_like_pattern(text),),
+        )
+    return [row[0] for row in rows]
+
+
+def load_notes(conn, text, ids):
+    """
+    {id: (id, title, note, snippet)} for those ids still in the table;
+    snippets are highlighted for text.
+    """
+    marks = ", ".join("?" * len(ids))
+    query = match_query(text) if has_fts(conn) else None
+    if query is not None:
+        rows = conn.execute(
+            "select notes.id, notes.title, notes.note,"
+            " snippet(notes_fts, -1, '[', ']', '...', 12)"
+            " from notes_fts join notes on notes.id = notes_fts.rowid"
+            " where notes_fts match ? and notes_fts.rowid in (%s)" % marks,
+            [query] + list(ids),
+        )
+    else:
+        rows = conn.execute(
+            "select id, title, note, substr(note, 1, 80) from notes where id in (%s)" % marks, list(ids)
+        )
+    return {row[0]: row for row in rows}
+
+
+class ResultCursor:
+    """
+    Position in the results of one search. The ranked ids are read when
+    the cursor is made; a note's row is read when it is shown, together
+    with the `prefetch` notes on either side of it (one query), so
+    stepping through results rarely waits on the database. The last
+    `cache_size` rows are kept in an LRU cache.
+    """
+
+    def __init__(self, conn, text, prefetch=2, cache_size=64):
+        self.conn = conn
+        self.text = text
+        self.prefetch = prefetch
+        self.cache_size = cache_size
+        self.ids = search_ids(conn, text)
+        self.position = 0
+        self._cache = OrderedDict()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def get(self, i):
+        """
+        Row (id, title, note, snippet) of the i-th result, or None. Notes
+        deleted since the search ran are dropped from the results.
+        """
+        while 0 <= i < len(self.ids):
+            note_id = self.ids[i]
+            if note_id in self._cache:
+                if note_exists(self.conn, note_id):
+                    self._cache.move_to_end(note_id)
+                    return self._cache[note_id]
+            else:
+                window = self.ids[max(0, i - self.prefetch):i + self.prefetch + 1]
+                missing = [other for other in window if other not in self._cache]
+                loaded = load_notes(self.conn, self.text, missing)
+                for other in missing:
+                    if other in loaded:
+                        self._remember(other, loaded[other])
+                if note_id in loaded:
+                    return self._cache[note_id]
+            self._drop_deleted(i)
+            i = min(i, len(self.ids) - 1)
+        return None
+
+    def _drop_deleted(self, i):
+        # ids[i] is gone (or no longer matches); drop it and the run of
+        # deleted notes after it with one existence query per
+        # EXISTS_BATCH ids and one list rebuild, not a search and delete
+        # per id
+        end, kept = i + 1, []
+        while end < len(self.ids) and not kept:
+            batch = self.ids[end:end + EXISTS_BATCH]
+            existing = existing_ids(self.conn, batch)
+            kept = [note_id for note_id in batch if note_id in existing]
+            end += len(batch)
+        kept_set = set(kept)
+        # the cursor stays on the result that followed the dropped ones
+        before = self.ids[i:min(end, self.position)]
+        self.position -= sum(1 for note_id in before if note_id not in kept_set)
+        for note_id in self.ids[i:end]:
+            if note_id not in kept_set:
+                self._cache.pop(note_id, None)
+        self.ids[i:end] = kept
+        if self.position >= len(self.ids):
+            self.position = max(0, len(self.ids) - 1)
+
+    def _remember(self, note_id, row):
+        self._cache[note_id] = row
+        self._cache.move_to_end(note_id)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def current(self):
+        return self.get(self.position)
+
+    def next(self):
+        if self.position < len(self.ids) - 1:
+            self.position += 1
+        return self.current()
+
+    def back(self):
+        if self.position > 0:
+            self.position -= 1
+        return self.current()
+
+    def discard(self, note_id):
+        """
+        Forget a note (e.g. after deleting it); the cursor stays on the
+        result that followed it.
+        """
+        if note_id in self.ids:
+            i = self.ids.index(note_id)
+            del self.ids[i]
+            if i < self.position or self.position >= len(self.ids):
+                self.position = max(0, self.position - 1)
+        self._cache.pop(note_id, None)
@@ -0,0 +1,185 @@
+#
+# Test notes storage and search
+# *****************************
+#
+# Usage: python test_notes_db.py
+#
+
+
+import sqlite3
+import unittest
+
+import notes_db
+
+
+def search(conn, text):
+    # every match as (id, title, note, snippet), best first
+    ids = notes_db.search_ids(conn, text)
+    rows = notes_db.load_notes(conn, text, ids)
+    return [rows[note_id] for note_id in ids]
+
+
+class TestFullTextSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        notes_db.create_schema(self.conn)
+
+    def tearDown(self):
+        self.conn.close()
+
+    def titles(self, text):
+        return [row[1] for row in search(self.conn, text)]
+
+    def test_index_follows_every_write(self):
+        first = notes_db.add_note(self.conn, "shopping", "milk and bread")
+        notes_db.add_note(self.conn, "work", "meeting agenda for monday")
+        self.assertEqual(self.titles("bread"), ["shopping"])
+        self.assertEqual(self.titles("meet ag"), ["work"])
+        with self.conn:
+            self.conn.execute("update notes set note = 'eggs' where id = ?", (first,))
+        self.assertEqual(self.titles("bread"), [])
+        self.assertEqual(self.titles("eggs"), ["shopping"])
+        notes_db.delete_note(self.conn, first)
+        self.assertEqual(self.titles("eggs"), [])
+
+    def test_title_matches_rank_first_with_snippet(self):
+        notes_db.add_note(self.conn, "misc", "remember the python conference")
+        notes_db.add_note(self.conn, "python", "a note")
+        rows = search(self.conn, "python")
+        self.assertEqual([row[1] for row in rows], ["python", "misc"])
+        self.assertIn("[python]", rows[1][3])
+
+    def test_input_is_not_fts_syntax(self):
+        notes_db.add_note(self.conn, 'say "hi"', "x")
+        for text in ('"hi', "NEAR(", "hi OR", "*", "' or 1=1 --"):
+            search(self.conn, text)
+        self.assertEqual(self.titles('"hi'), ['say "hi"'])
+        self.assertEqual(self.titles("***"), [])
+
+    def test_empty_search_lists_every_note(self):
+        notes_db.add_note(self.conn, "b", "x")
+        notes_db.add_note(self.conn, "a", "y")
+        self.assertEqual(self.titles(""), ["b", "a"])
+        self.assertEqual(self.titles("  "), ["b", "a"])
+
+    def test_existing_notes_are_indexed(self):
+        conn = sqlite3.connect(":memory:")
+        conn.execute(notes_db.NOTES_TABLE)
+        conn.execute("insert into notes (title, note) values ('old', 'from before the index')")
+        conn.commit()
+        notes_db.create_schema(conn)
+        notes_db.create_schema(conn)
+        self.assertEqual([row[1] for row in search(conn, "before")], ["old"])
+        conn.close()
+
+
+class TestResultCursor(unittest.TestCase):
+
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        notes_db.create_schema(self.conn)
+        self.ids = [notes_db.add_note(self.conn, "note %d" % i, "common %d" % i) for i in range(10)]
+        self.queries = []
+        self.conn.set_trace_callback(self.queries.append)
+
+    def tearDown(self):
+        self.conn.close()
+
+    def loads(self):
+        # statements that read note rows
+        return len([sql for sql in self.queries if "notes.title" in sql])
+
+    def test_ids_first_then_rows_with_neighbours(self):
+        results = notes_db.ResultCursor(self.conn, "common", prefetch=2, cache_size=4)
+        self.assertEqual(len(results), 10)
+        self.assertEqual(self.loads(), 0)
+        self.assertEqual(results.current()[1], "note 0")
+        self.assertEqual(self.loads(), 1)
+        # note 1 and 2 came with note 0
+        self.assertEqual(results.next()[1], "note 1")
+        self.assertEqual(results.next()[1], "note 2")
+        self.assertEqual(self.loads(), 1)
+        self.assertIn("[common]", results.current()[3])
+
+    def test_lru_cache_and_bounds(self):
+        results = notes_db.ResultCursor(self.conn, "common", prefetch=0, cache_size=2)
+        for _ in range(12):
+            results.next()
+        self.assertEqual(results.current()[1], "note 9")
+        self.assertEqual(len(results._cache), 2)
+        before = self.loads()
+        results.back()
+        self.assertEqual(self.loads(), before)
+        results.back()
+        self.assertEqual(self.loads(), before + 1)
+        for _ in range(12):
+            results.back()
+        self.assertEqual(results.current()[1], "note 0")
+
+    def test_deleted_notes_are_skipped(self):
+        results = notes_db.ResultCursor(self.conn, "common", prefetch=0)
+        notes_db.delete_note(self.conn, self.ids[0])
+        self.assertEqual(results.current()[1], "note 1")
+        self.assertEqual(len(results), 9)
+        notes_db.delete_note(self.conn, self.ids[1])
+        results.discard(self.ids[1])
+        self.assertEqual(results.current()[1], "note 2")
+        self.assertIsNone(notes_db.ResultCursor(self.conn, "missing").current())
+
+    def test_prefetched_rows_of_deleted_notes_are_not_served(self):
+        results = notes_db.ResultCursor(self.conn, "common", prefetch=2)
+        self.assertEqual(results.current()[1], "note 0")
+        with self.conn:
+            self.conn.execute("delete from notes where id != ?", (self.ids[0],))
+        self.assertEqual(results.next()[1], "note 0")
+        self.assertEqual(len(results), 1)
+
+    def test_long_runs_of_deleted_notes(self):
+        for i in range(3000):
+            notes_db.add_note(self.conn, "more %d" % i, "common")
+        results = notes_db.ResultCursor(self.conn, "more", prefetch=0)
+        with self.conn:
+            self.conn.execute("delete from notes where title != 'more 2999'")
+        self.assertEqual(results.current()[1], "more 2999")
+
+    def test_deleted_runs_are_dropped_in_batches(self):
+        for i in range(5000):
+            notes_db.add_note(self.conn, "more %d" % i, "common")
+        results = notes_db.ResultCursor(self.conn, "more", prefetch=0)
+        results.position = 4000
+        with self.conn:
+            self.conn.execute("delete from notes where title not in ('more 2500', 'more 3000', 'more 4999')")
+        del self.queries[:]
+        self.assertEqual(results.get(0)[1], "more 2500")
+        # 2500 stale ids cost a few batched queries, not one each
+        checks = [sql for sql in self.queries if sql.startswith("select id from notes where id in")]
+        self.assertLessEqual(len(checks), 2500 // notes_db.EXISTS_BATCH + 1)
+        self.assertEqual(self.loads(), 2)
+        self.assertEqual(results.get(1)[1], "more 3000")
+        self.assertEqual(results.get(2)[1], "more 4999")
+        self.assertEqual(len(results), 3)
+        # position 4000 was among the deleted notes; the next one left
+        self.assertEqual(results.current()[1], "more 4999")
+
+
+class TestLikeFallback(unittest.TestCase):
+
+    def test_search_without_index(self):
+        conn = sqlite3.connect(":memory:")
+        conn.execute(notes_db.NOTES_TABLE)
+        notes_db.add_note(conn, "body match", "100% sure")
+        notes_db.add_note(conn, "100% title", "x")
+        self.assertFalse(notes_db.has_fts(conn))
+        self.assertEqual([row[1] for row in search(conn, "100%")], ["100% title", "body match"])
+        self.assertEqual(notes_db.search_ids(conn, "0_"), [])
+        # same answers as with FTS5
+        self.assertEqual(notes_db.search_ids(conn, ""), [1, 2])
+        self.assertEqual(notes_db.search_ids(conn, "%"), [])
+        results = notes_db.ResultCursor(conn, "100%")
+        self.assertEqual([results.current()[1], results.next()[1]], ["100% title", "body match"])
+        conn.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,243 @@
+# SKILL: Bulk and Layout-Aware Searching
+# PURPOSE: Look up many keys in a sorted array quickly
+# CONCEPTS: Vectorized binary search, interpolation search, exponential (galloping) search, Eytzinger layout
+# TIME_COMPLEXITY: O(m log n) bulk, O(log log n) interpolation on uniform data, O(log i) exponential
+# SPACE_COMPLEXITY: O(m) for results, O(n) for the Eytzinger index
+# DIFFICULTY: advanced
+# ESTIMATED_TIME: 30 minutes
+
+"""
+LEARNING OBJECTIVE:
+binary_search.py answers one target per call. When millions of keys
+are looked up, the per-call Python overhead and the memory access
+pattern matter more than the O(log n) bound:
+
+- search_many() hands the whole batch to NumPy's searchsorted, so the
+  loop over targets runs in C.
+- interpolation_search() guesses where the target should be instead of
+  always probing the middle: O(log log n) probes on uniform data.
+- exponential_search() doubles its step until it passes the target, so
+  it works without knowing the length and costs O(log i) for a target
+  at index i.
+- EytzingerIndex stores the array in BFS order of an implicit binary
+  search tree. The first levels of the tree share a few cache lines and
+  the next probe is always at 2k or 2k + 1, so hardware prefetching works.
+
+VISUALIZATION (Eytzinger layout of 7 sorted values):
+sorted:     [1, 2, 3, 4, 5, 6, 7]
+
+tree:             4
+               /     \\
+              2       6
+             / \\     / \\
+            1   3   5   7
+
+eytzinger:  [_, 4, 2, 6, 1, 3, 5, 7]   children of k are 2k and 2k + 1
+"""
+
+from bisect import bisect_left, bisect_right
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def search_many(sorted_arr, targets, side="left"):
+    """
+    Insertion points of many targets at once (numpy.searchsorted semantics).
+
+    Args:
+        sorted_arr: Sorted list or array
+        targets: Iterable of values to look up
+        side: "left" for the first position where the target could be
+              inserted, "right" for the last
+
+    Returns:
+        List of insertion indices, one per target
+    """
+    if side not in ("left", "right"):
+        raise ValueError("side must be 'left' or 'right'")
+    if np is not None:
+        return np.searchsorted(np.asarray(sorted_arr), np.asarray(targets), side=side).tolist()
+    bisect = bisect_left if side == "left" else bisect_right
+    return [bisect(sorted_arr, target) for target in targets]
+
+
+def find_many(sorted_arr, targets):
+    """
+    Index of every target in the sorted array, like binary_search() per key.
+
+    Returns:
+        List with the index of each target, or -1 where it is missing
+    """
+    targets = list(targets)
+    positions = search_many(sorted_arr, targets)
+    n = len(sorted_arr)
+    return [
+        pos if pos < n and sorted_arr[pos] == target else -1
+        for pos, target in zip(positions, targets)
+    ]
+
+
+def interpolation_search(arr, target):
+    """
+    Find target in a sorted array of numbers by interpolating its position.
+
+    Best on roughly uniformly distributed keys; degrades gracefully to
+    O(n) probes on very skewed data.
+
+    Returns:
+        Index of target if found, -1 otherwise
+    """
+    low, high = 0, len(arr) - 1
+    while low <= high and arr[low] <= target <= arr[high]:
+        if arr[high] == arr[low]:
+            return low if arr[low] == target else -1
+        # where target would sit if the values grew linearly
+        pos = low + int((target - arr[low]) * (high - low) / (arr[high] - arr[low]))
+        pos = min(max(pos, low), high)
+        if arr[pos] == target:
+            # step back to the first occurrence, like bisect_left
+            while pos > low and arr[pos - 1] == target:
+                pos -= 1
+            return pos
+        if arr[pos] < target:
+            low = pos + 1
+        else:
+            high = pos - 1
+    return -1
+
+
+def _probe(arr, i):
+    # reading past the end of an unbounded sequence counts as "too big"
+    try:
+        return arr[i], True
+    except IndexError:
+        return None, False
+
+
+def exponential_search(arr, target, start=0):
+    """
+    Galloping search: probe start, start+1, start+3, start+7, ... until a
+    value >= target (or the end) is passed, then binary search that window.
+
+    arr only needs __getitem__ that raises IndexError past the end, so it
+    works on sequences whose length is unknown. start lets repeated
+    searches for increasing targets resume where the last one ended.
+
+    Returns:
+        Index of target if found, -1 otherwise
+    """
+    low, step = start, 1
+    high = start
+    while True:
+        value, ok = _probe(arr, high)
+        if not ok or not value < target:
+            break
+        low = high + 1
+        high = start + 2 * step - 1
+        step *= 2
+
+    # binary search [low, high] for the first value >= target
+    while low < high:
+        mid = (low + high) // 2
+        value, ok = _probe(arr, mid)
+        if ok and value < target:
+            low = mid + 1
+        else:
+            high = mid
+    value, ok = _probe(arr, low)
+    return low if ok and value == target else -1
+
+
+class EytzingerIndex:
+    """
+    Static sorted array stored in Eytzinger (BFS) order for repeated
+    lower-bound searches. Build once, then call search() or search_many().
+    """
+
+    def __init__(self, sorted_arr):
+        values = list(sorted_arr)
+        self.n = len(values)
+        # slot 0 is unused so the children of k are 2k and 2k + 1
+        self.tree = [None] * (self.n + 1)
+        self.rank = [self.n] * (self.n + 1)
+        self._fill(values)
+        if np is not None and self.n:
+            # slot 0 only needs a placeholder of the right type
+            self._np_tree = np.asarray(self.tree[1:2] + self.tree[1:])
+            self._np_rank = np.asarray(self.rank)
+
+    def _fill(self, values):
+        # in-order walk of the implicit tree hands out the sorted values
+        i, k, stack = 0, 1, []
+        while stack or k <= self.n:
+            if k <= self.n:
+                stack.append(k)
+                k = 2 * k
+            else:
+                k = stack.pop()
+                self.tree[k] = values[i]
+                self.rank[k] = i
+                i += 1
+                k = 2 * k + 1
+
+    def _lower_bound_slot(self, target):
+        k, n, tree = 1, self.n, self.tree
+        while k <= n:
+            k = 2 * k + (tree[k] < target)
+        # undo the trailing "went right" steps and the last "went left";
+        # 0 means every value is smaller than target
+        return k >> ((~k) & (k + 1)).bit_length()
+
+    def search(self, target):
+        """
+        Lower bound of target: index in the original sorted array of the
+        first value >= target (n if every value is smaller).
+        """
+        return self.rank[self._lower_bound_slot(target)]
+
+    def search_many(self, targets):
+        """
+        Lower bound of every target; all targets descend the tree together
+        one level per NumPy step.
+        """
+        if np is None or not self.n:
+            return [self.search(target) for target in targets]
+        t = np.asarray(targets)
+        k = np.ones(len(t), dtype=np.int64)
+        for _ in range(self.n.bit_length()):
+            active = k <= self.n
+            went_right = self._np_tree[np.where(active, k, 0)] < t
+            k = np.where(active, 2 * k + went_right, k)
+        lowest_zero = (~k) & (k + 1)
+        k >>= np.log2(lowest_zero).astype(np.int64) + 1
+        return self._np_rank[k].tolist()
+
+    def contains(self, target):
+        k = self._lower_bound_slot(target)
+        return k > 0 and self.tree[k] == target
+
+
+# Example usage
+if __name__ == "__main__":
+    sorted_array = [2, 5, 8, 12, 16, 23, 38, 56, 72, 91]
+    targets = [23, 2, 91, 100, 1]
+
+    print(f"Array:   {sorted_array}")
+    print(f"Targets: {targets}\n")
+
+    print(f"search_many (insertion points): {search_many(sorted_array, targets)}")
+    print(f"find_many   (index or -1):      {find_many(sorted_array, targets)}")
+
+    print(f"\nInterpolation search for 56: index {interpolation_search(sorted_array, 56)}")
+    print(f"Exponential search for 72:   index {exponential_search(sorted_array, 72)}")
+
+    index = EytzingerIndex(sorted_array)
+    print(f"\nEytzinger layout: {index.tree[1:]}")
+    print(f"Lower bounds via Eytzinger: {index.search_many(targets)}")
+
+    print("\nWhy batch? One search_many call over 1 million targets runs the")
+    print("loop in C; one binary_search call per target pays Python's call")
+    print("overhead a million times.")
@@ -0,0 +1,102 @@
+#
+# Test the bulk and layout-aware searches against bisect
+# ******************************************************
+#
+# Usage: python test_bulk_search.py
+#
+
+
+import random
+import unittest
+from bisect import bisect_left, bisect_right
+
+import bulk_search
+from bulk_search import (
+    EytzingerIndex,
+    exponential_search,
+    find_many,
+    interpolation_search,
+    search_many,
+)
+
+
+def index_of(arr, target):
+    # first occurrence of target, -1 if missing
+    pos = bisect_left(arr, target)
+    return pos if pos < len(arr) and arr[pos] == target else -1
+
+
+def cases():
+    rng = random.Random(3)
+    yield []
+    yield [7]
+    yield [4, 4, 4, 4]
+    yield [-5, 0, 0, 3, 9, 9, 9, 12]
+    for n in (10, 100, 1000):
+        # a narrow value range makes duplicates and gaps
+        yield sorted(rng.randint(-n // 4, n // 4) for _ in range(n))
+        yield sorted(rng.sample(range(10 * n), n))
+
+
+def keys(arr):
+    # every value, the gaps between them, and keys past both ends
+    if not arr:
+        return [-1, 0, 1]
+    return list(range(arr[0] - 3, arr[-1] + 4))
+
+
+class TestBulkSearch(unittest.TestCase):
+
+    def test_search_many(self):
+        for arr in cases():
+            targets = keys(arr)
+            with self.subTest(arr=arr):
+                self.assertEqual(search_many(arr, targets), [bisect_left(arr, t) for t in targets])
+                self.assertEqual(search_many(arr, targets, side="right"),
+                                 [bisect_right(arr, t) for t in targets])
+                self.assertEqual(find_many(arr, targets), [index_of(arr, t) for t in targets])
+        with self.assertRaises(ValueError):
+            search_many([1, 2], [1], side="middle")
+
+    def test_search_many_without_numpy(self):
+        np, bulk_search.np = bulk_search.np, None
+        try:
+            self.test_search_many()
+        finally:
+            bulk_search.np = np
+
+    def test_interpolation_search(self):
+        for arr in cases():
+            with self.subTest(arr=arr):
+                for target in keys(arr):
+                    self.assertEqual(interpolation_search(arr, target), index_of(arr, target))
+
+    def test_exponential_search(self):
+        for arr in cases():
+            with self.subTest(arr=arr):
+                for target in keys(arr):
+                    self.assertEqual(exponential_search(arr, target), index_of(arr, target))
+                    for start in (1, len(arr) // 2):
+                        if start < len(arr) and arr[start - 1] < target:
+                            self.assertEqual(exponential_search(arr, target, start), index_of(arr, target))
+
+    def test_eytzinger(self):
+        for arr in cases():
+            targets = keys(arr)
+            expected = [bisect_left(arr, t) for t in targets]
+            with self.subTest(arr=arr):
+                index = EytzingerIndex(arr)
+                self.assertEqual([index.search(t) for t in targets], expected)
+                self.assertEqual(index.search_many(targets), expected)
+                self.assertEqual([index.contains(t) for t in targets], [t in arr for t in targets])
+
+    def test_eytzinger_without_numpy(self):
+        np, bulk_search.np = bulk_search.np, None
+        try:
+            self.test_eytzinger()
+        finally:
+            bulk_search.np = np
+
+
+if __name__ == "__main__":
+    unittest.main()